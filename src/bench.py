@@ -0,0 +1,864 @@
+"""
+Benchmark kecil buat bagian-bagian compiler (bukan bagian dari pipeline utama).
+
+Pakai:
+    python -m src.bench lexer [--scale N] [--engines dfa,compiled,regex,vectorized]
+    python -m src.bench tokens [--scale N]
+    python -m src.bench parallel [--scale N] [--workers W] [--chunk-sizes 262144,1048576]
+    python -m src.bench tree [--statements N]
+    python -m src.bench ast [--statements N]
+    python -m src.bench parser [--statements N]
+    python -m src.bench deep [--depth D] [--check-depth C]
+    python -m src.bench lazy [--procedures N] [--statements S]
+    python -m src.bench recover [--statements N] [--every K] [--max-errors E]
+    python -m src.bench reparse [--statements N]
+    python -m src.bench serialize [--statements N]
+    python -m src.bench render [--statements N]
+    python -m src.bench symbols [--variables N] [--depth D] [--locals L] [--chain-limit C]
+    python -m src.bench tables [--variables N]
+    python -m src.bench types [--operators N]
+    python -m src.bench nodes [--statements N]
+
+Input = semua file test/milestone-*/*.pas yang di-lex tanpa error, digabung lalu diulang N kali.
+Bench parser pakai program sintetis (synthetic_program) karena file test yang digabung gak valid secara sintaks.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.errors import LexError, SemanticError
+from src.lexer.names import NO_NAME, NameTable
+from src.lexer.rules_loader import Rule
+from src.lexer.scanner import ENGINES, Scanner
+from src.lexer import vectorized
+from src.lexer.token_buffer import TokenBuffer
+from src.parser.parser import LazyCompound, Parser
+from src.parser.ast_parser import AstParser
+from src.parser.table_parser import TableParser
+from src.semantic.analyzer import SemanticAnalyzer
+from src.semantic.ast_nodes import (NODE_CLASSES, ArrayAccessNode, AssignNode, ASTNode, BinOpNode, BlockNode, ForNode,
+                                    IfNode, NumberNode, ProcCallNode, StringNode, UnaryOpNode, VarNode, WhileNode)
+from src.semantic.symbol_table import ArrayTable, BlockTable, SymbolTable
+from src.semantic.type_rules import BINARY_TYPES, binary_type
+from src import serialize
+from src.render import Output, token_lines
+
+TEST_DIR = Path(__file__).resolve().parents[1] / "test"
+
+
+def lexable_corpus(rules: Rule, scale: int) -> str:
+    parts = []
+    for path in sorted(TEST_DIR.glob("milestone-*/*.pas")):
+        text = path.read_text(encoding="utf-8")
+        try:
+            Scanner(rules, text).tokenize()
+        except LexError:
+            continue
+        parts.append(text)
+    return "\n".join(parts * scale)
+
+
+def synthetic_program(statements: int) -> str:
+    body = []
+    for i in range(statements):
+        if i % 3 == 0:
+            body.append(f"  a := a + {i} * (b - c);")
+        elif i % 3 == 1:
+            body.append("  jika a > b maka c := a selain_itu c := b;")
+        else:
+            body.append("  writeln('a = ', a);")
+    return "program Bench;\n\nvariabel\n  a, b, c: integer;\n\nmulai\n" + "\n".join(body) + "\n  a := 0\nselesai.\n"
+
+
+def tree_labels(tree) -> list[str]:
+    # label semua node urut preorder, buat ngecek dua parser ngasilin tree yang sama
+    labels, stack = [], [tree]
+    while stack:
+        node = stack.pop()
+        labels.append(str(node.value))
+        stack.extend(reversed(node.children))
+    return labels
+
+
+def broken_program(statements: int, every: int) -> str:
+    # synthetic_program dengan satu statement rusak tiap `every` baris (gantian: operand hilang, ';' hilang, token nyasar)
+    lines = synthetic_program(statements).split("\n")
+    broken = ["  a := a + ;", "  a := 1 b := 2;", "  c := b ) ;"]
+    for n, i in enumerate(range(6, 6 + statements, every)):
+        lines[i] = broken[n % len(broken)]
+    return "\n".join(lines)
+
+
+def synthetic_library(procedures: int, statements: int) -> str:
+    # banyak prosedur/fungsi dengan body panjang, buat query deklarasi doang
+    parts = ["program Library;\n\nvariabel\n  total: integer;\n"]
+    for p in range(procedures):
+        body = "\n".join(f"  x := x + {i} * (y - {p});" if i % 2 else f"  jika x > y maka y := x selain_itu x := y;"
+                         for i in range(statements))
+        if p % 2:
+            parts.append(f"\nfungsi f{p}(x, y: integer): integer;\nvariabel\n  t{p}: integer;\n"
+                         f"mulai\n{body}\n  f{p} := x\nselesai;\n")
+        else:
+            parts.append(f"\nprosedur p{p}(x: integer; y: integer);\nvariabel\n  t{p}: integer;\n"
+                         f"mulai\n{body}\n  x := y\nselesai;\n")
+    parts.append("\nmulai\n  total := 0\nselesai.\n")
+    return "".join(parts)
+
+
+def deep_programs(depth: int) -> dict[str, str]:
+    # program dengan nesting sedalam depth, satu per bentuk yang bikin parser / walker rekursif mentok
+    bodies = {
+        "blocks": "mulai " * depth + "a := 1" + " selesai" * depth,
+        "else-if chain": "jika a > 0 maka a := 1 selain_itu " * depth + "a := 2",
+        "while": "selama a > 0 lakukan " * depth + "a := a - 1",
+        "parentheses": "a := " + "(" * depth + "1" + ")" * depth,
+        "tidak chain": "b := " + "tidak " * depth + "true",
+        "sum chain": "a := 1" + " + a" * depth,
+    }
+    header = "program Deep;\n\nvariabel\n  a: integer;\n  b: boolean;\n\nmulai\n  "
+    return {name: header + body + "\nselesai.\n" for name, body in bodies.items()}
+
+
+def wide_program(variables: int) -> str:
+    # satu scope dengan banyak variabel, tiap variabel dipakai sekali
+    decls = "\n".join(f"  v{i}: integer;" for i in range(variables))
+    body = "\n".join(f"  v{i} := v{i // 2} + 1;" for i in range(1, variables))
+    return f"program Wide;\n\nvariabel\n{decls}\n\nmulai\n{body}\n  v0 := 0\nselesai.\n"
+
+
+def nested_scopes(depth: int, locals_: int) -> str:
+    # prosedur bersarang sedalam depth, tiap level punya locals_ variabel dan pakai variabel global g
+    # (deklarasi bersarang di analyzer masih rekursif, jadi depth-nya ratusan, bukan ribuan)
+    parts = ["program Scopes;\n\nvariabel\n  g: integer;\n"]
+    for d in range(depth):
+        names = ", ".join(f"x{d}_{i}" for i in range(locals_))
+        parts.append(f"\nprosedur p{d};\nvariabel\n  {names}: integer;\n")
+    for d in range(depth - 1, -1, -1):
+        parts.append(f"mulai\n  x{d}_0 := g + x{d}_{locals_ - 1}\nselesai;\n")
+    parts.append("\nmulai\n  g := 0\nselesai.\n")
+    return "".join(parts)
+
+
+class ChainAnalyzer(SemanticAnalyzer):
+    # pembanding: cek duplikat dan lookup jalan di link chain tab per level display, kaya sebelum ada index
+    def add_to_tab(self, name, obj_type, type_code, line=0, col=0, ref=0, val=0, name_id=NO_NAME):
+        if name_id == NO_NAME:
+            name_id = self.names.intern(name)
+        curr = self.btab.get(self.display[self.level], "last")
+        while curr > 0:
+            if self.tab.name_id(curr) == name_id:
+                break
+            curr = self.tab.get(curr, "link")
+        return super().add_to_tab(name, obj_type, type_code, line, col, ref, val, name_id)
+
+    def lookup(self, name, line=0, col=0, name_id=NO_NAME):
+        if name_id == NO_NAME:
+            name_id = self.names.find(name)
+        for lev in range(self.level, -1, -1):
+            curr = self.btab.get(self.display[lev], "last")
+            while curr > 0:
+                if self.tab.name_id(curr) == name_id:
+                    return curr
+                curr = self.tab.get(curr, "link")
+        return super().lookup(name, line, col, name_id)
+
+
+def long_expression(operators: int) -> str:
+    # satu assignment dengan ekspresi aritmetika campuran sepanjang `operators` operator
+    parts = [" + a", " * 2", " - r", " / 3", " bagi a", " + (a mod 7)"]
+    expr = "a" + "".join(parts[i % len(parts)] for i in range(operators))
+    return f"program Expr;\n\nvariabel\n  a: integer;\n  r: real;\n\nmulai\n  r := {expr}\nselesai.\n"
+
+
+class RuleAnalyzer(SemanticAnalyzer):
+    # pembanding: aturan tipe operator dihitung ulang tiap node, tanpa tabel (op, kiri, kanan)
+    def _type_binary(self, bin_node):
+        result, error = binary_type(bin_node.operator, bin_node.left.type, bin_node.right.type)
+        if error is not None:
+            raise SemanticError(error.format(op=bin_node.op), bin_node.line, bin_node.col)
+        bin_node.type = result
+        return bin_node
+
+
+class LineCounter:
+    # pengganti stdout: cuma ngitung baris/char (output tree program dalam bisa bergiga-giga)
+    def __init__(self):
+        self.lines = 0
+        self.chars = 0
+
+    def write(self, text: str):
+        self.lines += text.count("\n")
+        self.chars += len(text)
+
+    def flush(self):
+        pass
+
+
+def iter_nodes(tree):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, LazyCompound) or node.is_parsed():
+            stack.extend(node.children)
+
+
+def count_nodes(tree) -> int:
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def names_of(tokens) -> NameTable:
+    # NameTable source token-token ini (list[Token] / TokenBuffer), analyzer harus pakai tabel yang sama
+    return tokens.source.names if isinstance(tokens, TokenBuffer) else tokens[0].source.names
+
+
+def timed(build):
+    t0 = time.perf_counter()
+    result = build()
+    return result, time.perf_counter() - t0
+
+
+def measure(build):
+    # (hasil, detik, byte yang masih dipegang hasilnya); waktu diukur terpisah karena tracemalloc bikin lambat
+    result, elapsed = timed(build)
+    del result
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, elapsed, held
+
+
+def report(name: str, count: int, elapsed: float, held: int | None = None, unit: str = "token"):
+    line = f"{name:<24} {count:>9} {unit}s  {elapsed * 1000:9.1f} ms"
+    if held is not None:
+        line += f"  {held / max(count, 1):8.1f} bytes/{unit}"
+    print(line)
+
+
+def bench_lexer(args):
+    rules = Rule().load_rule()
+    text = lexable_corpus(rules, args.scale)
+    print(f"source: {len(text)} chars")
+    if not vectorized.AVAILABLE:
+        print("(numpy not installed: 'vectorized' runs as 'compiled')")
+
+    expected = None
+    for engine in args.engines.split(","):
+        tokens, elapsed = timed(lambda: Scanner(rules, text, engine=engine).tokenize())
+        report(engine, len(tokens), elapsed)
+        result = [(t.type, t.start, t.end) for t in tokens]
+        if expected is None:
+            expected = result
+        elif result != expected:
+            print(f"    !! {engine} output differs from {args.engines.split(',')[0]}")
+
+
+def bench_tokens(args):
+    rules = Rule().load_rule()
+    text = lexable_corpus(rules, args.scale)
+    print(f"source: {len(text)} chars")
+
+    tokens, elapsed, held = measure(lambda: Scanner(rules, text).tokenize())
+    report("list[Token]", len(tokens), elapsed, held)
+    del tokens
+
+    buf, elapsed, held = measure(lambda: Scanner(rules, text).tokenize_buffer())
+    report("TokenBuffer", len(buf), elapsed, held)
+
+
+def bench_parallel(args):
+    rules = Rule().load_rule()
+    text = lexable_corpus(rules, args.scale)
+    print(f"source: {len(text)} chars, workers: {args.workers or 'cpu_count'}")
+
+    serial, elapsed = timed(lambda: Scanner(rules, text).tokenize())
+    report("serial", len(serial), elapsed)
+    expected = [(t.type, t.start, t.end) for t in serial]
+    del serial
+
+    for chunk_size in (int(c) for c in args.chunk_sizes.split(",")):
+        tokens, elapsed = timed(lambda: Scanner(rules, text).tokenize_parallel(args.workers, chunk_size))
+        same = [(t.type, t.start, t.end) for t in tokens] == expected
+        report(f"parallel chunk={chunk_size}", len(tokens), elapsed)
+        if not same:
+            print("    !! output differs from serial tokenization")
+
+
+def bench_tree(args):
+    rules = Rule().load_rule()
+    text = synthetic_program(args.statements)
+    tokens = Scanner(rules, text).tokenize()
+    buf = Scanner(rules, text).tokenize_buffer()
+    print(f"source: {len(text)} chars, {len(tokens)} tokens")
+
+    tree, elapsed, held = measure(lambda: Parser(tokens).parse())
+    report("ParseTree", count_nodes(tree), elapsed, held, unit="node")
+    del tree
+
+    tree, elapsed, held = measure(lambda: Parser(tokens, compact=True).parse())
+    report("ParseTree compact", count_nodes(tree), elapsed, held, unit="node")
+    del tree
+
+    root, elapsed, held = measure(lambda: Parser(buf, arena=True).parse())
+    report("ParseArena", len(root.arena), elapsed, held, unit="node")
+
+
+def bench_ast(args):
+    rules = Rule().load_rule()
+    text = synthetic_program(args.statements)
+    tokens = Scanner(rules, text).tokenize()
+    print(f"source: {len(text)} chars, {len(tokens)} tokens")
+
+    result, elapsed = timed(lambda: SemanticAnalyzer(names_of(tokens)).analyze(Parser(tokens).parse()))
+    report("ParseTree + visit", len(tokens), elapsed)
+    expected = repr(result[3].block.statements)
+
+    result, elapsed = timed(lambda: SemanticAnalyzer(names_of(tokens)).analyze_ast(AstParser(tokens).parse()))
+    report("AstParser + decorate", len(tokens), elapsed)
+    if repr(result[3].block.statements) != expected:
+        print("    !! decorated AST differs from the ParseTree path")
+
+    # arena: analyze() nurunin AST lewat id (ArenaAstBuilder), gak lewat view ArenaNode
+    buf = Scanner(rules, text).tokenize_buffer()
+    result, elapsed = timed(lambda: SemanticAnalyzer(names_of(buf)).analyze(Parser(buf, arena=True).parse()))
+    report("ParseArena + lower", len(buf), elapsed)
+    if repr(result[3].block.statements) != expected:
+        print("    !! decorated AST differs from the ParseTree path")
+
+
+def bench_parser(args):
+    rules = Rule().load_rule()
+    text = synthetic_program(args.statements)
+    tokens = Scanner(rules, text).tokenize()
+    buf = Scanner(rules, text).tokenize_buffer()
+    print(f"source: {len(text)} chars, {len(tokens)} tokens")
+
+    tree, elapsed = timed(lambda: Parser(buf).parse())
+    report("recursive descent", len(buf), elapsed)
+    expected = tree_labels(tree)
+    del tree
+
+    TableParser(buf).parse()  # grammar.json di-load (dan di-cache) di luar pengukuran
+    tree, elapsed = timed(lambda: TableParser(buf).parse())
+    report("LL(1) table", len(buf), elapsed)
+    if tree_labels(tree) != expected:
+        print("    !! parse tree differs from the recursive descent parser")
+    del tree
+
+    tree, elapsed = timed(lambda: TableParser(tokens).parse())
+    report("LL(1) table (list)", len(tokens), elapsed)
+
+
+def ast_rows(node) -> list[tuple]:
+    # decorated AST preorder tanpa rekursi: kelas, posisi, hasil analyzer dan field skalar tiap node
+    rows, stack = [], [node]
+    while stack:
+        node = stack.pop()
+        fields = tuple(value if isinstance(value, (str, int, float)) else None
+                       for value in (getattr(node, name, None) for name in node._fields))
+        rows.append((type(node).__name__, node.line, node.col, node.type, node.tab_index, node.scope_level) + fields)
+        stack.extend(reversed(list(node.children())))
+    return rows
+
+
+def deep_pipelines(buf: TokenBuffer) -> dict:
+    # jalur parse + analyze yang harus ngasilin hal yang sama: nama -> (tree atau None, analyzer, hasil analyze)
+    runs = {}
+    for name, parse, analyze in (
+            ("Parser", lambda: Parser(buf).parse(), "analyze"),
+            ("TableParser", lambda: TableParser(buf).parse(), "analyze"),
+            ("arena", lambda: Parser(buf, arena=True).parse(), "analyze"),
+            ("AstParser", lambda: AstParser(buf).parse(), "analyze_ast")):
+        tree, parse_time = timed(parse)
+        analyzer = SemanticAnalyzer(names_of(buf))
+        result, analyze_time = timed(lambda: getattr(analyzer, analyze)(tree))
+        runs[name] = (tree if analyze == "analyze" else None, analyzer, result, parse_time, analyze_time)
+    return runs
+
+
+def printed(print_):
+    # stdout print_() sebagai string
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        print_()
+    return out.getvalue()
+
+
+def bench_deep(args):
+    # tiap bentuk dicek dua kali: di check_depth output lengkapnya (parse tree, tabel, decorated AST) dibandingin
+    # antar jalur, di depth (>= 10^4) parse tree dan decorated AST-nya dibandingin node per node
+    rules = Rule().load_rule()
+    failures = 0
+    shallow = deep_programs(args.check_depth)
+    for name, text in deep_programs(args.depth).items():
+        runs = deep_pipelines(Scanner(rules, shallow[name]).tokenize_buffer())
+        trees = {printed(tree.pretty_print) for tree, *_ in runs.values() if tree is not None}
+        outputs = {printed(lambda: analyzer.print_output(*result)) for _, analyzer, result, *_ in runs.values()}
+        if len(trees) != 1 or len(outputs) != 1:
+            print(f"    !! {name}: output at depth {args.check_depth} differs between parsers")
+            failures += 1
+
+        runs = deep_pipelines(Scanner(rules, text).tokenize_buffer())
+        tree, analyzer, result, parse_time, analyze_time = runs["Parser"]
+        expected_tree, expected_ast = tree_labels(tree), ast_rows(result[3])
+        for run_name, (other_tree, _, other, _, _) in runs.items():
+            if other_tree is not None and tree_labels(other_tree) != expected_tree:
+                print(f"    !! {name}: {run_name} parse tree differs from Parser")
+                failures += 1
+            if other[:3] != result[:3] or ast_rows(other[3]) != expected_ast:
+                print(f"    !! {name}: {run_name} decorated AST differs from Parser")
+                failures += 1
+
+        out = LineCounter()
+        with contextlib.redirect_stdout(out):
+            _, print_time = timed(lambda: (tree.pretty_print(), analyzer.print_output(*result)))
+        print(f"{name:<14} depth {args.depth}: parse {parse_time * 1000:8.1f} ms"
+              f" (table {runs['TableParser'][3] * 1000:8.1f} ms)  analyze {analyze_time * 1000:8.1f} ms"
+              f"  print {print_time * 1000:9.1f} ms ({out.lines} lines)")
+    if failures:
+        raise SystemExit(f"deep: {failures} mismatches")
+
+
+def bench_lazy(args):
+    rules = Rule().load_rule()
+    text = synthetic_library(args.procedures, args.statements)
+    print(f"source: {len(text)} chars, {args.procedures} subprograms")
+
+    buf, elapsed = timed(lambda: Scanner(rules, text).tokenize_buffer())
+    report("lex (TokenBuffer)", len(buf), elapsed)
+
+    def full():
+        analyzer = SemanticAnalyzer(names_of(buf))
+        return analyzer.analyze(Parser(buf).parse())
+
+    def declarations():
+        tree = Parser(buf, lazy_bodies=True).parse()
+        return tree, SemanticAnalyzer(names_of(buf)).analyze_declarations(tree)
+
+    result, elapsed = timed(full)
+    report("parse + analyze", len(buf), elapsed)
+    expected = result[:3]
+
+    (tree, result), elapsed = timed(declarations)
+    report("lazy + declarations", len(buf), elapsed)
+    if result[:3] != expected:
+        print("    !! symbol tables differ from the full analysis")
+    bodies = [node for node in iter_nodes(tree) if isinstance(node, LazyCompound)]
+    parsed = sum(body.is_parsed() for body in bodies)
+    print(f"    {len(bodies)} lazy bodies, {parsed} parsed")
+
+
+def bench_recover(args):
+    rules = Rule().load_rule()
+    clean = Scanner(rules, synthetic_program(args.statements)).tokenize_buffer()
+    broken = Scanner(rules, broken_program(args.statements, args.every)).tokenize_buffer()
+
+    _, elapsed = timed(lambda: Parser(clean).parse())
+    report("plain (clean)", len(clean), elapsed)
+    _, elapsed = timed(lambda: Parser(clean, recover=True).parse())
+    report("recover (clean)", len(clean), elapsed)
+
+    parser = Parser(broken, recover=True, max_errors=args.max_errors)
+    _, elapsed = timed(parser.parse)
+    report("recover (broken)", len(broken), elapsed)
+    print(f"    {len(parser.errors)} syntax errors in one pass ({len(range(0, args.statements, args.every))} broken statements"
+          f", cap {args.max_errors})")
+
+
+def token_edit_range(old: TokenBuffer, new: TokenBuffer) -> tuple[int, int, int]:
+    # (start, old_end, new_end) dari prefix/suffix yang sama; di editor ini udah tau dari posisi edit-nya
+    same = lambda i, j: old.kinds[i] == new.kinds[j] and old[i].value == new[j].value
+    start = 0
+    while start < min(len(old), len(new)) and same(start, start):
+        start += 1
+    tail = 0
+    while tail < min(len(old), len(new)) - start and same(len(old) - 1 - tail, len(new) - 1 - tail):
+        tail += 1
+    return start, len(old) - tail, len(new) - tail
+
+
+def bench_reparse(args):
+    rules = Rule().load_rule()
+    text = synthetic_program(args.statements)
+    lines = text.split("\n")
+    middle = 6 + args.statements // 2
+    edits = {
+        "edit one line": lines[:middle] + ["  a := a + 7 * (b - c) - 1;"] + lines[middle + 1:],
+        "insert one line": lines[:middle] + ["  writeln('inserted');"] + lines[middle:],
+    }
+    old = Scanner(rules, text).tokenize_buffer()
+    print(f"source: {len(lines)} lines, {len(old)} tokens")
+
+    _, elapsed = timed(lambda: Parser(old).parse())
+    report("full parse", len(old), elapsed)
+    for name, edited in edits.items():
+        new = Scanner(rules, "\n".join(edited)).tokenize_buffer()
+        edit = token_edit_range(old, new)
+        tree = Parser(old).parse()
+        kept = tree.children[2]
+        result, elapsed = timed(lambda: Parser(new).reparse(tree, edit))
+        report(name, edit[2] - edit[0], elapsed)
+        if tree_labels(result) != tree_labels(Parser(new).parse()):
+            print("    !! reparsed tree differs from a full parse")
+        print(f"    tokens {edit[0]}..{edit[1]} -> ..{edit[2]}, tree reused: {result is tree and result.children[2] is kept}")
+
+
+def bench_serialize(args):
+    rules = Rule().load_rule()
+    tree = Parser(Scanner(rules, synthetic_program(args.statements)).tokenize()).parse()
+    tokens = Scanner(rules, synthetic_program(args.statements)).tokenize()
+    ast = SemanticAnalyzer(names_of(tokens)).analyze(Parser(tokens).parse())[3]
+    nodes = count_nodes(tree)
+    print(f"parse tree: {nodes} nodes")
+
+    def line(name: str, size: int, dump: float, load: float, note: str = ""):
+        print(f"{name:<24} {size:>11} bytes  dump {dump * 1000:8.1f} ms  load {load * 1000:8.1f} ms{note}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tree.smnt"
+        data, dump = timed(lambda: pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+        _, load = timed(lambda: pickle.loads(data))
+        line("pickle", len(data), dump, load)
+
+        _, dump = timed(lambda: serialize.dump_tree(tree, path))
+        loaded, load = timed(lambda: serialize.load_tree(path))
+        _, walk = timed(lambda: count_nodes(loaded))
+        line("binary (mmap)", path.stat().st_size, dump, load, f"  + full traversal {walk * 1000:8.1f} ms")
+        if tree_labels(loaded) != tree_labels(tree):
+            print("    !! loaded tree differs")
+        del loaded
+
+        print("decorated AST:")
+        path = Path(tmp) / "ast.smna"
+        data, dump = timed(lambda: pickle.dumps(ast, pickle.HIGHEST_PROTOCOL))
+        _, load = timed(lambda: pickle.loads(data))
+        line("pickle", len(data), dump, load)
+
+        _, dump = timed(lambda: serialize.dump_ast(ast, path))
+        loaded, load = timed(lambda: serialize.load_ast(path))
+        line("binary (mmap)", path.stat().st_size, dump, load)
+        if repr(loaded) != repr(ast) or len(loaded.block.statements) != len(ast.block.statements):
+            print("    !! loaded AST differs")
+
+
+def bench_render(args):
+    # output CLI lengkap (token, parse tree, tabel + decorated AST) ke /dev/null
+    rules = Rule().load_rule()
+    tokens = Scanner(rules, synthetic_program(args.statements)).tokenize_buffer()
+    tree = Parser(tokens).parse()
+    analyzer = SemanticAnalyzer(names_of(tokens))
+    result = analyzer.analyze(tree)
+
+    def render(out: Output):
+        out.write_lines(token_lines(tokens))
+        tree.pretty_print(out=out)
+        analyzer.print_output(*result, out=out)
+        out.close()
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        class PerLine:
+            # Output yang langsung print() per baris, kaya sebelum ada buffer
+            def write(self, text: str):
+                for line in text.split("\n")[:-1]:
+                    print(line, file=sink)
+
+            def flush(self):
+                pass
+
+        counter = LineCounter()
+        render(Output(counter))
+        _, elapsed = timed(lambda: render(Output(PerLine(), chunk_chars=0)))
+        report("print per line", counter.lines, elapsed, unit="line")
+        _, elapsed = timed(lambda: render(Output(sink)))
+        report("buffered Output", counter.lines, elapsed, unit="line")
+        _, elapsed = timed(lambda: render(Output(sink, max_lines=1000)))
+        report("--max-output-lines 1000", 1000, elapsed, unit="line")
+
+
+def bench_symbols(args):
+    # analisis program dengan scope lebar / dalam: index hash per scope vs jalan di link chain
+    rules = Rule().load_rule()
+    programs = [(f"wide {n}", wide_program(n)) for n in sorted({max(args.variables // 10, 1), args.variables})]
+    programs.append((f"nested {args.depth}x{args.locals}", nested_scopes(args.depth, args.locals)))
+    for name, text in programs:
+        buf = Scanner(rules, text).tokenize_buffer()
+        tree = TableParser(buf).parse()
+        expected, elapsed = timed(lambda: SemanticAnalyzer(names_of(buf)).analyze(tree))
+        entries = len(expected[0])
+        report(f"{name}: index", entries, elapsed, unit="name")
+        if entries > args.chain_limit:
+            print(f"    chain walk skipped (> {args.chain_limit} entries, quadratic)")
+            continue
+        result, elapsed = timed(lambda: ChainAnalyzer(names_of(buf)).analyze(tree))
+        report(f"{name}: chain", entries, elapsed, unit="name")
+        if result[:3] != expected[:3]:
+            print("    !! symbol tables differ")
+
+
+def bench_tables(args):
+    # memori tab/btab/atab + waktu lookup: satu dict per baris (layout lama) vs kolom array('i')
+    rules = Rule().load_rule()
+    buf = Scanner(rules, wide_program(args.variables)).tokenize_buffer()
+    tree = TableParser(buf).parse()
+    analyzer = SemanticAnalyzer(names_of(buf))
+    tables = analyzer.analyze(tree)[:3]
+    rows = len(tables[0]) + len(tables[1]) + len(tables[2])
+
+    def as_dicts():
+        return [[row.copy() if row else None for row in table] for table in tables]
+
+    def as_columns():
+        copies = (SymbolTable(analyzer.names), BlockTable(), ArrayTable())
+        for table, copy in zip(tables, copies):
+            for row in table:
+                if row:
+                    copy.append(**row.copy())
+                else:
+                    copy.append_empty()
+        return copies
+
+    dicts, _, dict_held = measure(as_dicts)
+    columns, _, column_held = measure(as_columns)
+    if list(columns) != list(tables):
+        print("    !! columnar copy differs")
+
+    names = [f"v{i}" for i in range(args.variables)]
+
+    def column_lookups():
+        tab = tables[0]
+        for name in names:
+            tab.type_of(analyzer.lookup(name))
+
+    def dict_lookups():
+        tab = dicts[0]
+        for name in names:
+            tab[analyzer.lookup(name)]["type"]
+
+    _, column_time = timed(column_lookups)
+    _, dict_time = timed(dict_lookups)
+    print(f"{'dict rows':<24} {rows:>9} rows  {dict_held / rows:8.1f} bytes/row  "
+          f"lookup {dict_time / len(names) * 1e9:6.0f} ns/name")
+    print(f"{'array columns':<24} {rows:>9} rows  {column_held / rows:8.1f} bytes/row  "
+          f"lookup {column_time / len(names) * 1e9:6.0f} ns/name")
+
+
+def bench_types(args):
+    # cek tipe ekspresi panjang: tabel hasil tipe yang sudah dihitung vs aturan dihitung ulang per node
+    rules = Rule().load_rule()
+    buf = Scanner(rules, long_expression(args.operators)).tokenize_buffer()
+    tree = Parser(buf).parse()
+    nodes = args.operators + args.operators // 6  # tiap "(a mod 7)" = satu operator lagi
+
+    expected, elapsed = timed(lambda: SemanticAnalyzer(names_of(buf)).analyze(tree))
+    report("analyze (table)", nodes, elapsed, unit="operator")
+    result, elapsed = timed(lambda: RuleAnalyzer(names_of(buf)).analyze(tree))
+    report("analyze (rules)", nodes, elapsed, unit="operator")
+    if repr(result[3]) != repr(expected[3]):
+        print("    !! decorated ASTs differ")
+
+    # cek tipenya doang, di semua BinOpNode hasil analisis
+    keys, stack = [], [expected[3]]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BinOpNode):
+            keys.append((node.operator, node.left.type, node.right.type))
+        stack.extend(node.children())
+    _, elapsed = timed(lambda: [BINARY_TYPES[key] for key in keys])
+    report("check only (table)", len(keys), elapsed, unit="operator")
+    _, elapsed = timed(lambda: [binary_type(*key) for key in keys])
+    report("check only (rules)", len(keys), elapsed, unit="operator")
+
+
+class DictNode:
+    # node AST dengan __dict__ (layout sebelum __slots__), cuma buat pembanding di bench_nodes
+    pass
+
+
+DICT_CLASSES = {cls: type(cls.__name__, (DictNode,), {}) for cls in NODE_CLASSES}
+
+
+def copy_ast(root, slotted: bool):
+    # salinan AST (node baru, list baru), slotted = kelas aslinya, kalau gak = DictNode dengan atribut yang sama
+    def copy(value):
+        if isinstance(value, list):
+            return [copy(item) for item in value]
+        if not isinstance(value, ASTNode):
+            return value
+        node = type(value).__new__(type(value)) if slotted else DICT_CLASSES[type(value)]()
+        for name in value._attributes:
+            if hasattr(value, name):
+                setattr(node, name, copy(getattr(value, name)))
+        return node
+    return copy(root)
+
+
+def walk_vars(root) -> list:
+    # cara jalan generik lama: semua atribut instance, ambil yang node / list node
+    nodes, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        for value in vars(node).values():
+            if isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, DictNode):
+                stack.append(value)
+    return nodes
+
+
+def walk_children(root) -> list:
+    nodes, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.children())
+    return nodes
+
+
+def dispatch_chain(node) -> int:
+    # urutan isinstance lama di decorate_statement / decorate_expr
+    if isinstance(node, AssignNode): return 1
+    elif isinstance(node, ProcCallNode): return 2
+    elif isinstance(node, BlockNode): return 3
+    elif isinstance(node, IfNode): return 4
+    elif isinstance(node, WhileNode): return 5
+    elif isinstance(node, ForNode): return 6
+    elif isinstance(node, BinOpNode): return 7
+    elif isinstance(node, UnaryOpNode): return 8
+    elif isinstance(node, NumberNode): return 9
+    elif isinstance(node, VarNode): return 10
+    elif isinstance(node, StringNode): return 11
+    elif isinstance(node, ArrayAccessNode): return 12
+    return 0
+
+
+DISPATCH = {cls: dispatch_chain(cls.__new__(cls)) for cls in NODE_CLASSES}
+
+
+def bench_nodes(args):
+    # node AST: memori per node dan kecepatan jalan tree, __dict__ per node vs __slots__ + children() + tabel dispatch
+    rules = Rule().load_rule()
+    tokens = Scanner(rules, synthetic_program(args.statements)).tokenize()
+    ast = AstParser(tokens).parse()
+
+    dict_ast, _, dict_held = measure(lambda: copy_ast(ast, slotted=False))
+    slot_ast, _, slot_held = measure(lambda: copy_ast(ast, slotted=True))
+    dict_nodes, dict_walk = timed(lambda: walk_vars(dict_ast))
+    slot_nodes, slot_walk = timed(lambda: walk_children(slot_ast))
+    count = len(slot_nodes)
+    if len(dict_nodes) != count:
+        print(f"    !! walks differ: {len(dict_nodes)} vs {count} nodes")
+    print(f"{'__dict__ nodes':<24} {count:>9} nodes  {dict_held / count:8.1f} bytes/node  "
+          f"walk {dict_walk / count * 1e9:6.0f} ns/node")
+    print(f"{'slotted nodes':<24} {count:>9} nodes  {slot_held / count:8.1f} bytes/node  "
+          f"walk {slot_walk / count * 1e9:6.0f} ns/node")
+
+    expected, elapsed = timed(lambda: [dispatch_chain(node) for node in slot_nodes])
+    report("dispatch isinstance", count, elapsed, unit="node")
+    result, elapsed = timed(lambda: [DISPATCH.get(type(node), 0) for node in slot_nodes])
+    report("dispatch table", count, elapsed, unit="node")
+    if result != expected:
+        print("    !! dispatch results differ")
+
+    _, elapsed = timed(lambda: SemanticAnalyzer(names_of(tokens)).analyze_ast(slot_ast))
+    report("analyze_ast", count, elapsed, unit="node")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SayMyName micro benchmarks")
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("lexer", help="tokenize speed per lexer engine")
+    p.add_argument("--scale", type=int, default=200)
+    p.add_argument("--engines", default=",".join(ENGINES))
+    p.set_defaults(run=bench_lexer)
+
+    p = sub.add_parser("tokens", help="bytes per token: list[Token] vs TokenBuffer")
+    p.add_argument("--scale", type=int, default=200)
+    p.set_defaults(run=bench_tokens)
+
+    p = sub.add_parser("parallel", help="serial vs ProcessPoolExecutor lexing for several chunk sizes")
+    p.add_argument("--scale", type=int, default=500)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--chunk-sizes", default="262144,1048576,4194304")
+    p.set_defaults(run=bench_parallel)
+
+    p = sub.add_parser("tree", help="parse tree size: ParseTree objects (full / compact) vs ParseArena")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_tree)
+
+    p = sub.add_parser("ast", help="parse + semantic analysis: via ParseTree vs AST built while parsing")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_ast)
+
+    p = sub.add_parser("parser", help="recursive descent Parser vs table-driven TableParser (grammar.json)")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_parser)
+
+    p = sub.add_parser("deep", help="deeply nested programs: every parser + analyzer + printers without recursion")
+    p.add_argument("--depth", type=int, default=10000)
+    p.add_argument("--check-depth", type=int, default=200)
+    p.set_defaults(run=bench_deep)
+
+    p = sub.add_parser("lazy", help="symbol tables only: full parse + analysis vs lazily skipped subprogram bodies")
+    p.add_argument("--procedures", type=int, default=500)
+    p.add_argument("--statements", type=int, default=100)
+    p.set_defaults(run=bench_lazy)
+
+    p = sub.add_parser("recover", help="panic-mode recovery: every syntax error of a broken program in one parse")
+    p.add_argument("--statements", type=int, default=20000)
+    p.add_argument("--every", type=int, default=50)
+    p.add_argument("--max-errors", type=int, default=1000)
+    p.set_defaults(run=bench_recover)
+
+    p = sub.add_parser("reparse", help="one-line edit in a long program: full parse vs Parser.reparse")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_reparse)
+
+    p = sub.add_parser("serialize", help="parse tree / decorated AST: pickle vs compact binary format (mmap, lazy)")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_serialize)
+
+    p = sub.add_parser("render", help="CLI output (tokens, tree, tables, decorated AST): print per line vs buffered")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_render)
+
+    p = sub.add_parser("symbols", help="symbol table: hash index per scope vs link chain walk (wide and nested scopes)")
+    p.add_argument("--variables", type=int, default=100000)
+    p.add_argument("--depth", type=int, default=200)
+    p.add_argument("--locals", type=int, default=50)
+    p.add_argument("--chain-limit", type=int, default=15000)
+    p.set_defaults(run=bench_symbols)
+
+    p = sub.add_parser("tables", help="tab/btab/atab memory and lookup time: dict per row vs array('i') columns")
+    p.add_argument("--variables", type=int, default=100000)
+    p.set_defaults(run=bench_tables)
+
+    p = sub.add_parser("types", help="type checking a long expression: precomputed (op, left, right) table vs rules per node")
+    p.add_argument("--operators", type=int, default=100000)
+    p.set_defaults(run=bench_types)
+
+    p = sub.add_parser("nodes", help="AST node memory and walk speed: __dict__ per node vs __slots__, isinstance vs dict dispatch")
+    p.add_argument("--statements", type=int, default=20000)
+    p.set_defaults(run=bench_nodes)
+
+    args = ap.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
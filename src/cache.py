@@ -0,0 +1,43 @@
+"""
+Cache hasil kompilasi (tabel lexer, dst) di file sebelah sumbernya: <nama file>.cache
+
+- key = sha256(versi compiler + isi file sumber), jadi kalau file sumber diubah / versi naik, cache otomatis dianggap basi
+- payload disimpan pakai marshal (cuma tipe bawaan: dict, list, set, str, int, None), dibaca dengan satu kali read
+- gagal baca/tulis cache gak pernah bikin error, paling jelek ya compile ulang
+"""
+
+import hashlib
+import marshal
+import os
+from pathlib import Path
+
+
+def cache_path(source: Path) -> Path:
+    return source.with_name(source.name + ".cache")
+
+
+def content_key(raw: bytes, version: str) -> str:
+    return hashlib.sha256(version.encode("utf-8") + b"\0" + raw).hexdigest()
+
+
+def read_cache(source: Path, key: str):
+    try:
+        data = marshal.loads(cache_path(source).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data.get("payload")
+
+
+def write_cache(source: Path, key: str, payload):
+    target = cache_path(source)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(marshal.dumps({"key": key, "payload": payload}))
+        os.replace(tmp, target)
+    except (OSError, ValueError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
@@ -5,4 +5,35 @@ def parse_args():
     ap = argparse.ArgumentParser(description="Pascal-S Compiler \"SayMyName\" (only lexer yet)")
     ap.add_argument("source", type=Path, help=".pas source file")
     ap.add_argument("--dfa", type=Path, default=Path(__file__).parent / "rules" / "dfa.json")
+    ap.add_argument("--lexer", choices=["compiled", "dfa", "regex", "vectorized"], default="compiled",
+                    help="lexer engine: integer transition table (default), the reference dict-based DFA, "
+                         "a master regex derived from the same table, or the table with a NumPy pre-pass")
+    ap.add_argument("--stream", action="store_true",
+                    help="feed tokens to the parser while lexing (skips the token listing)")
+    ap.add_argument("--token-buffer", action="store_true",
+                    help="keep tokens in a compact TokenBuffer instead of a list of Token objects")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="lex with this many worker processes (source split at safe line boundaries)")
+    ap.add_argument("--chunk-size", type=int, default=1 << 20,
+                    help="target chunk size in characters for --jobs")
+    ap.add_argument("--arena-tree", action="store_true",
+                    help="store the parse tree in flat integer arrays instead of one object per node")
+    ap.add_argument("--compact-tree", action="store_true",
+                    help="drop single-child <expression>/<simple-expression>/<term>/<factor> nodes")
+    ap.add_argument("--parser", choices=("rd", "table"), default="rd",
+                    help="rd: hand-written recursive descent parser (default); table: LL(1) table built from rules/grammar.json")
+    ap.add_argument("--emit", choices=("tree", "ast", "decls"), default="tree",
+                    help="tree: print the parse tree and analyze it (default); ast: build the AST directly while parsing; "
+                         "decls: symbol tables only, subprogram bodies are skipped without being parsed")
+    ap.add_argument("--recover", action="store_true",
+                    help="keep going after errors and report every diagnostic in one pass "
+                         "(syntax errors: panic-mode recovery in the rd parser, --emit tree only)")
+    ap.add_argument("--max-errors", type=int, default=20,
+                    help="with --recover, stop parsing after this many syntax errors")
+    ap.add_argument("--max-output-lines", type=int, default=None,
+                    help="stop printing after this many lines (a note marks the cut)")
+    ap.add_argument("--max-depth", type=int, default=None,
+                    help="print parse tree / decorated AST nodes only down to this depth")
+    ap.add_argument("--max-width", type=int, default=None,
+                    help="print at most this many children per parse tree / decorated AST node")
     return ap.parse_args()
@@ -5,21 +5,47 @@ Apa:
 Ngapain:
 - load text dari path
 - peek (huruf apa saat ini), next (pindah huruf), eof (boolean, cek apakah sudah eof), current line/col ... kalau ada kebutuhan lain tambah aja
-- track line/col
+- row/col gak di-track per karakter lagi, dihitung pas dibutuhkan (error, print token) lewat index awal baris
 
 catatan:
 - peek /next return '' aja pas EOF
+- CharStream juga jadi "source buffer" buat Token (token cuma nyimpen offset start/end)
+- names = NameTable identifier source ini (default: tabel baru punya source ini, diisi Scanner, lihat names.py)
+- apply_edit (dipakai Scanner.relex) biayanya sebanding ukuran edit, bukan ukuran file:
+  - text jadi piece table (potongan text lama + teks sisipan), string utuhnya baru digabung pas text dibaca lagi
+  - index awal baris pakai gap: baris sebelum titik edit terakhir disimpan absolut, sesudahnya sebagai jarak dari
+    akhir text, jadi edit cuma nyentuh baris di sekitar titik edit
+  - edit dicatat di edits, offset Token lama digeser pas dibaca (lihat token.py), bukan satu-satu pas edit
 """
 
+from bisect import bisect_left, bisect_right
+
+from src.lexer.names import NameTable
+
+
 class CharStream:
-    def __init__(self, text: str):
-        self.text = text
+    def __init__(self, text: str, names: NameTable | None = None):
+        self._text = text
+        self.length = len(text)
         self.pos = 0
-        self.row = 1
-        self.col = 1
+        self._pieces: list[tuple[str, int, int]] | None = None  # (string, start, end), None = text sudah utuh
+        self._head: list[int] | None = None  # awal baris <= titik gap (absolut)
+        self._tail: list[int] = []           # awal baris sesudah gap, jarak dari akhir text (menaik, ujung = dekat gap)
+        # log edit (offset, ujung area yang dihapus, selisih panjang), revision = jumlah edit
+        self.edits: list[tuple[int, int, int]] = []
+        self.revision = 0
+        self.names = names if names is not None else NameTable()
+
+    @property
+    def text(self) -> str:
+        # sesudah apply_edit text masih berupa potongan, digabung sekali pas pertama kali dibaca lagi
+        if self._pieces is not None:
+            self._text = "".join(string[start:end] for string, start, end in self._pieces)
+            self._pieces = None
+        return self._text
 
     def eof(self) -> bool:
-        return self.pos >= len(self.text)
+        return self.pos >= self.length
 
     def peek(self) -> str: 
         if self.eof():
@@ -30,13 +56,124 @@ class CharStream:
         # note : yg dilakukan next adalah (pindah posisi -> peek)
         char = self.peek()
         self.pos += 1
-        if char == '\n':
-            self.row += 1
-            self.col = 1
-        else :
-            self.col += 1
         return char
 
+    def advance_to(self, pos: int):
+        self.pos = pos
+
+    def slice(self, start: int, end: int) -> str:
+        # text[start:end] tanpa nyatuin piece table
+        if self._pieces is None:
+            return self._text[start:end]
+        parts = []
+        offset = 0
+        for string, lo, hi in self._pieces:
+            size = hi - lo
+            if offset + size > start and offset < end:
+                parts.append(string[lo + max(start - offset, 0):lo + min(end - offset, size)])
+            offset += size
+            if offset >= end:
+                break
+        return "".join(parts)
+
+    def _split_pieces(self, offset: int, removed_len: int, inserted: str):
+        if self._pieces is None:
+            self._pieces = [(self._text, 0, self.length)]
+            self._text = None
+        end = offset + removed_len
+        pieces = []
+        pos = 0
+        for string, lo, hi in self._pieces:
+            size = hi - lo
+            if pos + size <= offset or pos >= end:
+                if pos >= end and inserted is not None:
+                    pieces.append((inserted, 0, len(inserted)))
+                    inserted = None
+                pieces.append((string, lo, hi))
+            else:
+                if pos < offset:
+                    pieces.append((string, lo, lo + offset - pos))
+                if inserted is not None:
+                    pieces.append((inserted, 0, len(inserted)))
+                    inserted = None
+                if pos + size > end:
+                    pieces.append((string, lo + end - pos, hi))
+            pos += size
+        if inserted is not None:
+            pieces.append((inserted, 0, len(inserted)))
+        self._pieces = [piece for piece in pieces if piece[1] < piece[2]]
+
+    def _line_index(self) -> tuple[list[int], list[int]]:
+        # offset awal tiap baris, dibangun sekali (satu pass) pas pertama kali butuh posisi
+        if self._head is None:
+            text = self.text
+            starts = [0]
+            i = text.find('\n')
+            while i != -1:
+                starts.append(i + 1)
+                i = text.find('\n', i + 1)
+            self._head = starts
+        return self._head, self._tail
+
+    def _move_gap(self, offset: int):
+        # head = awal baris <= offset, tail = sisanya; yang pindah cuma baris di antara gap lama dan offset
+        head, tail = self._line_index()
+        length = self.length
+        while tail and length - tail[-1] <= offset:
+            head.append(length - tail.pop())
+        while head[-1] > offset:
+            tail.append(length - head.pop())
+
+    @property
+    def line_starts(self) -> list[int]:
+        self._move_gap(self.length)
+        return self._head
+
+    def apply_edit(self, offset: int, removed_len: int, inserted: str):
+        # ganti text[offset:offset+removed_len] dengan inserted
+        end = offset + removed_len
+        delta = len(inserted) - removed_len
+        if self._head is not None:
+            self._move_gap(offset)
+            head, tail = self._head, self._tail
+            # awal baris dari '\n' yang dihapus dibuang, dari '\n' yang disisipin ditambah; tail ikut geser sendiri
+            while tail and self.length - tail[-1] <= end:
+                tail.pop()
+            i = inserted.find('\n')
+            while i != -1:
+                head.append(offset + i + 1)
+                i = inserted.find('\n', i + 1)
+        self._split_pieces(offset, removed_len, inserted)
+        self.length += delta
+        self.edits.append((offset, end, delta))
+        self.revision += 1
+
+    def position(self, offset: int) -> tuple[int, int]:
+        head, tail = self._line_index()
+        if not tail or offset < self.length - tail[-1]:
+            line = bisect_right(head, offset)
+            return (line, offset - head[line - 1] + 1)
+        k = bisect_left(tail, self.length - offset)
+        return (len(head) + len(tail) - k, offset - (self.length - tail[k]) + 1)
+
+    @property
+    def row(self) -> int:
+        return self.position(self.pos)[0]
+
+    @property
+    def col(self) -> int:
+        return self.position(self.pos)[1]
+
     def get_pos(self) -> tuple[int, int]:
-        return (self.row, self.col)
-        
+        return self.position(self.pos)
+
+
+class WindowStream(CharStream):
+    # potongan source[base:end] buat lex ulang sebagian (Scanner.relex), row/col tetap dihitung di source aslinya
+    def __init__(self, source: CharStream, base: int, end: int):
+        super().__init__(source.slice(base, end), source.names)
+        self.source = source
+        self.base = base
+
+    def position(self, offset: int) -> tuple[int, int]:
+        return self.source.position(self.base + offset)
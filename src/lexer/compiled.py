@@ -0,0 +1,182 @@
+"""
+Apa:
+- versi "compiled" dari Rule: dfa.json diubah jadi tabel integer
+
+Ngapain:
+- state -> id integer, char -> id char class (tabel 128 entry + fallback dict buat unicode)
+- transisi disimpan di satu list flat (state * n_class + class), fallback ANY sudah di-resolve
+- -1 artinya tidak ada transisi
+
+catatan:
+- hasil classify harus sama persis dengan Scanner.classify_char (lihat resolve di bawah)
+"""
+
+import re
+
+NO_STATE = -1
+
+# naikin kalau format CompiledRule berubah, biar file .cache lama gak kepake
+COMPILER_VERSION = "2"
+
+
+def expand_char(char_classes: dict[str, str],
+                code_range: tuple[int, int] = (0, 127)) -> dict[str, str]:
+    compiled = []
+    for name, spec in char_classes.items():
+        s = (spec or "").strip()
+        if not (s.startswith("^") and s.endswith("$")):
+            if re.fullmatch(r"[A-Za-z0-9_\-\[\]\\ \t\n]+", s):
+                s = f"^[{s}]$"
+            else:
+                s = f"^{s}$"
+        try:
+            pat = re.compile(s)
+        except re.error:
+            pat = re.compile(r"^$")
+        compiled.append((name, pat))
+
+    mapping: dict[str, str] = {}
+    start, end = code_range
+    for code in range(start, end + 1):
+        ch = chr(code)
+        for name, pat in compiled:
+            if pat.match(ch):
+                if ch not in mapping:
+                    mapping[ch] = name
+                break
+
+    return mapping
+
+
+class CompiledRule:
+    def __init__(self):
+        self.states: list[str] = []
+        self.state_id: dict[str, int] = {}
+        self.classes: list[str] = []      # nama class, "" untuk OTHER
+        self.nclasses = 0
+        self.ascii_class: list[int] = []  # 128 entry
+        self.extra_class: dict[str, int] = {}  # char non-ascii yang punya transisi literal
+        self.other = 0
+        self.whitespace = NO_STATE
+        self.initial = 0
+        self.table: list[int] = []
+        self.accept: list[str | None] = []
+        self.lookup: dict[str, str] = {}
+        # filter murah sebelum slice + lower() buat cek lookup (keyword)
+        self.lookup_start: set[str] = set()
+        self.lookup_maxlen = 0
+        # berapa char maksimal yang dibaca DFA lewat ujung token (jalur state non-final setelah state final),
+        # None kalau gak terbatas (ada cycle); dipakai Scanner.relex
+        self.max_lookahead: int | None = 0
+
+    def class_of(self, ch: str) -> int:
+        code = ord(ch)
+        if code < 128:
+            return self.ascii_class[code]
+        return self.extra_class.get(ch, self.other)
+
+    def step(self, state: int, ch: str) -> int:
+        return self.table[state * self.nclasses + self.class_of(ch)]
+
+    def might_be_lookup(self, text: str, start: int, end: int) -> bool:
+        # lexeme.lower() minimal sepanjang lexeme, jadi yang lebih panjang dari keyword terpanjang pasti bukan keyword
+        if end - start > self.lookup_maxlen:
+            return False
+        ch = text[start]
+        return ch in self.lookup_start or (ord(ch) >= 128 and ch.lower()[:1] in self.lookup_start)
+
+
+def compile_rule(rule, mapping: dict[str, str]) -> CompiledRule:
+    c = CompiledRule()
+
+    # kumpulin semua state (termasuk yang cuma muncul sebagai target / final)
+    names = [rule.initial_state]
+    for src, edges in rule.transition.items():
+        names.append(src)
+        names.extend(edges.values())
+    names.extend(rule.final_states.keys())
+    for name in names:
+        if name not in c.state_id:
+            c.state_id[name] = len(c.states)
+            c.states.append(name)
+
+    # class bernama (selain ANY) + literal char yang dipakai di transisi
+    named = [name for name in rule.char_classes if name != "ANY"]
+    literals = []
+    for edges in rule.transition.values():
+        for key in edges:
+            if key == "ANY" or key in rule.char_classes or len(key) != 1:
+                continue
+            if key not in literals:
+                literals.append(key)
+
+    c.classes = named + literals + [""]
+    c.nclasses = len(c.classes)
+    c.other = c.nclasses - 1
+    class_id = {name: i for i, name in enumerate(named)}
+    literal_id = {ch: len(named) + i for i, ch in enumerate(literals)}
+    c.whitespace = class_id.get("WHITESPACE", NO_STATE)
+
+    # sama dengan classify_char: class bernama menang, selain itu char-nya sendiri
+    def resolve(ch: str) -> int:
+        value = mapping.get(ch)
+        if value is not None and value != "ANY":
+            return class_id[value]
+        return literal_id.get(ch, c.other)
+
+    c.ascii_class = [resolve(chr(code)) for code in range(128)]
+    c.extra_class = {ch: i for ch, i in literal_id.items() if ord(ch) >= 128}
+
+    c.table = [NO_STATE] * (len(c.states) * c.nclasses)
+    for src, edges in rule.transition.items():
+        base = c.state_id[src] * c.nclasses
+        any_target = edges.get("ANY")
+        for i, key in enumerate(c.classes):
+            target = edges.get(key) if key else None
+            if target is None:
+                target = any_target
+            if target is not None:
+                c.table[base + i] = c.state_id[target]
+
+    c.accept = [rule.final_states.get(name) for name in c.states]
+    c.initial = c.state_id[rule.initial_state]
+    c.lookup = dict(rule.lookup)
+    firsts = {key[:1] for key in c.lookup if key}
+    c.lookup_start = firsts | {chr(code) for code in range(128) if chr(code).lower() in firsts}
+    c.lookup_maxlen = max((len(key) for key in c.lookup), default=0)
+    c.max_lookahead = _max_lookahead(c)
+    return c
+
+
+def _max_lookahead(c: CompiledRule) -> int | None:
+    # jalur terpanjang lewat state non-final yang dimulai dari transisi keluar state final
+    def successors(state: int) -> set[int]:
+        base = state * c.nclasses
+        return {t for t in c.table[base:base + c.nclasses] if t != NO_STATE and c.accept[t] is None}
+
+    longest: dict[int, int | None] = {}
+
+    def depth(state: int, path: set[int]) -> int | None:
+        if state in longest:
+            return longest[state]
+        if state in path:
+            return None
+        best = 1
+        for nxt in successors(state):
+            d = depth(nxt, path | {state})
+            if d is None:
+                return None
+            best = max(best, 1 + d)
+        longest[state] = best
+        return best
+
+    result = 0
+    for state, token_type in enumerate(c.accept):
+        if token_type is None:
+            continue
+        for nxt in successors(state):
+            d = depth(nxt, set())
+            if d is None:
+                return None
+            result = max(result, d)
+    return result
@@ -0,0 +1,103 @@
+"""
+Differential check antar engine lexer (dfa sebagai referensi vs compiled / regex).
+
+Pakai:
+    python -m src.lexer.conformance                      # test/milestone-* + 500 source random
+    python -m src.lexer.conformance --random 5000 --seed 7 --engines regex
+
+Output: tiap divergence (nama sample, index token pertama yang beda, hasil referensi vs engine),
+exit code 1 kalau ada yang beda.
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+from src.errors import LexError
+from src.lexer.rules_loader import Rule
+from src.lexer.scanner import ENGINES, Scanner
+
+REFERENCE = "dfa"
+
+FRAGMENTS = [
+    "program", "mulai", "selesai", "variabel", "Jika", "MAKA", "x", "abc_1", "E", "e1",
+    "0", "12", "3.14", "1.", "1..5", "2.5E3", "..", ".", ":=", ":", "=", "<>", "<=", ">=", "<", ">",
+    "+", "-", "*", "/", ";", ",", "(", ")", "[", "]",
+    "'a'", "''", "'str ing'", "'multi\nline'", "'", "'unterminated",
+    " ", "  ", "\t", "\n", "\r\n", "$", "@", "{", "é", "λ", "_", "#",
+]
+
+
+def lex(rules: Rule, text: str, engine: str) -> list[tuple]:
+    # hasil lexing dalam bentuk yang bisa dibandingin langsung, error jadi entry terakhir
+    out = []
+    try:
+        for tok in Scanner(rules, text, engine=engine).iter_tokens():
+            out.append((tok.type, tok.value, tok.line, tok.col))
+    except LexError as e:
+        out.append(("LexError", str(e), e.line, e.col))
+    return out
+
+
+def random_source(rng: random.Random, max_parts: int = 40) -> str:
+    parts = []
+    for _ in range(rng.randint(0, max_parts)):
+        if rng.random() < 0.8:
+            parts.append(rng.choice(FRAGMENTS))
+        else:
+            parts.append(chr(rng.randint(0, 0x3ff)))
+    return "".join(parts)
+
+
+def corpus(root: Path) -> list[tuple[str, str]]:
+    return [(str(p), p.read_text(encoding="utf-8")) for p in sorted(root.glob("milestone-*/*.pas"))]
+
+
+def first_divergence(expected: list[tuple], actual: list[tuple]) -> int | None:
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return i
+    if len(expected) != len(actual):
+        return min(len(expected), len(actual))
+    return None
+
+
+def check(rules: Rule, samples: list[tuple[str, str]], engines: list[str]) -> int:
+    failures = 0
+    for name, text in samples:
+        expected = lex(rules, text, REFERENCE)
+        for engine in engines:
+            actual = lex(rules, text, engine)
+            i = first_divergence(expected, actual)
+            if i is None:
+                continue
+            failures += 1
+            print(f"[{engine}] {name}: diverges at token {i}")
+            print(f"    {REFERENCE:>8}: {expected[i] if i < len(expected) else '<end>'}")
+            print(f"    {engine:>8}: {actual[i] if i < len(actual) else '<end>'}")
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Differential conformance check between lexer engines")
+    ap.add_argument("--dfa", type=Path, default=Path(__file__).resolve().parents[1] / "rules" / "dfa.json")
+    ap.add_argument("--tests", type=Path, default=Path(__file__).resolve().parents[2] / "test")
+    ap.add_argument("--engines", default=",".join(e for e in ENGINES if e != REFERENCE))
+    ap.add_argument("--random", type=int, default=500, help="number of random sources")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rules = Rule().load_rule(args.dfa)
+    engines = [e for e in args.engines.split(",") if e]
+    rng = random.Random(args.seed)
+
+    samples = corpus(args.tests)
+    samples += [(f"random#{i} (seed {args.seed})", random_source(rng)) for i in range(args.random)]
+
+    failures = check(rules, samples, engines)
+    print(f"{len(samples)} samples x {len(engines)} engines, {failures} divergence(s)")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Apa:
+- backend lexer alternatif: satu regex gabungan yang diturunkan dari tabel CompiledRule
+
+Ngapain:
+- tiap state jadi satu sub-regex: (self-loop)* lalu alternatif per transisi keluar, state final dapat
+  alternatif kosong terakhir yang ditandai named group (?P<aN>) -> dari lastgroup kita tau token type-nya
+- karena DFA deterministik (set char tiap transisi disjoint), greedy + backtracking di regex
+  sama dengan longest match DFA (mundur ke state final terakhir)
+- whitespace di-skip pakai regex terpisah, keyword tetap lewat tabel lookup
+
+catatan:
+- cuma bisa kalau graf DFA (selain self-loop) gak punya cycle, selain itu ValueError
+- kalau regex gak match sama sekali, Scanner balik ke DFA compiled buat nentuin posisi LexError
+"""
+
+import re
+
+from src.lexer.compiled import NO_STATE, CompiledRule
+
+
+class MasterRegex:
+    def __init__(self, whitespace: re.Pattern, token: re.Pattern, types: dict[str, str]):
+        self.whitespace = whitespace
+        self.token = token
+        self.types = types  # nama group -> token type
+
+
+def _charset(chars: list[str], negate: bool = False) -> str:
+    body = "".join(re.escape(ch) if ch not in "]^-\\" else "\\" + ch for ch in sorted(set(chars)))
+    if negate:
+        return f"[^{body}]" if body else r"[\s\S]"
+    return f"[{body}]"
+
+
+def build_master_regex(c: CompiledRule) -> MasterRegex:
+    # char yang class-nya "dikenal" (ascii + literal non-ascii), sisanya masuk OTHER
+    known = {chr(code): cls for code, cls in enumerate(c.ascii_class)}
+    known.update(c.extra_class)
+
+    def edge_set(state: int, target: int) -> str | None:
+        base = state * c.nclasses
+        if c.table[base + c.other] == target:
+            return _charset([ch for ch, cls in known.items() if c.table[base + cls] != target], negate=True)
+        chars = [ch for ch, cls in known.items() if c.table[base + cls] == target]
+        # class yang gak punya char sama sekali (mis. literal 'E' yang ketutup LETTER) = transisi mati
+        return _charset(chars) if chars else None
+
+    types: dict[str, str] = {}
+
+    def state_regex(state: int, path: tuple[int, ...]) -> str:
+        if state in path:
+            raise ValueError(f"DFA cycle through state '{c.states[state]}' cannot be expressed as a master regex")
+        base = state * c.nclasses
+        targets = []
+        for cls in range(c.nclasses):
+            target = c.table[base + cls]
+            if target != NO_STATE and target not in targets:
+                targets.append(target)
+
+        parts = []
+        loop = ""
+        for target in targets:
+            chars = edge_set(state, target)
+            if chars is None:
+                continue
+            if target == state:
+                loop = chars + "*"
+            else:
+                parts.append(chars + state_regex(target, path + (state,)))
+
+        if c.accept[state] is not None:
+            group = f"a{len(types)}"
+            types[group] = c.accept[state]
+            parts.append(f"(?P<{group}>)")
+
+        if not parts:
+            return loop
+        return loop + "(?:" + "|".join(parts) + ")"
+
+    token = re.compile(state_regex(c.initial, ()))
+    ws_chars = [ch for ch, cls in known.items() if cls == c.whitespace]
+    whitespace = re.compile(_charset(ws_chars) + "*" if ws_chars else "")
+    return MasterRegex(whitespace, token, types)
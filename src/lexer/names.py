@@ -0,0 +1,67 @@
+"""
+Apa:
+- tabel nama identifier satu kompilasi (lexer -> parser -> analyzer), satu id int per nama
+
+Ngapain:
+- identifier Pascal-S case-insensitive: id = index nama yang sudah di-lower (case-folded), "Foo" dan "FOO" id-nya sama
+- spelling pertama yang ketemu disimpan (spellings[id]), nama yang diulang pakai string yang sama
+- exact = cache spelling persis -> id, jadi nama yang sudah pernah ketemu gak perlu lower() lagi
+- Scanner bikin token IDENTIFIER sebagai NameToken yang langsung bawa id-nya (intern_span pakai teks yang sudah
+  di-lower buat cek keyword), id-nya diterusin lewat parse tree / node AST sampai lookup di analyzer, jadi
+  analyzer gak nge-hash string nama lagi
+
+catatan:
+- satu tabel per source: CharStream bikin tabelnya sendiri (cm.names), tabel yang sama dikasih ke
+  SemanticAnalyzer / serialize.loads_ast, jadi id dari lexer cocok dengan id di symbol table; tabel ikut
+  dibuang bareng source-nya (gak ada tabel global yang numpuk nama dari semua file yang pernah di-lex)
+- find() gak nambah nama baru: nama yang belum pernah di-intern = NO_NAME (pasti belum dideklarasi)
+"""
+
+NO_NAME = -1
+
+
+class NameTable:
+    def __init__(self):
+        self.spellings: list[str] = []   # id -> spelling pertama
+        self.folded: dict[str, int] = {}  # nama lower() -> id
+        self.exact: dict[str, int] = {}   # spelling persis -> id
+
+    def intern(self, text: str) -> int:
+        nid = self.exact.get(text)
+        if nid is None:
+            folded = text.lower()
+            nid = self.folded.get(folded)
+            if nid is None:
+                nid = len(self.spellings)
+                self.folded[folded] = nid
+                self.spellings.append(text)
+            self.exact[text] = nid
+        return nid
+
+    def intern_span(self, text: str, start: int, end: int, folded: str | None = None) -> int:
+        # intern text[start:end]; folded = text[start:end].lower() kalau pemanggil sudah punya (cek keyword di Scanner)
+        if folded is None:
+            word = text[start:end]
+            nid = self.exact.get(word)
+            if nid is not None:
+                return nid
+            folded = word.lower()
+        nid = self.folded.get(folded)
+        if nid is None:
+            nid = len(self.spellings)
+            self.folded[folded] = nid
+            self.spellings.append(text[start:end])
+        return nid
+
+    def find(self, text: str) -> int:
+        nid = self.exact.get(text)
+        if nid is None:
+            nid = self.folded.get(text.lower(), NO_NAME)
+        return nid
+
+    def spelling(self, nid: int) -> str:
+        return self.spellings[nid]
+
+    def __len__(self) -> int:
+        return len(self.spellings)
+
@@ -0,0 +1,111 @@
+"""
+Apa:
+- lexing paralel buat source yang gede banget
+
+Ngapain:
+- source dipotong di akhir baris yang pasti di luar char/string literal (state CHR/STR di dfa.json)
+  -> karakter pembuka literal (transisi dari initial_state ke state yang punya ANY) dihitung paritasnya,
+     newline dengan jumlah kutip genap sebelumnya = di luar literal = batas token yang aman
+- tiap potongan di-lex di ProcessPoolExecutor pakai engine compiled, hasilnya (type, start, end) relatif
+- offset di-rebase ke posisi global, token digabung sesuai urutan
+- LexError pertama (urut source) yang di-raise, pesannya sama persis dengan lexing serial
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.errors import LexError
+from src.lexer.charstream import CharStream
+from src.lexer.rules_loader import Rule
+from src.lexer.token import NameToken, Token
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_worker_rules: Rule | None = None
+
+
+def literal_quotes(rules: Rule) -> set[str]:
+    initial = rules.transition.get(rules.initial_state, {})
+    quotes = set()
+    for key, target in initial.items():
+        if len(key) == 1 and key not in rules.char_classes and "ANY" in rules.transition.get(target, {}):
+            quotes.add(key)
+    return quotes
+
+
+def split_points(text: str, quotes: set[str], chunk_size: int) -> list[int]:
+    # offset awal tiap potongan (selalu diawali 0)
+    points = [0]
+    n = len(text)
+    last = 0
+    inside = False  # paritas kutip di [0, last)
+    target = chunk_size
+    while target < n:
+        nl = text.find('\n', target)
+        if nl == -1:
+            break
+        odd = sum(text.count(q, last, nl) for q in quotes) % 2 == 1
+        inside = inside != odd
+        last = nl
+        if not inside:
+            points.append(nl + 1)
+            target = nl + 1 + chunk_size
+        else:
+            target = nl + 1
+    return points
+
+
+def _init_worker(rules: Rule):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _lex_chunk(chunk: str):
+    # jalan di worker; return (types, starts, ends, offset error atau None) relatif ke potongan
+    from src.lexer.scanner import Scanner
+
+    scanner = Scanner(_worker_rules, chunk, engine="compiled")
+    types, starts, ends = [], [], []
+    try:
+        for tok in scanner.iter_tokens():
+            types.append(tok.type)
+            starts.append(tok.start)
+            ends.append(tok.end)
+    except LexError:
+        return types, starts, ends, scanner.cm.pos
+    return types, starts, ends, None
+
+
+def tokenize_parallel(rules: Rule, cm: CharStream, workers: int | None = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[Token]:
+    text = cm.text
+    points = split_points(text, literal_quotes(rules), chunk_size)
+    bounds = list(zip(points, points[1:] + [len(text)]))
+    workers = workers or os.cpu_count() or 1
+
+    if len(bounds) == 1 or workers == 1:
+        results = [_lex_serial(rules, text[a:b]) for a, b in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules,)) as pool:
+            results = pool.map(_lex_chunk, [text[a:b] for a, b in bounds])
+
+    tokens: list[Token] = []
+    names = cm.names
+    for (base, _), (types, starts, ends, error) in zip(bounds, results):
+        # id nama identifier di-intern di proses utama, urut chunk, jadi id dan spelling pertama sama dengan lexing serial
+        tokens.extend(NameToken(t, s + base, e + base, cm, names.intern_span(text, s + base, e + base))
+                      if t == "IDENTIFIER" else Token(t, s + base, e + base, cm)
+                      for t, s, e in zip(types, starts, ends))
+        if error is not None:
+            cm.advance_to(base + error)
+            error_char = cm.peek()
+            line, col = cm.get_pos()
+            raise LexError(f"Unexpected character '{error_char}' at {line}:{col}", line, col)
+
+    cm.advance_to(len(text))
+    return tokens
+
+
+def _lex_serial(rules: Rule, chunk: str):
+    _init_worker(rules)
+    return _lex_chunk(chunk)
@@ -2,6 +2,12 @@ import json
 from pathlib import Path
 from typing import Optional, Union
 
+from src.cache import content_key, read_cache, write_cache
+from src.lexer.compiled import COMPILER_VERSION, CompiledRule, compile_rule, expand_char
+from src.lexer.master_regex import MasterRegex, build_master_regex
+
+RULE_FIELDS = ("initial_state", "final_states", "transition", "lookup", "char_classes", "mapping")
+
 
 class Rule:
     def __init__(self):
@@ -9,8 +15,12 @@ class Rule:
         self.initial_state = {}
         self.final_states = {}
         self.lookup = {}
+        self.char_classes = {}
+        self.mapping: dict[str, str] = {}
+        self.compiled: CompiledRule | None = None
+        self._master: MasterRegex | None = None
 
-    def load_rule(self, path: Optional[Union[str, Path]] = None):
+    def load_rule(self, path: Optional[Union[str, Path]] = None, use_cache: bool = True):
         if path is None:
             path = Path(__file__).resolve().parents[1] / "rules" / "dfa.json"
         path = Path(path)
@@ -19,8 +29,20 @@ class Rule:
             raise FileNotFoundError(f"DFA rules file not found: {path}")
 
         try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            raw = path.read_bytes()
+        except OSError as e:
+            raise RuntimeError(f"Failed to read/parse DFA JSON file '{path}': {e}")
+
+        # tabel yang sudah dicompile disimpan di <dfa>.cache, key-nya hash isi json + versi compiler
+        key = content_key(raw, COMPILER_VERSION)
+        if use_cache:
+            cached = read_cache(path, key)
+            if cached is not None:
+                self._restore(cached)
+                return self
+
+        try:
+            data = json.loads(raw.decode("utf-8"))
         except Exception as e:
             raise RuntimeError(f"Failed to read/parse DFA JSON file '{path}': {e}")
 
@@ -36,4 +58,31 @@ class Rule:
         self.transition = data["transition"]
         self.lookup = data["lookup"]
         self.char_classes = data["char_classes"]
+        self.compile()
+        if use_cache:
+            write_cache(path, key, self._snapshot())
         return self
+
+    def compile(self) -> CompiledRule:
+        # dipanggil sekali pas load, hasilnya dipakai engine "compiled" di Scanner
+        self.mapping = expand_char(self.char_classes)
+        self.compiled = compile_rule(self, self.mapping)
+        self._master = None
+        return self.compiled
+
+    def master_regex(self) -> MasterRegex:
+        # dibangun sekali per Rule, cuma kalau backend regex dipakai
+        if self._master is None:
+            self._master = build_master_regex(self.compiled)
+        return self._master
+
+    def _snapshot(self) -> dict:
+        snapshot = {name: getattr(self, name) for name in RULE_FIELDS}
+        snapshot["compiled"] = vars(self.compiled)
+        return snapshot
+
+    def _restore(self, snapshot: dict):
+        for name in RULE_FIELDS:
+            setattr(self, name, snapshot[name])
+        self.compiled = CompiledRule()
+        self.compiled.__dict__.update(snapshot["compiled"])
@@ -8,34 +8,338 @@ Ngapain:
 - match symbol/token, kalo masi belum tentu, cek lookup table buat ngecek apakah hasilnya preserved word
 - kalau invalid, misal ga ada transition untuk suatu karakter di state tertentu, raise/yield lexical error, sama keterangan yang jelas (line, col atau tambah deskripsi)
 
+Engine:
+- "dfa"      : jalanin dfa.json langsung (dict lookup per karakter), dipakai sebagai referensi
+- "compiled" : jalanin tabel integer dari Rule.compiled (lihat compiled.py), output token harus sama persis
+- "regex"    : satu master regex hasil turunan tabel compiled (lihat master_regex.py), kerjanya di C (re)
+- "vectorized": tabel compiled + pre-pass NumPy (lihat vectorized.py), lompat per run char; tanpa NumPy = compiled
+- cek kesamaan antar engine: python -m src.lexer.conformance
+
 """
 
 
-from src.lexer.charstream import CharStream
-from src.lexer.token import Token
+from bisect import bisect_left
+from collections.abc import Iterator
+
+from src.lexer.charstream import CharStream, WindowStream
+from src.lexer.token import NameToken, Token
+from src.lexer.token_buffer import TokenBuffer
+from src.lexer.parallel import DEFAULT_CHUNK_SIZE, tokenize_parallel
 from src.lexer.rules_loader import Rule
+from src.lexer.compiled import NO_STATE, expand_char
+from src.lexer import vectorized
 from src.errors import LexError
-import re
+
+ENGINES = ("dfa", "compiled", "regex", "vectorized")
 
 class Scanner:
-    def __init__(self, rules: Rule, filepath: str):
+    # recover=True: LexError gak di-raise, dicatat di self.errors dan jadi token ERROR, lexing lanjut
+    def __init__(self, rules: Rule, filepath: str, engine: str = "compiled", recover: bool = False):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown lexer engine '{engine}'")
         self.cm: CharStream = CharStream(filepath)
         self.rules:Rule = Rule()
         self.rules = rules
-        self.mapping: dict[str,str] = self.expand_char(self.rules.char_classes)
+        self.mapping: dict[str,str] = self.rules.mapping or self.expand_char(self.rules.char_classes)
+        if engine != "dfa" and self.rules.compiled is None:
+            self.rules.compile()
+        if engine == "vectorized" and not vectorized.AVAILABLE:
+            engine = "compiled"
+        self.engine = engine
+        self.master = self.rules.master_regex() if engine == "regex" else None
+        self._pre = None  # (text, classes, run_end, self_loops) buat engine vectorized
+        self.recover = recover
+        self.errors: list[LexError] = []
 
     def tokenize(self) -> list[Token]:
-        tokens: list[Token] = []
+        return list(self.iter_tokens())
+
+    def tokenize_parallel(self, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[Token]:
+        # hasil harus sama dengan tokenize(), lihat parallel.py (selalu pakai engine compiled di worker)
+        if self.rules.compiled is None:
+            self.rules.compile()
+        return tokenize_parallel(self.rules, self.cm, workers, chunk_size)
+
+    def tokenize_buffer(self) -> TokenBuffer:
+        # versi ringkas dari tokenize buat input besar, lihat token_buffer.py
+        buf = TokenBuffer(self.cm)
+        for token in self.iter_tokens():
+            buf.append(token.type, token.start, token.end)
+        return buf
+
+    def relex(self, previous_tokens: list[Token], edit_offset: int, removed_len: int,
+              inserted_text: str) -> tuple[list[Token], tuple[int, int, int]]:
+        """
+        Re-lex setelah edit text[edit_offset:edit_offset+removed_len] -> inserted_text.
+
+        previous_tokens harus hasil scanner ini (source-nya self.cm). Source di-edit in-place, token sebelum
+        edit dipakai ulang apa adanya, token setelah titik sinkron gak disentuh (offset-nya geser sendiri pas
+        dibaca, lihat token.py). Yang di-lex ulang cuma potongan text di sekitar edit (window, digandakan
+        kalau token bisa nyambung lewat ujungnya), jadi biayanya sebanding ukuran edit, bukan ukuran file.
+        Return (previous_tokens yang sudah di-splice in-place, (start, old_end, new_end)): token lama
+        [start:old_end] diganti hasil[start:new_end].
+        """
+        cm = self.cm
+        lookahead = self.rules.compiled.max_lookahead if self.rules.compiled else None
+        edit_end = edit_offset + removed_len
 
+        # token yang aman = DFA-nya gak pernah baca char di area edit (ujung token + lookahead < edit_offset)
+        if lookahead is None:
+            start = 0
+        else:
+            start = bisect_left(previous_tokens, edit_offset, key=lambda t: t.end + lookahead)
+        restart = previous_tokens[start - 1].end if start > 0 else 0
+        # kandidat titik sinkron = token lama yang mulai sesudah area edit
+        suffix_lo = bisect_left(previous_tokens, edit_end, lo=start, key=lambda t: t.start)
+
+        cm.apply_edit(edit_offset, removed_len, inserted_text)
+        new_edit_end = edit_offset + len(inserted_text)
+
+        # lex ulang sampai ketemu awal token lama di bagian yang gak berubah (state = initial di offset yang sama)
+        relexed: list[Token] = []
+        old_end = len(previous_tokens)
+        size = max(4 * (new_edit_end - restart), 256)
+        synced = False
+        while not synced:
+            base = restart
+            # lookahead gak terbatas = DFA bisa baca sampai mana aja, jadi window = seluruh sisa text
+            window = WindowStream(cm, base, cm.length if lookahead is None else min(base + size, cm.length))
+            at_eof = base + window.length >= cm.length
+            limit = window.length - (lookahead or 0)
+            errors = len(self.errors)
+            self.cm = window
+            try:
+                while True:
+                    before = window.pos
+                    try:
+                        token = self._scan()
+                    except LexError as e:
+                        if not at_eof and window.pos >= window.length:
+                            break
+                        if not self.recover:
+                            raise
+                        self.errors.append(e)
+                        token = self._error_token(before)
+                    if token is None:
+                        synced = at_eof
+                        break
+                    if not at_eof and token.end >= limit:
+                        # token (atau lookahead-nya) nyentuh ujung window, bisa beda kalau text-nya lebih panjang
+                        del self.errors[errors:]
+                        break
+                    token.rebind(cm, base)
+                    errors = len(self.errors)
+                    restart = token.end
+                    if token.start >= new_edit_end:
+                        i = bisect_left(previous_tokens, token.start, lo=suffix_lo, key=lambda t: t.start)
+                        if i < len(previous_tokens) and previous_tokens[i].start == token.start:
+                            old_end = i
+                            synced = True
+                            break
+                    relexed.append(token)
+            finally:
+                self.cm = cm
+            size *= 2
+
+        previous_tokens[start:old_end] = relexed
+        cm.advance_to(cm.length)
+
+        new_end = start + len(relexed)
+        return previous_tokens, (start, old_end, new_end)
+
+    def iter_tokens(self) -> Iterator[Token]:
+        # versi streaming dari tokenize, token dibuat pas diminta aja
         while True:
             token = self.next_token()
             if token is None:
+                return
+            yield token
+
+    def next_token(self) -> Token | None:
+        if not self.recover:
+            return self._scan()
+
+        before = self.cm.pos
+        try:
+            return self._scan()
+        except LexError as e:
+            self.errors.append(e)
+            return self._error_token(before)
+
+    def _error_token(self, before: int) -> Token:
+        # token ERROR = dari awal token yang gagal sampai karakter berikutnya yang punya transisi dari initial_state
+        cm = self.cm
+        text = cm.text
+        start = before
+        while start < len(text) and self.classify_char(text[start]) == "WHITESPACE":
+            start += 1
+
+        resume = max(cm.pos, start + 1)
+        while resume < len(text) and not self._has_initial_transition(text[resume]):
+            resume += 1
+        resume = min(resume, len(text))
+
+        cm.advance_to(resume)
+        return Token("ERROR", start, resume, cm)
+
+    def _has_initial_transition(self, ch: str) -> bool:
+        edges = self.rules.transition.get(self.rules.initial_state, {})
+        return self.classify_char(ch) in edges or "ANY" in edges
+
+    def _scan(self) -> Token | None:
+        if self.engine == "compiled":
+            return self._next_token_compiled()
+        if self.engine == "regex":
+            return self._next_token_regex()
+        if self.engine == "vectorized":
+            return self._next_token_vectorized()
+        return self._next_token_dfa()
+
+    def _identifier(self, start: int, end: int, folded: str | None) -> NameToken:
+        # identifier langsung bawa id namanya (lihat names.py); folded = lexeme.lower() dari cek keyword, kalau ada
+        cm = self.cm
+        return NameToken("IDENTIFIER", start, end, cm, cm.names.intern_span(cm.text, start, end, folded))
+
+    def _next_token_vectorized(self) -> Token | None:
+        cm = self.cm
+        c = self.rules.compiled
+        text = cm.text
+        if self._pre is None or self._pre[0] is not text:
+            self._pre = (text, *vectorized.preclassify(text, c), vectorized.self_loops(c))
+        _, classes, run_end, loops = self._pre
+
+        n = len(text)
+        table, ncls, accept = c.table, c.nclasses, c.accept
+
+        i = cm.pos
+        if i < n and classes[i] == c.whitespace:
+            i = run_end[i]
+        if i >= n:
+            cm.advance_to(i)
+            return None
+
+        start = i
+        state = c.initial
+        last_acc_state = NO_STATE
+        last_acc_index = start
+
+        while i < n:
+            k = state * ncls + classes[i]
+            state = table[k]
+            if state == NO_STATE:
                 break
-            tokens.append(token)
+            # kalau state baru punya self-loop di class yang sama, satu run langsung habis
+            i = run_end[i] if loops[state * ncls + classes[i]] else i + 1
+            if accept[state] is not None:
+                last_acc_state = state
+                last_acc_index = i
 
-        return tokens
+        if last_acc_state != NO_STATE:
+            cm.advance_to(last_acc_index)
 
-    def next_token(self) -> Token | None:
+            token_type = accept[last_acc_state]
+            folded = None
+            if c.might_be_lookup(text, start, last_acc_index):
+                folded = text[start:last_acc_index].lower()
+                lookup_type = c.lookup.get(folded)
+                if lookup_type is not None:
+                    token_type = lookup_type
+
+            if token_type == "IDENTIFIER":
+                return self._identifier(start, last_acc_index, folded)
+            return Token(token_type, start, last_acc_index, cm)
+
+        cm.advance_to(i)
+        self._raise_unexpected()
+
+    def _next_token_regex(self) -> Token | None:
+        cm = self.cm
+        text = cm.text
+        master = self.master
+
+        start = master.whitespace.match(text, cm.pos).end()
+        if start >= len(text):
+            cm.advance_to(start)
+            return None
+
+        m = master.token.match(text, start)
+        if m is None:
+            # gak ada prefix yang diterima: biar posisi error sama persis, DFA compiled yang raise
+            cm.advance_to(start)
+            return self._next_token_compiled()
+
+        end = m.end()
+        cm.advance_to(end)
+
+        c = self.rules.compiled
+        token_type = master.types[m.lastgroup]
+        folded = None
+        if c.might_be_lookup(text, start, end):
+            folded = text[start:end].lower()
+            lookup_type = c.lookup.get(folded)
+            if lookup_type is not None:
+                token_type = lookup_type
+
+        if token_type == "IDENTIFIER":
+            return self._identifier(start, end, folded)
+        return Token(token_type, start, end, cm)
+
+    def _next_token_compiled(self) -> Token | None:
+        cm = self.cm
+        c = self.rules.compiled
+        text = cm.text
+        n = len(text)
+        table, ncls, accept = c.table, c.nclasses, c.accept
+        ascii_class, extra_class, other = c.ascii_class, c.extra_class, c.other
+
+        i = cm.pos
+        ws = c.whitespace
+        while i < n:
+            code = ord(text[i])
+            cls = ascii_class[code] if code < 128 else extra_class.get(text[i], other)
+            if cls != ws:
+                break
+            i += 1
+
+        if i >= n:
+            cm.advance_to(i)
+            return None
+
+        start = i
+        state = c.initial
+        last_acc_state = NO_STATE
+        last_acc_index = start
+
+        while i < n:
+            code = ord(text[i])
+            cls = ascii_class[code] if code < 128 else extra_class.get(text[i], other)
+            state = table[state * ncls + cls]
+            if state == NO_STATE:
+                break
+            i += 1
+            if accept[state] is not None:
+                last_acc_state = state
+                last_acc_index = i
+
+        if last_acc_state != NO_STATE:
+            cm.advance_to(last_acc_index)
+
+            token_type = accept[last_acc_state]
+            folded = None
+            if c.might_be_lookup(text, start, last_acc_index):
+                folded = text[start:last_acc_index].lower()
+                lookup_type = c.lookup.get(folded)
+                if lookup_type is not None:
+                    token_type = lookup_type
+
+            if token_type == "IDENTIFIER":
+                return self._identifier(start, last_acc_index, folded)
+            return Token(token_type, start, last_acc_index, cm)
+
+        cm.advance_to(i)
+        self._raise_unexpected()
+
+    def _next_token_dfa(self) -> Token | None:
         self.skip_whitespace()
 
         cm = self.cm
@@ -44,13 +348,10 @@ class Scanner:
         if cm.eof():
             return None
         
-        token_line, token_col = cm.get_pos()
+        start = cm.pos
         state = rules.initial_state
         last_acc_state = None
-        last_acc_pos: tuple[int, int] | None = None
         last_acc_index: int | None = None
-        last_acc_lexeme = ""
-        lexeme = ""
 
         while not cm.eof():
             ch = cm.peek()
@@ -63,29 +364,32 @@ class Scanner:
             if next_state is None:
                 break
 
-            lexeme += cm.next()
+            cm.next()
             state = next_state
 
             if state in rules.final_states:
                 last_acc_state = state
-                last_acc_pos = cm.get_pos()
                 last_acc_index = cm.pos
-                last_acc_lexeme = lexeme
 
-        if last_acc_state is not None and last_acc_pos is not None and last_acc_index is not None:
+        if last_acc_state is not None and last_acc_index is not None:
             cm.pos = last_acc_index
-            cm.row, cm.col = last_acc_pos
 
-            lexeme = last_acc_lexeme
             token_type = rules.final_states[last_acc_state]
-            lookup_type = rules.lookup.get(lexeme.lower())
+            folded = cm.text[start:last_acc_index].lower()
+            lookup_type = rules.lookup.get(folded)
             if lookup_type is not None:
                 token_type = lookup_type
 
-            return Token(token_type, lexeme, token_line, token_col)
+            if token_type == "IDENTIFIER":
+                return self._identifier(start, last_acc_index, folded)
+            return Token(token_type, start, last_acc_index, cm)
         
-        error_char = cm.peek()
-        err_line, err_col = cm.get_pos()
+        self._raise_unexpected()
+
+    def _raise_unexpected(self):
+        # posisi error = posisi karakter tempat DFA macet (bukan awal token)
+        error_char = self.cm.peek()
+        err_line, err_col = self.cm.get_pos()
         raise LexError(f"Unexpected character '{error_char}' at {err_line}:{err_col}", err_line, err_col)
 
     def classify_char(self,ch: str) -> str:
@@ -116,31 +420,7 @@ class Scanner:
     
     def expand_char(self, char_classes: dict[str, str],
                                 code_range: tuple[int,int]=(0, 127)) -> dict[str, str]:
-        compiled = []
-        for name, spec in char_classes.items():
-            s = (spec or "").strip()
-            if not (s.startswith("^") and s.endswith("$")):
-                if re.fullmatch(r"[A-Za-z0-9_\-\[\]\\ \t\n]+", s):
-                    s = f"^[{s}]$"
-                else:
-                    s = f"^{s}$"
-            try:
-                pat = re.compile(s)
-            except re.error:
-                pat = re.compile(r"^$")
-            compiled.append((name, pat))
-
-        mapping: dict[str,str] = {}
-        start, end = code_range
-        for code in range(start, end + 1):
-            ch = chr(code)
-            for name, pat in compiled:
-                if pat.match(ch):
-                    if ch not in mapping:
-                        mapping[ch] = name
-                    break
-
-        return mapping
+        return expand_char(char_classes, code_range)
 
                 
 
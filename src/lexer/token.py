@@ -1,11 +1,99 @@
-from dataclasses import dataclass
+from src.lexer.charstream import CharStream
+from src.lexer.names import NO_NAME
 
-@dataclass(frozen=True)
+# token cuma nyimpen offset [start, end) ke source, value dan line/col dihitung pas diakses
+# offset-nya relatif ke source.revision waktu token dibuat: kalau source di-edit (CharStream.apply_edit), offset
+# baru digeser pas start/end dibaca, jadi edit gak perlu nyentuh semua token sesudahnya
 class Token:
-    type: str
-    value: str
-    line: int
-    col: int
+    __slots__ = ("type", "_start", "_end", "source", "_rev")
+
+    def __init__(self, type: str, start: int, end: int, source: CharStream):
+        self.type = type
+        self._start = start
+        self._end = end
+        self.source = source
+        self._rev = source.revision
+
+    def _rebase(self):
+        # terapkan edit yang terjadi sesudah token dibuat / terakhir digeser
+        start, end = self._start, self._end
+        edits = self.source.edits
+        for offset, edit_end, delta in edits[self._rev:]:
+            if start >= edit_end:
+                start += delta
+                end += delta
+            elif end > offset:
+                # token kena edit (token ini bakal diganti relex), dijepit ke titik edit biar gak nunjuk keluar text
+                start, end = min(start, offset), offset
+        self._start, self._end = start, end
+        self._rev = len(edits)
+
+    @property
+    def start(self) -> int:
+        if self._rev != self.source.revision:
+            self._rebase()
+        return self._start
+
+    @property
+    def end(self) -> int:
+        if self._rev != self.source.revision:
+            self._rebase()
+        return self._end
+
+    def rebind(self, source: CharStream, shift: int):
+        # pindah ke source lain, offset ditambah shift (token hasil lex potongan text, lihat Scanner.relex)
+        self._start += shift
+        self._end += shift
+        self.source = source
+        self._rev = source.revision
+
+    @property
+    def value(self) -> str:
+        if self._rev != self.source.revision:
+            self._rebase()
+        return self.source.text[self._start:self._end]
+
+    @property
+    def name_id(self) -> int:
+        # id nama (case-folded), NO_NAME buat token selain IDENTIFIER; Scanner bikin identifier sebagai NameToken
+        # yang id-nya sudah kesimpen, ini cuma buat Token yang dibuat di luar Scanner; token tanpa source (hasil
+        # load serialize) gak punya tabel nama = NO_NAME, analyzer nyari lewat spelling-nya
+        if self.type != "IDENTIFIER" or self.source is None:
+            return NO_NAME
+        return self.source.names.intern(self.value)
+
+    @property
+    def line(self) -> int:
+        return self.source.position(self.start)[0]
+
+    @property
+    def col(self) -> int:
+        return self.source.position(self.start)[1]
+
+    def get_pos(self) -> tuple[int, int]:
+        return self.source.position(self.start)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (self.type, self.value, self.get_pos()) == (other.type, other.value, other.get_pos())
+
+    def __hash__(self) -> int:
+        return hash((self.type, self.value, self.get_pos()))
 
     def __repr__(self) -> str:
         return f"{self.type}({self.value})" if self.value != "" else f"{self.type}"
+
+
+class NameToken(Token):
+    # token IDENTIFIER + id namanya di source.names (diisi Scanner / TokenBuffer pas token dibuat)
+    __slots__ = ("name_id",)
+
+    def __init__(self, type: str, start: int, end: int, source: CharStream, name_id: int):
+        # tanpa super().__init__: dibuat sekali per identifier di loop lexer
+        self.type = type
+        self._start = start
+        self._end = end
+        self.source = source
+        self._rev = source.revision
+        self.name_id = name_id
@@ -0,0 +1,157 @@
+"""
+Apa:
+- penyimpanan token versi "struct of arrays" buat input besar (pengganti list[Token])
+
+Ngapain:
+- kind token disimpan sebagai int kecil di array('B'), offset start/end di array('I')
+- value di-intern ke satu tabel string bersama (value_ids nunjuk ke situ)
+- line/col gak disimpan, dihitung dari offset lewat CharStream (sama kaya Token)
+- id nama identifier (source.names) dihitung sekali per spelling (string id -> id nama), buffer[i] jadi NameToken
+- Token cuma dibuat kalau ada yang minta (buffer[i]), parser cek kind/value langsung pakai int (TokenCursor,
+  terminal-nya di-resolve ke id sekali per buffer)
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable
+
+from src.lexer.charstream import CharStream
+from src.lexer.names import NO_NAME
+from src.lexer.token import NameToken, Token
+
+NO_KIND = -1
+
+
+class TokenBuffer:
+    def __init__(self, source: CharStream):
+        self.source = source
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.value_ids = array('I')
+        self.kind_names: list[str] = []
+        self.kind_ids: dict[str, int] = {}
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        self.identifier_kind = NO_KIND
+        self.string_names: dict[int, int] = {}  # string id identifier -> id nama
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token], source: CharStream) -> "TokenBuffer":
+        buf = cls(source)
+        for tok in tokens:
+            buf.append(tok.type, tok.start, tok.end)
+        return buf
+
+    def intern_kind(self, name: str) -> int:
+        kind = self.kind_ids.get(name)
+        if kind is None:
+            kind = len(self.kind_names)
+            if kind > 0xff:
+                raise ValueError("TokenBuffer supports at most 256 token kinds")
+            self.kind_ids[name] = kind
+            self.kind_names.append(name)
+            if name == "IDENTIFIER":
+                self.identifier_kind = kind
+        return kind
+
+    def intern_string(self, value: str) -> int:
+        sid = self.string_ids.get(value)
+        if sid is None:
+            sid = len(self.strings)
+            self.string_ids[value] = sid
+            self.strings.append(value)
+        return sid
+
+    def append(self, type: str, start: int, end: int):
+        self.kinds.append(self.intern_kind(type))
+        self.starts.append(start)
+        self.ends.append(end)
+        self.value_ids.append(self.intern_string(self.source.text[start:end]))
+
+    def kind_of(self, name: str) -> int:
+        return self.kind_ids.get(name, NO_KIND)
+
+    def string_of(self, value: str) -> int:
+        return self.string_ids.get(value, NO_KIND)
+
+    def type(self, i: int) -> str:
+        return self.kind_names[self.kinds[i]]
+
+    def value(self, i: int) -> str:
+        return self.strings[self.value_ids[i]]
+
+    def name_id(self, i: int) -> int:
+        if self.kinds[i] != self.identifier_kind:
+            return NO_NAME
+        sid = self.value_ids[i]
+        nid = self.string_names.get(sid)
+        if nid is None:
+            nid = self.string_names[sid] = self.source.names.intern(self.strings[sid])
+        return nid
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, i: int) -> Token:
+        # view Token-compatible, dibuat pas diminta aja
+        if i < 0:
+            i += len(self.kinds)
+        kind = self.kinds[i]
+        if kind == self.identifier_kind:
+            return NameToken("IDENTIFIER", self.starts[i], self.ends[i], self.source, self.name_id(i))
+        return Token(self.kind_names[kind], self.starts[i], self.ends[i], self.source)
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        # memori yang dipegang buffer (array + tabel string), tanpa source text
+        total = sum(sys.getsizeof(col) for col in (self.kinds, self.starts, self.ends, self.value_ids))
+        total += sys.getsizeof(self.strings) + sys.getsizeof(self.string_ids)
+        total += sum(sys.getsizeof(s) for s in self.strings)
+        total += sys.getsizeof(self.kind_names) + sys.getsizeof(self.kind_ids)
+        return total
+
+
+class TokenCursor:
+    # pembaca TokenBuffer buat Parser, interface-nya sama dengan LookaheadBuffer (peek/advance/match)
+    def __init__(self, buffer: TokenBuffer):
+        self.buffer = buffer
+        self.pos = 0
+        # terminal parser di-resolve ke id sekali per buffer (kaya BoundGrammar buat TableParser), habis itu
+        # match cuma bandingin int; di-intern ke buffer, jadi id-nya tetap valid walaupun buffer-nya nambah token
+        self.bound_kinds: dict[str, int] = {}                     # type -> kind id
+        self.bound_values: dict[str, tuple[str, int, int]] = {}  # value -> (type, kind id, value id)
+
+    def peek(self, k: int = 0) -> Token | None:
+        i = self.pos + k
+        return self.buffer[i] if i < len(self.buffer) else None
+
+    def advance(self):
+        if self.pos < len(self.buffer):
+            self.pos += 1
+
+    def bind(self, token_type: str, token_value: str | None):
+        buf = self.buffer
+        kind = self.bound_kinds[token_type] = buf.intern_kind(token_type)
+        if token_value is None:
+            return kind
+        entry = self.bound_values[token_value] = (token_type, kind, buf.intern_string(token_value))
+        return entry
+
+    def match(self, k: int, token_type: str, token_value: str | None = None) -> bool:
+        buf = self.buffer
+        i = self.pos + k
+        if i >= len(buf.kinds):
+            return False
+        if token_value is None:
+            kind = self.bound_kinds.get(token_type)
+            if kind is None:
+                kind = self.bind(token_type, None)
+            return buf.kinds[i] == kind
+        entry = self.bound_values.get(token_value)
+        if entry is None or entry[0] != token_type:
+            entry = self.bind(token_type, token_value)
+        return buf.kinds[i] == entry[1] and buf.value_ids[i] == entry[2]
@@ -0,0 +1,50 @@
+"""
+Pre-pass klasifikasi karakter pakai NumPy (opsional) buat engine "vectorized".
+
+- source dilihat sebagai array code point (uint32), di-map ke id char class pakai satu fancy-index ke tabel compiled
+- dihitung juga run: untuk tiap posisi, akhir deretan char dengan class yang sama (whitespace, LETTER, DIGIT, ...)
+- DFA di Scanner lalu bisa lompat satu run sekaligus kalau state-nya punya self-loop di class itu
+- hasil disimpan di array('i') (4 byte/char) biar indexing dari Python tetap murah
+
+Kalau NumPy gak ada, AVAILABLE = False dan Scanner balik ke engine compiled.
+"""
+
+from array import array
+
+from src.lexer.compiled import CompiledRule
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional
+    np = None
+
+AVAILABLE = np is not None
+
+
+def preclassify(text: str, c: CompiledRule) -> tuple[array, array]:
+    # (class id per char, akhir run per char)
+    classes = array('i')
+    run_end = array('i')
+    if not text:
+        return classes, run_end
+
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    lut = np.array(c.ascii_class + [c.other], dtype=np.int32)
+    cls = lut[np.minimum(codes, 128)]
+    for ch, class_id in c.extra_class.items():
+        cls[codes == ord(ch)] = class_id
+
+    n = len(cls)
+    change = np.flatnonzero(cls[1:] != cls[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [n]))
+    ends_per_char = np.repeat(ends, ends - starts).astype(np.int32)
+
+    classes.frombytes(cls.astype(np.int32).tobytes())
+    run_end.frombytes(ends_per_char.tobytes())
+    return classes, run_end
+
+
+def self_loops(c: CompiledRule) -> list[bool]:
+    # self_loops[state * nclasses + cls] = transisi (state, cls) balik ke state itu sendiri
+    return [target == i // c.nclasses for i, target in enumerate(c.table)]
@@ -4,42 +4,93 @@ from .cli import parse_args
 from .errors import LexError, SyntaxError, SemanticError
 from src.lexer.rules_loader import Rule
 from src.lexer.scanner import Scanner
+from src.lexer.token_buffer import TokenBuffer
 from src.parser.parser import Parser
+from src.parser.ast_parser import AstParser
+from src.parser.table_parser import TableParser
 from src.parser.parsertree import ParseTree
 from src.semantic.analyzer import SemanticAnalyzer
+from src.render import Output, token_lines
 
 def main():
     args = parse_args()
 
     text = args.source.read_text(encoding="utf-8")
     rules = Rule().load_rule(args.dfa)
-    scanner = Scanner(rules, text)
+    scanner = Scanner(rules, text, engine=args.lexer, recover=args.recover)
+    # semua output lewat satu writer ber-buffer (dan batas --max-output-lines)
+    out = Output(max_lines=args.max_output_lines)
+    limits = {"max_depth": args.max_depth, "max_width": args.max_width}
     
     try:
 
-        print("================== LEXYCAL ANALYSIS =================")
-        token_list = scanner.tokenize()
-        for tok in token_list:
-            print(repr(tok))
+        if args.stream:
+            tokens = scanner.iter_tokens()
+        else:
+            out.line("================== LEXYCAL ANALYSIS =================")
+            if args.jobs > 1 and not args.recover:
+                tokens = scanner.tokenize_parallel(args.jobs, args.chunk_size)
+                if args.token_buffer:
+                    tokens = TokenBuffer.from_tokens(tokens, scanner.cm)
+            elif args.token_buffer:
+                tokens = scanner.tokenize_buffer()
+            else:
+                tokens = scanner.tokenize()
+            out.write_lines(token_lines(tokens))
 
+            # --recover (emit tree): token ERROR ikut di-parse, LexError dilaporin bareng SyntaxError sesudah tree
+            if scanner.errors and not (args.recover and args.emit == "tree"):
+                for e in scanner.errors:
+                    out.line(str(e))
+                return
 
-        print("================== SYNTAX ANALYSIS =================")
-        parser = Parser(token_list)
-        parse_tree = parser.parse()
-        parse_tree.pretty_print()
 
-        print("================== SEMANTIC ANALYSIS =================")
-        analyzer = SemanticAnalyzer()
-        tab, btab, atab, ast = analyzer.analyze(parse_tree)
+        out.line("================== SYNTAX ANALYSIS =================")
+        if args.emit == "ast":
+            # AST langsung dari parser, ParseTree gak dibuat (jadi gak ada yang dicetak di sini)
+            program = AstParser(tokens).parse()
+        elif args.emit == "decls":
+            # body prosedur/fungsi cuma dilewati, tree gak dicetak (nyetak tree = parse semua body)
+            parse_tree = Parser(tokens, compact=args.compact_tree, lazy_bodies=True).parse()
+        else:
+            if args.recover:
+                # panic-mode recovery cuma ada di Parser recursive descent
+                parser = Parser(tokens, arena=args.arena_tree, compact=args.compact_tree,
+                                recover=True, max_errors=args.max_errors)
+            else:
+                parser_class = TableParser if args.parser == "table" else Parser
+                parser = parser_class(tokens, arena=args.arena_tree, compact=args.compact_tree)
+            parse_tree = parser.parse()
+            parse_tree.pretty_print(out=out, **limits)
+
+            if parser.errors or scanner.errors:
+                # tree berisi node <error>, semantic analysis dilewati
+                for e in scanner.errors + parser.errors:
+                    out.line(str(e))
+                return
+
+        out.line("================== SEMANTIC ANALYSIS =================")
+        analyzer = SemanticAnalyzer(names=scanner.cm.names)
+        if args.emit == "ast":
+            tab, btab, atab, ast = analyzer.analyze_ast(program)
+        elif args.emit == "decls":
+            tab, btab, atab, ast = analyzer.analyze_declarations(parse_tree)
+        else:
+            tab, btab, atab, ast = analyzer.analyze(parse_tree)
         
-        analyzer.print_output(tab, btab, atab, ast)
+        analyzer.print_output(tab, btab, atab, ast, out=out, **limits)
 
     except LexError as e:
-        print(e)
+        out.line(str(e))
     except SyntaxError as e:
-        print(e)
+        out.line(str(e))
     except SemanticError as e:
-        print(e)
+        out.line(str(e))
+    except RecursionError:
+        # statement / expression gak rekursif lagi, yang masih bisa kena cuma subprogram bersarang sangat dalam
+        out.line("RecursionError – nesting too deep (subprogram declarations nested beyond the recursion limit)")
+    finally:
+        out.close()
 
 if __name__ == "__main__":
     main()
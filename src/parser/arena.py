@@ -0,0 +1,278 @@
+"""
+Apa:
+- representasi parse tree versi "arena" buat input besar (pengganti objek ParseTree per node)
+
+Ngapain:
+- tiap node cuma satu index; kind, token, first_child, next_sibling disimpan di kolom array('i') paralel
+- kind = NodeKind (IntEnum dari production di docstring Parser), leaf pakai NodeKind.TOKEN + index ke TokenBuffer
+- line/col gak disimpan, dihitung dari token pertama di subtree (sama kaya ParseTree)
+- ArenaNode = view kecil (arena, id) yang interface-nya sama dengan ParseTree (value/children/line/col),
+  dibuat pas diminta aja (kode lama yang jalan di ParseTree tetap bisa dipakai)
+- SemanticAnalyzer gak lewat view: ArenaAstBuilder (arena_ast.py) jalan di kolom int dan langsung bikin AST
+- pretty_print jalan langsung di atas kolom int, tanpa bikin view
+
+catatan:
+- last_child cuma dipakai selama parsing (append anak O(1)), dibuang di finish()
+"""
+
+import sys
+from array import array
+from enum import IntEnum
+
+from src.lexer.token import Token
+from src.lexer.token_buffer import TokenBuffer
+from src.render import emit, tree_lines
+
+NO_NODE = -1
+
+
+class NodeKind(IntEnum):
+    TOKEN = 0
+    PROGRAM = 1
+    PROGRAM_HEADER = 2
+    DECLARATION_PART = 3
+    CONST_DECLARATION = 4
+    TYPE_DECLARATION = 5
+    VAR_DECLARATION = 6
+    IDENTIFIER_LIST = 7
+    TYPE_DEFINITION = 8
+    TYPE = 9
+    ARRAY_TYPE = 10
+    RECORD_TYPE = 11
+    RANGE = 12
+    SUBPROGRAM_DECLARATION = 13
+    PROCEDURE_DECLARATION = 14
+    FUNCTION_DECLARATION = 15
+    FORMAL_PARAMETER_LIST = 16
+    PARAMETER_GROUP = 17
+    COMPOUND_STATEMENT = 18
+    BLOCK = 19
+    STATEMENT_LIST = 20
+    STATEMENT = 21
+    ASSIGNMENT_STATEMENT = 22
+    ARRAY_BUCKET = 23
+    IF_STATEMENT = 24
+    WHILE_STATEMENT = 25
+    FOR_STATEMENT = 26
+    PROCEDURE_OR_FUNCTION_CALL = 27
+    PARAMETER_LIST = 28
+    EXPRESSION = 29
+    SIMPLE_EXPRESSION = 30
+    TERM = 31
+    FACTOR = 32
+    RELATIONAL_OPERATOR = 33
+    ADDITIVE_OPERATOR = 34
+    MULTIPLICATIVE_OPERATOR = 35
+    ERROR = 36
+
+
+# label yang dicetak pretty_print / dibaca analyzer (harus sama persis dengan ParseTree dari Parser)
+LABELS: dict[NodeKind, str] = {
+    NodeKind.PROGRAM: "<program>",
+    NodeKind.PROGRAM_HEADER: "<program_header>",
+    NodeKind.DECLARATION_PART: "<declaration_part>",
+    NodeKind.CONST_DECLARATION: "<const_declaration>",
+    NodeKind.TYPE_DECLARATION: "<type_declaration>",
+    NodeKind.VAR_DECLARATION: "<var_declaration>",
+    NodeKind.IDENTIFIER_LIST: "<identifier_list>",
+    NodeKind.TYPE_DEFINITION: "<type_definition>",
+    NodeKind.TYPE: "<type>",
+    NodeKind.ARRAY_TYPE: "<array_type>",
+    NodeKind.RECORD_TYPE: "<record_type>",
+    NodeKind.RANGE: "<range>",
+    NodeKind.SUBPROGRAM_DECLARATION: "<subprogram_declaration>",
+    NodeKind.PROCEDURE_DECLARATION: "<procedure_declaration>",
+    NodeKind.FUNCTION_DECLARATION: "<function_declaration>",
+    NodeKind.FORMAL_PARAMETER_LIST: "<formal_parameter_list>",
+    NodeKind.PARAMETER_GROUP: "<parameter_group>",
+    NodeKind.COMPOUND_STATEMENT: "<compound_statement>",
+    NodeKind.BLOCK: "<block>",
+    NodeKind.STATEMENT_LIST: "<statement-list>",
+    NodeKind.STATEMENT: "<statement>",
+    NodeKind.ASSIGNMENT_STATEMENT: "<assignment-statement>",
+    NodeKind.ARRAY_BUCKET: "<array-bucket>",
+    NodeKind.IF_STATEMENT: "<if-statement>",
+    NodeKind.WHILE_STATEMENT: "<while-statement>",
+    NodeKind.FOR_STATEMENT: "<for-statement>",
+    NodeKind.PROCEDURE_OR_FUNCTION_CALL: "<procedure/function-call>",
+    NodeKind.PARAMETER_LIST: "<parameter-list>",
+    NodeKind.EXPRESSION: "<expression>",
+    NodeKind.SIMPLE_EXPRESSION: "<simple-expression>",
+    NodeKind.TERM: "<term>",
+    NodeKind.FACTOR: "<factor>",
+    NodeKind.RELATIONAL_OPERATOR: "<relational-operator>",
+    NodeKind.ADDITIVE_OPERATOR: "<additive-operator>",
+    NodeKind.MULTIPLICATIVE_OPERATOR: "<multiplicative-operator>",
+    NodeKind.ERROR: "<error>",
+}
+
+KIND_OF_LABEL: dict[str, NodeKind] = {label: kind for kind, label in LABELS.items()}
+
+
+class ParseArena:
+    def __init__(self, tokens: TokenBuffer | None = None):
+        self.tokens = tokens  # diisi pas leaf pertama kalau Parser dapet list/iterator Token
+        self.kind = array('i')
+        self.token = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.last_child = array('i')
+        self.root = NO_NODE
+
+    # ---------- building (dipakai Parser) ----------
+
+    def new_node(self, kind: int, token: int = NO_NODE) -> int:
+        node = len(self.kind)
+        self.kind.append(kind)
+        self.token.append(token)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.last_child.append(NO_NODE)
+        return node
+
+    def new_leaf(self, tok: Token, index: int | None = None) -> int:
+        # index = posisi token di self.tokens kalau sudah ada di sana (Parser dapet TokenBuffer)
+        if index is None:
+            if self.tokens is None:
+                self.tokens = TokenBuffer(tok.source)
+            index = len(self.tokens)
+            self.tokens.append(tok.type, tok.start, tok.end)
+        return self.new_node(NodeKind.TOKEN, index)
+
+    def add_child(self, parent: int, child: int):
+        last = self.last_child[parent]
+        if last == NO_NODE:
+            self.first_child[parent] = child
+        else:
+            self.next_sibling[last] = child
+        self.last_child[parent] = child
+
+    def finish(self, root: int) -> "ArenaNode":
+        self.root = root
+        self.last_child = array('i')
+        return ArenaNode(self, root)
+
+    # ---------- cursor API (semua pakai id int) ----------
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def is_token(self, node: int) -> bool:
+        return self.kind[node] == NodeKind.TOKEN
+
+    def children(self, node: int):
+        child = self.first_child[node]
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def label(self, node: int) -> str:
+        # sama dengan str(ParseTree.value) / repr(Token) buat leaf
+        if self.kind[node] == NodeKind.TOKEN:
+            i = self.token[node]
+            value = self.tokens.value(i)
+            name = self.tokens.type(i)
+            return f"{name}({value})" if value != "" else name
+        return LABELS[self.kind[node]]
+
+    def get_pos(self, node: int) -> tuple[int | None, int | None]:
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if self.kind[n] == NodeKind.TOKEN:
+                tokens = self.tokens
+                return tokens.source.position(tokens.starts[self.token[n]])
+            stack.extend(reversed(list(self.children(n))))
+        return (None, None)
+
+    def pretty_print(self, node: int | None = None, prefix: str = "", is_last: bool = True, out=None,
+                     max_depth: int | None = None, max_width: int | None = None):
+        # sama persis dengan ParseTree.pretty_print, tapi langsung di atas kolom int
+        emit(tree_lines(self.root if node is None else node, self.label, lambda n: list(self.children(n)),
+                        prefix, is_last, max_depth=max_depth, max_width=max_width), out)
+
+    def nbytes(self) -> int:
+        # memori kolom node (tanpa TokenBuffer)
+        return sum(sys.getsizeof(col) for col in
+                   (self.kind, self.token, self.first_child, self.next_sibling, self.last_child))
+
+
+class ArenaNode:
+    # view ParseTree-compatible di atas satu node arena
+    __slots__ = ("arena", "id")
+
+    def __init__(self, arena: ParseArena, id: int):
+        self.arena = arena
+        self.id = id
+
+    @property
+    def kind(self) -> NodeKind:
+        return NodeKind(self.arena.kind[self.id])
+
+    @property
+    def value(self):
+        arena = self.arena
+        if arena.kind[self.id] == NodeKind.TOKEN:
+            return arena.tokens[arena.token[self.id]]
+        return LABELS[arena.kind[self.id]]
+
+    @property
+    def children(self) -> list["ArenaNode"]:
+        arena = self.arena
+        return [ArenaNode(arena, child) for child in arena.children(self.id)]
+
+    @property
+    def line(self):
+        return self.get_pos()[0]
+
+    @property
+    def col(self):
+        return self.get_pos()[1]
+
+    def get_pos(self):
+        return self.arena.get_pos(self.id)
+
+    def add_child(self, child: "ArenaNode"):
+        self.arena.add_child(self.id, child.id)
+
+    def is_leaf(self):
+        return self.arena.first_child[self.id] == NO_NODE
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArenaNode):
+            return NotImplemented
+        return self.arena is other.arena and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash((id(self.arena), self.id))
+
+    def __repr__(self):
+        return f"ArenaNode({self.arena.label(self.id)!r}, id={self.id})"
+
+    def pretty_print(self, prefix="", is_last=True, out=None, max_depth=None, max_width=None):
+        self.arena.pretty_print(self.id, prefix, is_last, out, max_depth, max_width)
+
+
+class PendingNode:
+    # node yang mungkin collapse (tree compact): anak dikumpulin dulu, row arena baru dibuat di realize()
+    # kalau ternyata anaknya cuma satu, node ini dibuang tanpa ninggalin row mati
+    __slots__ = ("arena", "kind", "ids")
+
+    def __init__(self, arena: ParseArena, kind: int):
+        self.arena = arena
+        self.kind = kind
+        self.ids = []
+
+    @property
+    def children(self) -> list[ArenaNode]:
+        return [ArenaNode(self.arena, child) for child in self.ids]
+
+    def add_child(self, child: ArenaNode):
+        self.ids.append(child.id)
+
+    def realize(self) -> ArenaNode:
+        arena = self.arena
+        node = arena.new_node(self.kind)
+        for child in self.ids:
+            arena.add_child(node, child)
+        return ArenaNode(arena, node)
@@ -0,0 +1,383 @@
+"""
+Apa:
+- ubah parse tree versi arena (ParseArena) jadi AST mentah, sama persis dengan hasil AstParser dari token yang sama
+
+Ngapain:
+- jalan langsung di kolom int arena (kind, token, first_child, next_sibling) + TokenBuffer-nya: anak = list id,
+  teks / posisi / id nama dibaca dari TokenBuffer, gak ada ArenaNode atau Token yang dibuat
+- SemanticAnalyzer.analyze(arena) = builder ini + analyze_ast (dekorasi di node yang sama), jadi aturan dan
+  error-nya ikut jalur AST
+- statement dan expression pakai generator yang dijalanin drive() (stack sendiri), nesting dalam tetap aman
+
+catatan:
+- tree compact juga diterima: expression/simple-expression/term/factor yang anaknya satu sudah diganti anaknya
+- bodies=False: isi compound statement gak dibaca (BlockNode kosong), dipakai analyze_declarations
+"""
+
+from src.parser.arena import NO_NODE, NodeKind, ParseArena
+from src.semantic.ast_nodes import *
+from src.trampoline import drive
+
+OPERAND_KINDS = (NodeKind.EXPRESSION, NodeKind.SIMPLE_EXPRESSION, NodeKind.TERM)
+
+
+class ArenaAstBuilder:
+    def __init__(self, arena: ParseArena, bodies: bool = True):
+        self.arena = arena
+        self.tokens = arena.tokens
+        self.bodies = bodies
+        self.kind = arena.kind
+        self.token = arena.token
+        self.first_child = arena.first_child
+        self.next_sibling = arena.next_sibling
+        self.statements = {
+            NodeKind.COMPOUND_STATEMENT: self.compound_statement,
+            NodeKind.IF_STATEMENT: self.if_statement,
+            NodeKind.WHILE_STATEMENT: self.while_statement,
+            NodeKind.FOR_STATEMENT: self.for_statement,
+            NodeKind.ASSIGNMENT_STATEMENT: self.assignment_statement,
+            NodeKind.PROCEDURE_OR_FUNCTION_CALL: self.procedure_or_function_call,
+        }
+
+    def build(self, root: int | None = None) -> ProgramNode:
+        return self.program(self.arena.root if root is None else root)
+
+    # ---------- baca kolom ----------
+
+    def kids(self, node: int) -> list[int]:
+        next_sibling = self.next_sibling
+        out = []
+        child = self.first_child[node]
+        while child != NO_NODE:
+            out.append(child)
+            child = next_sibling[child]
+        return out
+
+    def type_of(self, leaf: int) -> str:
+        return self.tokens.type(self.token[leaf])
+
+    def text(self, leaf: int) -> str:
+        return self.tokens.value(self.token[leaf])
+
+    def pos(self, node: int) -> tuple[int, int]:
+        # posisi token pertama di subtree (leaf = token itu sendiri)
+        first_child = self.first_child
+        while first_child[node] != NO_NODE:
+            node = first_child[node]
+        tokens = self.tokens
+        return tokens.source.position(tokens.starts[self.token[node]])
+
+    def name(self, leaf: int) -> tuple[str, int]:
+        i = self.token[leaf]
+        return self.tokens.value(i), self.tokens.name_id(i)
+
+    # ---------- deklarasi ----------
+
+    def program(self, node: int) -> ProgramNode:
+        header, declaration_part, compound = self.kids(node)[:3]
+        ident = self.kids(header)[1]
+        name, name_id = self.name(ident)
+        declarations = self.declaration_part(declaration_part)
+        block = self.body(compound)
+        return ProgramNode(name, declarations, block, *self.pos(ident), name_id)
+
+    def declaration_part(self, node: int) -> list:
+        decls = []
+        for child in self.kids(node):
+            kind = self.kind[child]
+            if kind == NodeKind.CONST_DECLARATION:
+                decls.extend(self.const_declaration(child))
+            elif kind == NodeKind.TYPE_DECLARATION:
+                decls.extend(self.type_declaration(child))
+            elif kind == NodeKind.VAR_DECLARATION:
+                decls.extend(self.var_declaration(child))
+            elif kind == NodeKind.SUBPROGRAM_DECLARATION:
+                decl = self.subprogram_declaration(child)
+                if decl:
+                    decls.append(decl)
+        return decls
+
+    def const_declaration(self, node: int) -> list:
+        # KEYWORD(konstanta) + (IDENTIFIER + = + nilai + ;)+
+        kids = self.kids(node)
+        decls = []
+        for i in range(1, len(kids) - 2, 4):
+            ident, value = kids[i], kids[i + 2]
+            name, name_id = self.name(ident)
+            decl = ConstDeclNode(name, self.text(value), None, *self.pos(ident), name_id)
+            decl.token = self.tokens[self.token[value]]
+            decls.append(decl)
+        return decls
+
+    def type_declaration(self, node: int) -> list:
+        # KEYWORD(tipe) + (IDENTIFIER + = + type_definition + ;)+
+        kids = self.kids(node)
+        decls = []
+        for i in range(1, len(kids) - 2, 4):
+            ident = kids[i]
+            name, name_id = self.name(ident)
+            decl = TypeDeclNode(name, "alias", *self.pos(ident), name_id)
+            decl.type_spec = self.type_definition(kids[i + 2])
+            decls.append(decl)
+        return decls
+
+    def var_declaration(self, node: int) -> list:
+        # KEYWORD(variabel) + (identifier_list + : + type + ;)+
+        kids = self.kids(node)
+        decls = []
+        for i in range(1, len(kids) - 2, 4):
+            decls.extend(self._typed_names(kids[i], self.type(kids[i + 2])))
+        return decls
+
+    def _typed_names(self, identifier_list: int, spec: TypeSpec) -> list:
+        # identifier_list = IDENTIFIER + (COMMA + IDENTIFIER)*, satu TypeSpec per grup (sama dengan AstParser)
+        decls = []
+        for ident in self.kids(identifier_list)[::2]:
+            name, name_id = self.name(ident)
+            decl = VarDeclNode(name, spec.name, *self.pos(ident), name_id)
+            decl.type_spec = spec
+            decls.append(decl)
+        return decls
+
+    def type_definition(self, node: int) -> TypeSpec | None:
+        kids = self.kids(node)
+        if not kids:
+            return None
+        if self.kind[kids[0]] == NodeKind.RECORD_TYPE:
+            return TypeSpec("<record_type>", *self.pos(kids[0]))
+        return self.type(kids[0])
+
+    def type(self, node: int) -> TypeSpec:
+        child = self.first_child[node]
+        if self.kind[child] == NodeKind.ARRAY_TYPE:
+            return self.array_type(child)
+        return TypeSpec(self.text(child), *self.pos(child))
+
+    def array_type(self, node: int) -> TypeSpec:
+        # KEYWORD(larik) + [ + range + ] + KEYWORD(dari) + type
+        kids = self.kids(node)
+        low, high = self.range(kids[2])
+        element = self.type(kids[5])
+        return TypeSpec("<array_type>", *self.pos(kids[0]), element=element.name, low=low, high=high)
+
+    def range(self, node: int) -> tuple[int, int]:
+        kids = self.kids(node)
+        return self._simple_int(kids[0]), self._simple_int(kids[2])
+
+    def _simple_int(self, expression: int) -> int:
+        # sama dengan AstParser._simple_int: angka kalau token pertama expression NUMBER
+        first_child = self.first_child
+        while first_child[expression] != NO_NODE:
+            expression = first_child[expression]
+        if self.type_of(expression) != "NUMBER":
+            return 0
+        try:
+            return int(self.text(expression))
+        except ValueError:
+            return 0
+
+    def subprogram_declaration(self, node: int):
+        child = self.first_child[node]
+        if child == NO_NODE:
+            return None
+        if self.kind[child] == NodeKind.PROCEDURE_DECLARATION:
+            return self.procedure_declaration(child)
+        if self.kind[child] == NodeKind.FUNCTION_DECLARATION:
+            return self.function_declaration(child)
+        return None
+
+    def procedure_declaration(self, node: int) -> ProcedureDeclNode:
+        # KEYWORD(prosedur) + IDENTIFIER + (formal_parameter_list)? + ; + block + ;
+        kids = self.kids(node)
+        name, name_id = self.name(kids[1])
+        params, rest = self._parameters(kids, 2)
+        local_decls, body = self.block(kids[rest + 1])
+
+        decl = ProcedureDeclNode(name, params, body, *self.pos(kids[1]), name_id)
+        decl.locals = local_decls
+        return decl
+
+    def function_declaration(self, node: int) -> FunctionDeclNode:
+        # KEYWORD(fungsi) + IDENTIFIER + (formal_parameter_list)? + : + type + ; + block + ;
+        kids = self.kids(node)
+        name, name_id = self.name(kids[1])
+        params, rest = self._parameters(kids, 2)
+        return_type = self.type(kids[rest + 1])
+        local_decls, body = self.block(kids[rest + 3])
+
+        decl = FunctionDeclNode(name, params, return_type.name, body, *self.pos(kids[1]), name_id)
+        decl.locals = local_decls
+        return decl
+
+    def _parameters(self, kids: list[int], i: int) -> tuple[list, int]:
+        # (formal_parameter_list)? di kids[i]: (params, index anak sesudahnya)
+        if self.kind[kids[i]] != NodeKind.FORMAL_PARAMETER_LIST:
+            return [], i
+        params = []
+        for group in self.kids(kids[i]):
+            if self.kind[group] == NodeKind.PARAMETER_GROUP:
+                # identifier_list + : + type
+                identifier_list, _, type_node = self.kids(group)
+                params.extend(self._typed_names(identifier_list, self.type(type_node)))
+        return params, i + 1
+
+    def block(self, node: int) -> tuple[list, BlockNode]:
+        # (declaration_part)? + compound_statement
+        kids = self.kids(node)
+        if self.kind[kids[0]] == NodeKind.DECLARATION_PART:
+            return self.declaration_part(kids[0]), self.body(kids[1])
+        return [], self.body(kids[0])
+
+    def body(self, compound: int) -> BlockNode:
+        if not self.bodies:
+            return BlockNode([], *self.pos(compound))
+        return drive(self.compound_statement(compound))
+
+    # ---------- statement (generator) ----------
+
+    def compound_statement(self, node: int):
+        # KEYWORD(mulai) + statement_list + KEYWORD(selesai)
+        kids = self.kids(node)
+        stmts = []
+        for child in self.kids(kids[1]):
+            if self.kind[child] == NodeKind.STATEMENT:
+                stmt = yield self.statement(child)
+                if stmt:
+                    stmts.append(stmt)
+        return BlockNode(stmts, *self.pos(kids[0]))
+
+    def statement(self, node: int):
+        child = self.first_child[node]
+        if child == NO_NODE:
+            return None  # statement kosong gak masuk AST
+        build = self.statements.get(self.kind[child])
+        if build is None:
+            return None
+        return (yield build(child))
+
+    def assignment_statement(self, node: int):
+        # IDENTIFIER + (array_bucket)? + := + expression
+        kids = self.kids(node)
+        name, name_id = self.name(kids[0])
+        line, col = self.pos(kids[0])
+
+        if self.kind[kids[1]] == NodeKind.ARRAY_BUCKET:
+            target = ArrayAccessNode(name, self.array_bucket(kids[1]), line, col, name_id)
+        else:
+            target = VarNode(name, line, col, name_id)
+
+        value = yield self.expression(kids[-1])
+        return AssignNode(target, value, line, col)
+
+    def array_bucket(self, node: int):
+        # [ + (NUMBER | IDENTIFIER) + ]
+        content = self.kids(node)[1]
+        if self.type_of(content) == "IDENTIFIER":
+            name, name_id = self.name(content)
+            return VarNode(name, *self.pos(content), name_id)
+        return NumberNode(self.text(content), *self.pos(content))
+
+    def if_statement(self, node: int):
+        # KEYWORD(jika) + expression + KEYWORD(maka) + statement + (KEYWORD(selain_itu) + statement)?
+        kids = self.kids(node)
+        condition = yield self.expression(kids[1])
+        then_stmt = yield self.statement(kids[3])
+        else_stmt = None
+        if len(kids) > 5:
+            else_stmt = yield self.statement(kids[5])
+        return IfNode(condition, then_stmt, else_stmt, *self.pos(kids[0]))
+
+    def while_statement(self, node: int):
+        # KEYWORD(selama) + expression + KEYWORD(lakukan) + statement
+        kids = self.kids(node)
+        condition = yield self.expression(kids[1])
+        body = yield self.statement(kids[3])
+        return WhileNode(condition, body, *self.pos(kids[0]))
+
+    def for_statement(self, node: int):
+        # KEYWORD(untuk) + IDENTIFIER + := + expression + KEYWORD(ke | turun_ke) + expression + KEYWORD(lakukan) + statement
+        kids = self.kids(node)
+        name, name_id = self.name(kids[1])
+        start_expr = yield self.expression(kids[3])
+        end_expr = yield self.expression(kids[5])
+        body = yield self.statement(kids[7])
+
+        iterator = VarNode(name, *self.pos(kids[1]), name_id)
+        # sama dengan AstParser: "turun_ke" juga mengandung "ke"
+        direction = "to" if "ke" in self.text(kids[4]) else "downto"
+        return ForNode(iterator, start_expr, end_expr, direction, body, *self.pos(kids[0]))
+
+    def procedure_or_function_call(self, node: int):
+        # IDENTIFIER + ( + (parameter_list)? + )
+        kids = self.kids(node)
+        name, name_id = self.name(kids[0])
+
+        args, first_literal = [], False
+        if len(kids) > 3 and self.kind[kids[2]] == NodeKind.PARAMETER_LIST:
+            for i, child in enumerate(self.kids(kids[2])[::2]):
+                if i == 0 and self.kind[child] == NodeKind.TOKEN \
+                        and self.type_of(child) in ("STRING_LITERAL", "CHAR_LITERAL"):
+                    args.append(StringNode(self.text(child), *self.pos(child)))
+                    first_literal = True
+                else:
+                    args.append((yield self.expression(child)))
+
+        call = ProcCallNode(name, args, *self.pos(kids[0]), name_id)
+        call.first_literal = first_literal
+        return call
+
+    # ---------- expression (generator) ----------
+
+    def expression(self, node: int):
+        # expression / simple-expression / term: operand + (operator + operand)*, atau factor (bisa sudah collapsed)
+        kind = self.kind[node]
+        if kind not in OPERAND_KINDS:
+            return (yield self.factor(node))
+
+        kids = self.kids(node)
+        i = 0
+        sign = None
+        # tanda +/- bikin jumlah anak genap (di tree compact term-nya sendiri bisa berupa token)
+        if kind == NodeKind.SIMPLE_EXPRESSION and len(kids) % 2 == 0:
+            sign = kids[0]
+            i = 1
+
+        left = yield self.expression(kids[i])
+        if sign is not None:
+            left = UnaryOpNode(self.text(sign), left, *self.pos(sign))
+        for j in range(i + 1, len(kids) - 1, 2):
+            op = self.first_child[kids[j]]
+            right = yield self.expression(kids[j + 1])
+            left = BinOpNode(self.text(op), left, right, *self.pos(op))
+        return left
+
+    def factor(self, node: int):
+        kind = self.kind[node]
+        if kind == NodeKind.PROCEDURE_OR_FUNCTION_CALL:
+            return (yield self.procedure_or_function_call(node))
+        if kind == NodeKind.TOKEN:
+            kids = [node]
+        else:
+            kids = self.kids(node)
+
+        first = kids[0]
+        if self.kind[first] == NodeKind.PROCEDURE_OR_FUNCTION_CALL:
+            return (yield self.procedure_or_function_call(first))
+
+        token_type = self.type_of(first)
+        if token_type == "IDENTIFIER":
+            name, name_id = self.name(first)
+            if len(kids) > 1:
+                return ArrayAccessNode(name, self.array_bucket(kids[1]), *self.pos(first), name_id)
+            return VarNode(name, *self.pos(first), name_id)
+        if token_type == "CHAR_LITERAL" or token_type == "STRING_LITERAL":
+            return StringNode(self.text(first), *self.pos(first))
+        if token_type == "LPARENTHESIS":
+            return (yield self.expression(kids[1]))
+        if token_type == "LOGICAL_OPERATOR":
+            operand = yield self.expression(kids[1])
+            return UnaryOpNode(self.text(first), operand, *self.pos(first))
+        if token_type == "KEYWORD":
+            # true / false, analyzer yang mutusin jadi BooleanNode (sama dengan AstParser._raw_name)
+            return VarNode(self.text(first), *self.pos(first))
+        return NumberNode(self.text(first), *self.pos(first))
@@ -0,0 +1,518 @@
+"""
+Apa:
+- varian Parser yang langsung bikin node AST (src/semantic/ast_nodes.py), tanpa ParseTree
+
+Ngapain:
+- grammar, urutan match/consume, dan SyntaxError-nya sama persis dengan Parser
+- node AST dibuat pas recursive descent, posisi diambil dari token
+- statement dan expression ditulis sebagai generator (sama dengan Parser), dijalanin drive() pakai stack sendiri
+- AST yang keluar belum didekorasi (belum ada tab_index/type), SemanticAnalyzer.analyze_ast yang ngisi di node yang sama
+
+catatan:
+- leaf masih "mentah": NumberNode/StringNode nyimpen teks token apa adanya (analyzer yang ubah jadi angka / buang
+  kutip), VarNode bisa jadi konstanta atau StringNode jadi char, cuma leaf kaya gini yang diganti node baru sama
+  analyzer (aturannya sama dengan visit_factor)
+- info yang cuma dibutuhin analyzer ditaruh di atribut tambahan yang gak ikut dicetak:
+  type_spec (VarDeclNode/TypeDeclNode), token (ConstDeclNode), locals (deklarasi di dalam subprogram),
+  first_literal (ProcCallNode yang argumen pertamanya literal)
+- node yang punya nama dapet name_id dari token IDENTIFIER-nya, analyzer lookup pakai id itu
+"""
+
+from src.lexer.token import Token
+from src.parser.parser import Parser
+from src.semantic.ast_nodes import *
+from src.errors import SyntaxError
+from src.trampoline import drive
+
+
+class AstParser(Parser):
+    def parse(self) -> ProgramNode:
+        return self.program()
+
+    # program -> program_header + declaration_part + compound_statement + DOT
+    def program(self):
+        self.expect("KEYWORD", "program")
+        name = self.expect("IDENTIFIER")
+        self.expect("SEMICOLON")
+
+        declarations = self.declaration_part()
+        block = drive(self.compound_statement())
+        self.expect("DOT")
+
+        return ProgramNode(name.value, declarations, block, *name.get_pos(), name.name_id)
+
+    # declaration_part -> (const_declaration)* + (type_declaration)* + (var_declaration)* + (subprogram_declaration)*
+    def declaration_part(self) -> list:
+        decls = []
+        while self.match("KEYWORD", "konstanta"):
+            decls.extend(self.const_declaration())
+        while self.match("KEYWORD", "tipe"):
+            decls.extend(self.type_declaration())
+        while self.match("KEYWORD", "variabel"):
+            decls.extend(self.var_declaration())
+        while self.match("KEYWORD", "prosedur") or self.match("KEYWORD", "fungsi"):
+            decl = self.subprogram_declaration()
+            if decl:
+                decls.append(decl)
+
+        return decls
+
+    def const_declaration(self) -> list:
+        self.expect("KEYWORD", "konstanta")
+
+        if not self.match("IDENTIFIER"):  # minimal ada satu identifier
+            raise self._error_here("Expected atleast one const declaration in constant declaration")
+
+        decls = []
+        while self.match("IDENTIFIER"):
+            name = self.expect("IDENTIFIER")
+            self.expect("RELATIONAL_OPERATOR", "=")
+            value = self.expect(self.peek().type if self.peek() else "*")
+            self.expect("SEMICOLON")
+
+            decl = ConstDeclNode(name.value, value.value, None, *name.get_pos(), name.name_id)
+            decl.token = value
+            decls.append(decl)
+
+        return decls
+
+    def type_declaration(self) -> list:
+        self.expect("KEYWORD", "tipe")
+
+        if not self.match("IDENTIFIER"):
+            raise self._error_here("Expected at least one identifier at type declaration")
+
+        decls = []
+        while self.match("IDENTIFIER"):
+            name = self.expect("IDENTIFIER")
+            self.expect("RELATIONAL_OPERATOR", "=")
+            spec = self.type_definition()
+            self.expect("SEMICOLON")
+
+            decl = TypeDeclNode(name.value, "alias", *name.get_pos(), name.name_id)
+            decl.type_spec = spec
+            decls.append(decl)
+
+        return decls
+
+    def var_declaration(self) -> list:
+        self.expect("KEYWORD", "variabel")
+
+        if not self.match("IDENTIFIER"):
+            raise self._error_here("Expected at least one identifier at variable declaration")
+
+        decls = []
+        while self.match("IDENTIFIER"):
+            names = self.identifier_list()
+            self.expect("COLON")
+            spec = self.type()
+            self.expect("SEMICOLON")
+            decls.extend(self._typed_names(names, spec))
+
+        return decls
+
+    def _typed_names(self, names: list[Token], spec: TypeSpec) -> list:
+        # satu TypeSpec dipakai bareng satu grup "a, b: T", analyzer resolve tipenya sekali per grup
+        decls = []
+        for tok in names:
+            decl = VarDeclNode(tok.value, spec.name, *tok.get_pos(), tok.name_id)
+            decl.type_spec = spec
+            decls.append(decl)
+        return decls
+
+    def identifier_list(self) -> list[Token]:
+        names = [self.expect("IDENTIFIER")]
+
+        while self.match("COMMA"):
+            self.expect("COMMA")
+            names.append(self.expect("IDENTIFIER"))
+
+        return names
+
+    # type_definition -> type | record_type
+    def type_definition(self) -> TypeSpec | None:
+        if self.match("KEYWORD", "larik") or self.match("KEYWORD", "integer") or self.match("KEYWORD", "char") or self.match("KEYWORD", "boolean") or self.match("KEYWORD", "Real"):
+            return self.type()
+        elif self.match("KEYWORD", "rekaman"):
+            return self.record_type()
+
+        return None
+
+    # type -> array_type | KEYWORD(integer | char | boolean | Real)
+    def type(self) -> TypeSpec:
+        if self.match("KEYWORD", "larik"):
+            return self.array_type()
+
+        keyword = self.expect("KEYWORD")
+        return TypeSpec(keyword.value, *keyword.get_pos())
+
+    # array_type -> KEYWORD(larik) + LBRACKET + range + RBRACKET + KEYWORD(dari) + type
+    def array_type(self) -> TypeSpec:
+        larik = self.expect("KEYWORD", "larik")
+        self.expect("LBRACKET")
+        low, high = self.range()
+        self.expect("RBRACKET")
+        self.expect("KEYWORD", "dari")
+        element = self.type()
+
+        return TypeSpec("<array_type>", *larik.get_pos(), element=element.name, low=low, high=high)
+
+    def record_type(self) -> TypeSpec:
+        rekaman = self.expect("KEYWORD", "rekaman")
+
+        if not self.match("IDENTIFIER"):
+            raise self._error_here("Expected at least one identifier at record definition , got " + str(self.peek().type if self.peek() else "EOF") + str(self.peek().value if self.peek() else ""))
+
+        while self.match("IDENTIFIER"):
+            self.identifier_list()
+            self.expect("COLON")
+            self.type()
+            self.expect("SEMICOLON")
+
+        self.expect("KEYWORD", "selesai")
+
+        return TypeSpec("<record_type>", *rekaman.get_pos())
+
+    # range -> expression + RANGE_OPERATOR(..) + expression
+    def range(self) -> tuple[int, int]:
+        # batas larik: sama dengan SemanticAnalyzer._extract_simple_int, angka kalau token pertama expression NUMBER
+        low = self._simple_int(self.peek())
+        drive(self.expression())
+        self.expect("RANGE_OPERATOR", "..")
+        high = self._simple_int(self.peek())
+        drive(self.expression())
+
+        return low, high
+
+    def _simple_int(self, token: Token | None) -> int:
+        if token is None or token.type != "NUMBER":
+            return 0
+        try:
+            return int(token.value)
+        except ValueError:
+            return 0
+
+    # subprogram_declaration -> procedure_declaration | function_declaration
+    def subprogram_declaration(self):
+        if self.match("KEYWORD", "prosedur"):
+            return self.procedure_declaration()
+        elif self.match("KEYWORD", "fungsi"):
+            return self.function_declaration()
+        return None
+
+    def procedure_declaration(self) -> ProcedureDeclNode:
+        self.expect("KEYWORD", "prosedur")
+        name = self.expect("IDENTIFIER")
+
+        params = []
+        if self.match("LPARENTHESIS"):
+            params = self.formal_parameter_list()
+
+        self.expect("SEMICOLON")
+        local_decls, body = self.block()
+        self.expect("SEMICOLON")
+
+        node = ProcedureDeclNode(name.value, params, body, *name.get_pos(), name.name_id)
+        node.locals = local_decls
+        return node
+
+    def function_declaration(self) -> FunctionDeclNode:
+        self.expect("KEYWORD", "fungsi")
+        name = self.expect("IDENTIFIER")
+
+        params = []
+        if self.match("LPARENTHESIS"):
+            params = self.formal_parameter_list()
+
+        self.expect("COLON")
+        return_type = self.type()
+        self.expect("SEMICOLON")
+        local_decls, body = self.block()
+        self.expect("SEMICOLON")
+
+        node = FunctionDeclNode(name.value, params, return_type.name, body, *name.get_pos(), name.name_id)
+        node.locals = local_decls
+        return node
+
+    # formal_parameter_list -> LPARENTHESIS + parameter_group + (SEMICOLON + parameter_group)* + RPARENTHESIS
+    def formal_parameter_list(self) -> list:
+        self.expect("LPARENTHESIS")
+
+        params = self.parameter_group()
+
+        while self.match("SEMICOLON"):
+            self.expect("SEMICOLON")
+
+            params.extend(self.parameter_group())
+
+        self.expect("RPARENTHESIS")
+
+        return params
+
+    # parameter_group -> identifier_list + COLON + type
+    def parameter_group(self) -> list:
+        names = self.identifier_list()
+        self.expect("COLON")
+        spec = self.type()
+
+        return self._typed_names(names, spec)
+
+    # compound_statement -> KEYWORD(mulai) + statement_list + KEYWORD(selesai)
+    def compound_statement(self) -> BlockNode:
+        mulai = self.expect("KEYWORD", "mulai")
+        stmts = yield self.statement_list()
+        self.expect("KEYWORD", "selesai")
+
+        return BlockNode(stmts, *mulai.get_pos())
+
+    # block -> (declaration_part)? + compound_statement
+    def block(self) -> tuple[list, BlockNode]:
+        local_decls = []
+        if self.match("KEYWORD", "konstanta") or self.match("KEYWORD", "tipe") or self.match("KEYWORD", "variabel") or self.match("KEYWORD", "prosedur") or self.match("KEYWORD", "fungsi"):
+            local_decls = self.declaration_part()
+
+        return local_decls, drive(self.compound_statement())
+
+    # statement_list -> statement + (SEMICOLON + statement)*
+    def statement_list(self) -> list:
+        stmts = []
+        self._append_statement(stmts, (yield self.statement()))
+
+        while self.match("SEMICOLON", ";"):
+
+            if self.match_ahead("KEYWORD", "selesai"):
+                self.expect("SEMICOLON", ";")
+                break
+
+            self.expect("SEMICOLON", ";")
+            self._append_statement(stmts, (yield self.statement()))
+
+        return stmts
+
+    def _append_statement(self, stmts: list, stmt):
+        # statement kosong gak masuk AST (sama dengan visit_statement_list)
+        if stmt:
+            stmts.append(stmt)
+
+    # statement -> compound_statement | if_statement | while_statement | for_statement | assignment_statement | procedure_or_function_call
+    def statement(self):
+        if self.match("KEYWORD", "mulai"):
+            return (yield self.compound_statement())
+
+        elif self.match("KEYWORD", "jika"):
+            return (yield self.if_statement())
+
+        elif self.match("KEYWORD", "selama"):
+            return (yield self.while_statement())
+
+        elif self.match("KEYWORD", "untuk"):
+            return (yield self.for_statement())
+
+        elif self.match("IDENTIFIER"):
+
+            if self.match_ahead("ASSIGN_OPERATOR"):
+                return (yield self.assignment_statement())
+            elif self.match_ahead("LBRACKET"):
+                return (yield self.assignment_statement())
+            else:
+                return (yield self.procedure_or_function_call())
+
+        return None
+
+    # assignment_statement -> IDENTIFIER + (array_bucket)? + ASSIGN_OPERATOR(:=) + expression
+    def assignment_statement(self) -> AssignNode:
+        name = self.expect("IDENTIFIER")
+        line, col = name.get_pos()
+
+        if self.match("LBRACKET"):
+            target = ArrayAccessNode(name.value, self.array_bucket(), line, col, name.name_id)
+        else:
+            target = VarNode(name.value, line, col, name.name_id)
+
+        self.expect("ASSIGN_OPERATOR", ":=")
+        value = yield self.expression()
+
+        return AssignNode(target, value, line, col)
+
+    # array_bucket ->  LBRACKET + (NUMBER | IDENTIFIER) + RBRACKET
+    def array_bucket(self):
+        self.expect("LBRACKET")
+        if self.match("IDENTIFIER"):
+            content = self.expect("IDENTIFIER")
+            index = VarNode(content.value, *content.get_pos(), content.name_id)
+        else:
+            content = self.expect("NUMBER")
+            index = NumberNode(content.value, *content.get_pos())
+        self.expect("RBRACKET")
+
+        return index
+
+    # if_statement -> KEYWORD(jika) + expression + KEYWORD(maka) + statement + (KEYWORD(selain_itu) + statement)?
+    def if_statement(self) -> IfNode:
+        jika = self.expect("KEYWORD", "jika")
+        condition = yield self.expression()
+        self.expect("KEYWORD", "maka")
+        then_stmt = yield self.statement()
+
+        else_stmt = None
+        if (self.match("KEYWORD", "selain_itu")):
+            self.expect("KEYWORD", "selain_itu")
+            else_stmt = yield self.statement()
+
+        return IfNode(condition, then_stmt, else_stmt, *jika.get_pos())
+
+    # while_statement -> KEYWORD(selama) + expression + KEYWORD(lakukan) + statement
+    def while_statement(self) -> WhileNode:
+        selama = self.expect("KEYWORD", "selama")
+        condition = yield self.expression()
+        self.expect("KEYWORD", "lakukan")
+        body = yield self.statement()
+
+        return WhileNode(condition, body, *selama.get_pos())
+
+    # for_statement -> KEYWORD(untuk) + IDENTIFIER + ASSIGN_OPERATOR(:=) + expression + KEYWORD(ke | turun_ke) + expression + KEYWORD(lakukan) + statement
+    def for_statement(self) -> ForNode:
+        untuk = self.expect("KEYWORD", "untuk")
+        name = self.expect("IDENTIFIER")
+        self.expect("ASSIGN_OPERATOR", ":=")
+        start_expr = yield self.expression()
+
+        if (self.match("KEYWORD", "ke")):
+            direction = self.expect("KEYWORD", "ke")
+        else:
+            direction = self.expect("KEYWORD", "turun_ke")
+
+        end_expr = yield self.expression()
+        self.expect("KEYWORD", "lakukan")
+        body = yield self.statement()
+
+        iterator = VarNode(name.value, *name.get_pos(), name.name_id)
+        # sama dengan visit_for: "turun_ke" juga mengandung "ke"
+        dir_val = "to" if "ke" in direction.value else "downto"
+        return ForNode(iterator, start_expr, end_expr, dir_val, body, *untuk.get_pos())
+
+    # procedure_or_function_call -> IDENTIFIER + LPARENTHESIS + (parameter_list)? + RPARENTHESIS
+    def procedure_or_function_call(self) -> ProcCallNode:
+        name = self.expect("IDENTIFIER")
+        self.expect("LPARENTHESIS", "(")
+
+        args, first_literal = [], False
+        if (not self.match("RPARENTHESIS", ")")):
+            args, first_literal = yield self.parameter_list()
+
+        self.expect("RPARENTHESIS", ")")
+
+        node = ProcCallNode(name.value, args, *name.get_pos(), name.name_id)
+        node.first_literal = first_literal
+        return node
+
+    # parameter_list -> (expression | string_literal | char_literal) + (COMMA + (expression | string_literal | char_literal))*
+    def parameter_list(self) -> tuple[list, bool]:
+        first_literal = True
+        if self.match("STRING_LITERAL"):
+            args = [self._raw_string(self.expect("STRING_LITERAL"))]
+        elif self.match("CHAR_LITERAL"):
+            args = [self._raw_string(self.expect("CHAR_LITERAL"))]
+        else:
+            args = [(yield self.expression())]
+            first_literal = False
+
+        while self.match("COMMA", ","):
+            self.expect("COMMA", ",")
+            args.append((yield self.expression()))
+
+        return args, first_literal
+
+    # expression -> simple_expression + (relational_operator + simple_expression)?
+    def expression(self):
+        left = yield self.simple_expression()
+
+        if self.match("RELATIONAL_OPERATOR"):
+            op = self.relational_operator()
+            right = yield self.simple_expression()
+            return BinOpNode(op.value, left, right, *op.get_pos())
+
+        return left
+
+    # simple_expression -> (ARITHMETIC_OPERATOR(+ | -))? + term + (additive_operator + term)*
+    def simple_expression(self):
+        sign = None
+        if self.match("ARITHMETIC_OPERATOR", "+"):
+            sign = self.expect("ARITHMETIC_OPERATOR", "+")
+        elif self.match("ARITHMETIC_OPERATOR", "-"):
+            sign = self.expect("ARITHMETIC_OPERATOR", "-")
+
+        left = yield self.term()
+        if sign is not None:
+            left = UnaryOpNode(sign.value, left, *sign.get_pos())
+
+        while self.match("ARITHMETIC_OPERATOR", "+") or self.match("ARITHMETIC_OPERATOR", "-") or self.match("LOGICAL_OPERATOR", "atau"):
+            op = self.additive_operator()
+            left = BinOpNode(op.value, left, (yield self.term()), *op.get_pos())
+
+        return left
+
+    # term -> factor + (multiplicative_operator + factor)*
+    def term(self):
+        left = yield self.factor()
+
+        while self.match("ARITHMETIC_OPERATOR", "*") or self.match("ARITHMETIC_OPERATOR", "/") or self.match("LOGICAL_OPERATOR", "dan") or self.match("ARITHMETIC_OPERATOR", "mod") or self.match("ARITHMETIC_OPERATOR", "bagi"):
+            op = self.multiplicative_operator()
+            left = BinOpNode(op.value, left, (yield self.factor()), *op.get_pos())
+
+        return left
+
+    # factor -> IDENTIFIER | NUMBER | CHAR_LITERAL | STRING_LITERAL | (LPARENTHESIS + expression + RPARENTHESIS) | LOGICAL_OPERATOR(tidak) + factor | function_call | KEYWORD(true | false)
+    def factor(self):
+        if self.match("IDENTIFIER") and self.match_ahead("LPARENTHESIS", "("):
+            return (yield self.procedure_or_function_call())
+        elif self.match("IDENTIFIER") and self.match_ahead("LBRACKET", "["):
+            name = self.expect("IDENTIFIER")
+            return ArrayAccessNode(name.value, self.array_bucket(), *name.get_pos(), name.name_id)
+        elif self.match("IDENTIFIER"):
+            return self._raw_name(self.expect("IDENTIFIER"))
+        elif self.match("CHAR_LITERAL"):
+            return self._raw_string(self.expect("CHAR_LITERAL"))
+        elif self.match("STRING_LITERAL"):
+            return self._raw_string(self.expect("STRING_LITERAL"))
+        elif self.match("LPARENTHESIS", "("):
+            self.expect("LPARENTHESIS", "(")
+            inner = yield self.expression()
+            self.expect("RPARENTHESIS", ")")
+            return inner
+        elif self.match("LOGICAL_OPERATOR", "tidak"):
+            op = self.expect("LOGICAL_OPERATOR", "tidak")
+            return UnaryOpNode(op.value, (yield self.factor()), *op.get_pos())
+        elif self.match("KEYWORD", "true"):
+            return self._raw_name(self.expect("KEYWORD", "true"))
+        elif self.match("KEYWORD", "false"):
+            return self._raw_name(self.expect("KEYWORD", "false"))
+        else:
+            number = self.expect("NUMBER")
+            return NumberNode(number.value, *number.get_pos())
+
+    def _raw_name(self, token: Token) -> VarNode:
+        # identifier / true / false, analyzer yang mutusin jadi VarNode, NumberNode, atau BooleanNode
+        return VarNode(token.value, *token.get_pos(), token.name_id)
+
+    def _raw_string(self, token: Token) -> StringNode:
+        return StringNode(token.value, *token.get_pos())
+
+    def relational_operator(self) -> Token:
+        for op in ("=", "<>", "<", "<=", ">"):
+            if self.match("RELATIONAL_OPERATOR", op):
+                return self.expect("RELATIONAL_OPERATOR", op)
+        return self.expect("RELATIONAL_OPERATOR", ">=")
+
+    def additive_operator(self) -> Token:
+        if self.match("ARITHMETIC_OPERATOR", "+"):
+            return self.expect("ARITHMETIC_OPERATOR", "+")
+        elif self.match("ARITHMETIC_OPERATOR", "-"):
+            return self.expect("ARITHMETIC_OPERATOR", "-")
+        return self.expect("LOGICAL_OPERATOR", "atau")
+
+    def multiplicative_operator(self) -> Token:
+        for op in ("*", "/", "bagi", "mod"):
+            if self.match("ARITHMETIC_OPERATOR", op):
+                return self.expect("ARITHMETIC_OPERATOR", op)
+        return self.expect("LOGICAL_OPERATOR", "dan")
@@ -0,0 +1,239 @@
+"""
+Apa:
+- loader + compiler grammar.json (grammar Parser dalam bentuk data) jadi tabel prediksi LL(1), dipakai TableParser
+
+Ngapain:
+- tiap nonterminal punya label (null = helper inline, anaknya langsung ditempel ke parent) dan daftar alternatif berurutan
+- terminal ditulis "KIND" atau "KIND:value" (dipisah di ":" pertama, jadi "ASSIGN_OPERATOR::=" value-nya ":="), "*" = token apa aja
+- FIRST dan FOLLOW dihitung sekali, tabel (nonterminal, terminal) -> kandidat alternatif disimpan di grammar.json.cache
+- kandidat boleh punya guard "ahead" (token kedua), buat tempat yang di Parser pakai match_ahead (LL(2) lokal)
+- "when" di alternatif = FIRST yang ditulis manual (ganti FIRST hasil hitungan), "error" = alternatif yang langsung SyntaxError
+- kalau gak ada kandidat yang cocok, dipilih alternatif terakhir (sama kaya else di Parser)
+
+catatan:
+- FOLLOW cuma dipakai buat laporan konflik (python -m src.parser.grammar), prediksi tetap ikut urutan if/elif Parser
+- alternatif nullable yang bukan terakhir gak dapet entry dari FOLLOW, biar gak muncul node kosong (mis. <declaration_part> di block)
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+from src.cache import content_key, read_cache, write_cache
+
+# naikin kalau format Grammar yang disimpan di cache berubah
+GRAMMAR_VERSION = "1"
+
+ANY = "*"
+END_OF_INPUT = ("$", None)
+
+
+def terminal(spec: str) -> tuple[str, str | None]:
+    kind, sep, value = spec.partition(":")
+    return (kind, value if sep else None)
+
+
+def show_terminal(term: tuple[str, str | None]) -> str:
+    kind, value = term
+    return kind if value is None else f"{kind}:{value}"
+
+
+class Grammar:
+    def __init__(self):
+        self.start = ""
+        # name -> (label | None, collapse, [(seq, ahead | None, error | None), ...])
+        self.nonterminals: dict[str, tuple] = {}
+        self.nullable: dict[str, bool] = {}
+        self.first: dict[str, list[tuple]] = {}
+        self.follow: dict[str, list[tuple]] = {}
+        # name -> {terminal: [(ahead | None, index alternatif), ...]}, kandidat urut sesuai urutan alternatif
+        self.table: dict[str, dict[tuple, list[tuple]]] = {}
+
+    def is_nonterminal(self, symbol: str) -> bool:
+        return symbol in self.nonterminals
+
+    def terminal_specs(self) -> set[tuple[str, str | None]]:
+        # semua terminal yang disebut grammar (di sequence, key tabel, dan guard "ahead"), tanpa "*"
+        specs = set()
+        for name, (_, _, alts) in self.nonterminals.items():
+            for seq, _, _ in alts:
+                specs.update(terminal(s) for s in seq if not self.is_nonterminal(s) and s != ANY)
+            for term, candidates in self.table[name].items():
+                specs.add(term)
+                specs.update(guard for guard, _ in candidates if guard is not None)
+        specs.discard((ANY, None))
+        return specs
+
+    def load(self, path: Optional[Union[str, Path]] = None, use_cache: bool = True) -> "Grammar":
+        if path is None:
+            path = Path(__file__).resolve().parents[1] / "rules" / "grammar.json"
+        path = Path(path)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Grammar file not found: {path}")
+
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            raise RuntimeError(f"Failed to read/parse grammar JSON file '{path}': {e}")
+
+        key = content_key(raw, GRAMMAR_VERSION)
+        if use_cache:
+            cached = read_cache(path, key)
+            if cached is not None:
+                self.__dict__.update(cached)
+                return self
+
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            raise RuntimeError(f"Failed to read/parse grammar JSON file '{path}': {e}")
+
+        if "start" not in data:
+            raise KeyError("Missing 'start' in grammar JSON")
+        if "nonterminals" not in data:
+            raise KeyError("Missing 'nonterminals' in grammar JSON")
+
+        self.compile(data)
+        if use_cache:
+            write_cache(path, key, vars(self))
+        return self
+
+    def compile(self, data: dict) -> "Grammar":
+        self.start = data["start"]
+        self.nonterminals = {}
+        for name, spec in data["nonterminals"].items():
+            alts = [(tuple(alt.get("seq", ())), alt.get("ahead"), alt.get("error")) for alt in spec["alts"]]
+            self.nonterminals[name] = (spec.get("label"), bool(spec.get("collapse", False)), alts)
+        for name, (_, _, alts) in self.nonterminals.items():
+            for seq, _, _ in alts:
+                for symbol in seq:
+                    if not self.is_nonterminal(symbol) and not symbol[:1].isupper() and symbol != ANY:
+                        raise KeyError(f"Unknown nonterminal '{symbol}' in grammar rule '{name}'")
+        if self.start not in self.nonterminals:
+            raise KeyError(f"Unknown start symbol '{self.start}' in grammar JSON")
+
+        whens = {name: [alt.get("when") for alt in spec["alts"]] for name, spec in data["nonterminals"].items()}
+        first, nullable = self._first_sets(whens)
+        follow = self._follow_sets(first, nullable)
+        self.nullable = nullable
+        self.first = {name: sorted(first[name], key=show_terminal) for name in self.nonterminals}
+        self.follow = {name: sorted(follow[name], key=show_terminal) for name in self.nonterminals}
+        self.table = self._build_table(whens, first, nullable)
+        return self
+
+    # ---------- FIRST / FOLLOW ----------
+
+    def _first_of_seq(self, seq, first, nullable) -> tuple[set, bool]:
+        result = set()
+        for symbol in seq:
+            if self.is_nonterminal(symbol):
+                result |= first[symbol]
+                if not nullable[symbol]:
+                    return result, False
+            else:
+                result.add(terminal(symbol))
+                return result, False
+        return result, True
+
+    def _first_of_alt(self, name, index, whens, first, nullable) -> tuple[set, bool]:
+        seq, _, error = self.nonterminals[name][2][index]
+        if error is not None:
+            return set(), False
+        firsts, empty = self._first_of_seq(seq, first, nullable)
+        when = whens[name][index]
+        if when is not None:
+            firsts = {terminal(spec) for spec in when}
+        return firsts, empty
+
+    def _first_sets(self, whens) -> tuple[dict, dict]:
+        first = {name: set() for name in self.nonterminals}
+        nullable = {name: False for name in self.nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for name, (_, _, alts) in self.nonterminals.items():
+                for index in range(len(alts)):
+                    firsts, empty = self._first_of_alt(name, index, whens, first, nullable)
+                    if not firsts <= first[name]:
+                        first[name] |= firsts
+                        changed = True
+                    if empty and not nullable[name]:
+                        nullable[name] = True
+                        changed = True
+        return first, nullable
+
+    def _follow_sets(self, first, nullable) -> dict:
+        follow = {name: set() for name in self.nonterminals}
+        follow[self.start].add(END_OF_INPUT)
+        changed = True
+        while changed:
+            changed = False
+            for name, (_, _, alts) in self.nonterminals.items():
+                for seq, _, _ in alts:
+                    for i, symbol in enumerate(seq):
+                        if not self.is_nonterminal(symbol):
+                            continue
+                        rest, empty = self._first_of_seq(seq[i + 1:], first, nullable)
+                        if empty:
+                            rest |= follow[name]
+                        if not rest <= follow[symbol]:
+                            follow[symbol] |= rest
+                            changed = True
+        return follow
+
+    # ---------- tabel prediksi ----------
+
+    def _build_table(self, whens, first, nullable) -> dict:
+        table = {}
+        for name, (_, _, alts) in self.nonterminals.items():
+            row: dict[tuple, list[tuple]] = {}
+            for index, (_, ahead, _) in enumerate(alts):
+                firsts, _ = self._first_of_alt(name, index, whens, first, nullable)
+                guard = terminal(ahead) if ahead is not None else None
+                for term in firsts:
+                    row.setdefault(term, []).append((guard, index))
+
+            # entry value spesifik ikut dapet kandidat wildcard kind-nya (dan "*"), urutan tetap urutan alternatif
+            wildcard = row.get((ANY, None), [])
+            for term, candidates in row.items():
+                extra = list(wildcard) if term != (ANY, None) else []
+                if term[1] is not None:
+                    extra += row.get((term[0], None), [])
+                if extra:
+                    candidates.extend(c for c in extra if c not in candidates)
+                    candidates.sort(key=lambda c: c[1])
+            table[name] = row
+        return table
+
+    def conflicts(self) -> list[str]:
+        # konflik yang di-resolve pakai urutan alternatif (alternatif pertama menang / greedy)
+        report = []
+        for name, row in self.table.items():
+            for term, candidates in row.items():
+                unguarded = [index for guard, index in candidates if guard is None]
+                if len(unguarded) > 1:
+                    report.append(f"{name}: FIRST/FIRST on {show_terminal(term)} -> alternatives {unguarded}")
+            alts = self.nonterminals[name][2]
+            last_seq, _, last_error = alts[-1]
+            if last_error is None and all(self.is_nonterminal(s) and self.nullable[s] for s in last_seq):
+                clash = sorted((set(row) - {(ANY, None)}) & set(self.follow[name]), key=show_terminal)
+                if clash:
+                    report.append(f"{name}: FIRST/FOLLOW on {', '.join(show_terminal(t) for t in clash)} (greedy)")
+        return report
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    grammar = Grammar().load(args[0] if args else None, use_cache=False)
+    for name, (label, _, alts) in grammar.nonterminals.items():
+        print(f"{name} {label or '(inline)'}: {len(alts)} alternatives")
+        print(f"  FIRST:  {' '.join(show_terminal(t) for t in grammar.first[name])}")
+        print(f"  FOLLOW: {' '.join(show_terminal(t) for t in grammar.follow[name])}")
+    for line in grammar.conflicts():
+        print("conflict:", line)
+
+
+if __name__ == "__main__":
+    main()
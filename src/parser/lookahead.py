@@ -0,0 +1,52 @@
+from collections.abc import Iterable
+from itertools import chain
+
+from src.lexer.token import Token
+
+# ring buffer kecil buat lookahead parser, token ditarik dari iterator pas dibutuhkan aja
+class LookaheadBuffer:
+    def __init__(self, tokens: Iterable[Token], size: int = 2):
+        self.source = iter(tokens)
+        self.size = size
+        self.ring: list[Token | None] = [None] * size
+        self.head = 0
+        self.count = 0
+        self.exhausted = False
+
+    def peek(self, k: int = 0) -> Token | None:
+        # token ke-k dari posisi sekarang (0 = token sekarang), None kalau EOF
+        if k >= self.size:
+            raise IndexError(f"lookahead {k} exceeds buffer size {self.size}")
+
+        while self.count <= k and not self.exhausted:
+            token = next(self.source, None)
+            if token is None:
+                self.exhausted = True
+                break
+            self.ring[(self.head + self.count) % self.size] = token
+            self.count += 1
+
+        if k < self.count:
+            return self.ring[(self.head + k) % self.size]
+        return None
+
+    def advance(self):
+        if self.count == 0:
+            self.peek(0)
+        if self.count:
+            self.ring[self.head] = None
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+
+    def unread(self, tokens: list[Token]):
+        # token yang sudah lewat ditaruh di depan lagi (Parser lazy_bodies balik ke mulai)
+        pending = [self.ring[(self.head + k) % self.size] for k in range(self.count)]
+        self.source = chain(tokens, pending, self.source)
+        self.ring = [None] * self.size
+        self.head = 0
+        self.count = 0
+        self.exhausted = False
+
+    def match(self, k: int, token_type: str, token_value: str | None = None) -> bool:
+        token = self.peek(k)
+        return token is not None and token.type == token_type and (token_value is None or token.value == token_value)
@@ -1,49 +1,359 @@
 
 
+from collections.abc import Generator, Iterable
+from itertools import islice
+
 from src.parser.parsertree import ParseTree
+from src.parser.arena import ArenaNode, ParseArena, PendingNode, KIND_OF_LABEL
+from src.parser.lookahead import LookaheadBuffer
 from src.lexer.token import Token
+from src.lexer.token_buffer import TokenBuffer, TokenCursor
 from src.errors import SyntaxError
+from src.trampoline import drive
+
+# keyword yang mulai deklarasi, titik sync recovery di declaration_part
+DECLARATION_KEYWORDS = ("konstanta", "tipe", "variabel", "prosedur", "fungsi")
+STATEMENT_KEYWORDS = ("mulai", "jika", "selama", "untuk")
+
+# node yang bisa di-parse ulang sendiri oleh Parser.reparse: label -> method yang bikin node itu
+REPARSE_METHODS = {
+    "<program_header>": "program_header",
+    "<statement>": "statement",
+    "<const_declaration>": "const_declaration",
+    "<type_declaration>": "type_declaration",
+    "<var_declaration>": "var_declaration",
+    "<subprogram_declaration>": "subprogram_declaration",
+}
+
+
+class TooManyErrors(Exception):
+    # recover=True: jumlah error sudah sampai max_errors, parsing dihentikan (bukan SyntaxError biar gak ketangkep sync)
+    pass
+
 
 class Parser:
-    def __init__(self, tokens: list):
+    # tokens boleh list atau iterator (mis. Scanner.iter_tokens()), parser cuma nyimpen 2 token lookahead
+    # kalau TokenBuffer, match dicek langsung ke array kind (tanpa bikin objek Token)
+    # arena=True: tree disimpan di ParseArena (kolom int), hasil parse() berupa ArenaNode
+    # compact=True: <expression>/<simple-expression>/<term>/<factor> yang anaknya cuma satu diganti anaknya langsung
+    # lazy_bodies=True: body prosedur/fungsi cuma dilewati (mulai/selesai diseimbangkan), jadi LazyCompound
+    #   yang baru di-parse pas children-nya dibaca (buat query deklarasi / symbol table aja)
+    # recover=True: SyntaxError dicatat di self.errors (maks max_errors), token sampai titik sync dibungkus node <error>,
+    #   parse() tetap balikin tree (sebagian kalau kena batas); error pertama sama persis dengan mode biasa
+    # production statement/expression (compound_statement sampai factor) berupa generator: `anak = yield self.x()`,
+    #   dijalanin drive() pakai stack sendiri, jadi nesting dalam gak kena recursion limit Python
+    #   (yang masih rekursif cuma deklarasi: subprogram di dalam subprogram)
+    def __init__(self, tokens: Iterable[Token] | TokenBuffer, arena: bool = False, compact: bool = False,
+                 lazy_bodies: bool = False, recover: bool = False, max_errors: int = 20):
+        if lazy_bodies and arena:
+            raise ValueError("lazy_bodies needs ParseTree nodes, it cannot be combined with arena=True")
         self.tokens = tokens
+        if isinstance(tokens, TokenBuffer):
+            self.stream = TokenCursor(tokens)
+        else:
+            self.stream = LookaheadBuffer(tokens)
         self.pos = 0
+        self.arena = ParseArena(tokens if isinstance(tokens, TokenBuffer) else None) if arena else None
+        self.compact = compact
+        self.lazy_bodies = lazy_bodies
+        self.recover = recover
+        self.max_errors = max_errors
+        self.errors: list[SyntaxError] = []
+        self.root = None
+
+    def parse(self) -> ParseTree | ArenaNode:
+        if self.recover:
+            try:
+                try:
+                    self.program()
+                except SyntaxError as e:
+                    # error di luar titik sync (mis. DOT terakhir): dicatat, tree yang sudah jadi tetap dibalikin
+                    self._record(e)
+            except TooManyErrors:
+                pass
+            root = self.root
+        else:
+            root = self.program()
+        if self.arena is not None:
+            return self.arena.finish(root.id)
+        return root
+
+    def reparse(self, old_tree: ParseTree, token_edit_range: tuple[int, int, int]) -> ParseTree:
+        # old_tree = hasil parse token lama; token_edit_range = (start, old_end, new_end): token lama [start, old_end)
+        # diganti token baru [start, new_end), tokens parser ini = token baru (list / TokenBuffer, bukan iterator)
+        # node terkecil yang span-nya nutup edit (statement / deklarasi / subprogram, atau deretan statement di
+        # <statement-list>) di-parse ulang dari token pertamanya lalu ditempel ke old_tree; sibling di luar edit tetap
+        # objek yang sama (termasuk Token-nya, jadi line/col di situ masih posisi di teks lama).
+        # Hasilnya sama dengan parse() penuh: bagian yang di-parse ulang harus habis tepat di token yang sama
+        # (width lama + selisih), kalau gak naik ke kandidat di atasnya, gak ada yang cocok -> parse() penuh
+        if self.arena is not None or self.recover:
+            raise ValueError("reparse works on plain ParseTree parsing (arena=False, recover=False)")
+        if not isinstance(self.tokens, (list, tuple, TokenBuffer)):
+            raise TypeError("reparse needs random access to the tokens (list or TokenBuffer)")
+        start, old_end, new_end = token_edit_range
+        delta = new_end - old_end
+        if start == old_end == new_end:
+            return old_tree
+
+        # turun dari root lewat anak pertama yang span-nya nutup [start, old_end), catat kandidat sepanjang jalan
+        path = []        # node dari root sampai node terdalam yang nutup edit
+        candidates = []  # (index node di path, index anak | None = deretan statement, token pertama)
+        node, offset = old_tree, 0
+        while True:
+            path.append(node)
+            if node.value == "<statement-list>":
+                candidates.append((len(path) - 1, None, offset))
+            for index, child in enumerate(node.children):
+                if offset <= start and old_end <= offset + child.width and not isinstance(child.value, Token):
+                    if child.value in REPARSE_METHODS:
+                        candidates.append((len(path) - 1, index, offset))
+                    node = child
+                    break
+                offset += child.width
+            else:
+                break
 
-    def parse(self) -> ParseTree:
-        return self.program()
+        for depth, index, first in reversed(candidates):
+            if index is None:
+                spliced = self._reparse_statements(path[depth], first, start, old_end, delta)
+            else:
+                spliced = self._reparse_child(path[depth], index, first, delta)
+            if spliced:
+                for ancestor in path[:depth + 1]:
+                    ancestor.width += delta
+                return old_tree
+
+        self._seek(0)
+        return self.parse()
+
+    def _reparse_child(self, parent: ParseTree, index: int, first: int, delta: int) -> bool:
+        old = parent.children[index]
+        self._seek(first)
+        try:
+            new = getattr(self, REPARSE_METHODS[old.value])()
+            if isinstance(new, Generator):
+                new = drive(new)
+        except SyntaxError:
+            # error sesudah token pertama = error yang sama dengan parse penuh (prefix-nya gak berubah);
+            # di token pertama bisa jadi parent-nya yang mestinya milih production lain
+            if self.pos > first:
+                raise
+            return False
+        # width 0 = <statement> kosong (mis. "; selesai"), statement_list aslinya gak bikin node itu
+        if new.width == 0 or new.width != old.width + delta:
+            return False
+        parent.children[index] = new
+        return True
+
+    def _reparse_statements(self, node: ParseTree, offset: int, start: int, old_end: int, delta: int) -> bool:
+        # anak <statement> a..b yang nutup edit di-parse ulang pakai loop statement_list yang sama,
+        # harus berhenti tepat di akhir anak b (+ selisih); SyntaxError di sini sama dengan parse penuh
+        children = node.children
+        a = b = None
+        for index, child in enumerate(children):
+            if child.value == "<statement>":
+                if offset <= start:
+                    a, first = index, offset
+                if a is not None and old_end <= offset + child.width:
+                    b, target = index, offset + child.width + delta
+                    break
+            offset += child.width
+        if b is None:
+            return False
+
+        self._seek(first)
+        if a > 0 and self.match("KEYWORD", "selesai"):
+            return False
+        statements = [drive(self.statement())]
+        while self.pos < target:
+            if not self.match("SEMICOLON", ";") or self.match_ahead("KEYWORD", "selesai"):
+                return False
+            statements.append(self.consume("SEMICOLON", ";"))
+            statements.append(drive(self.statement()))
+        if self.pos != target:
+            return False
+        children[a:b + 1] = statements
+        return True
+
+    def _seek(self, pos: int):
+        if isinstance(self.stream, TokenCursor):
+            self.stream.pos = pos
+        else:
+            self.stream = LookaheadBuffer(islice(self.tokens, pos, None))
+        self.pos = pos
+
+    # bikin node / leaf sesuai representasi tree yang dipakai
+    # collapsible=True: node ini nanti lewat _collapse, jadi di arena compact row-nya ditunda (PendingNode)
+    def _node(self, label: str, collapsible: bool = False) -> ParseTree | ArenaNode | PendingNode:
+        if self.arena is None:
+            return ParseTree(label)
+        if collapsible and self.compact:
+            return PendingNode(self.arena, KIND_OF_LABEL[label])
+        return ArenaNode(self.arena, self.arena.new_node(KIND_OF_LABEL[label]))
+
+    def _collapse(self, node: ParseTree | ArenaNode | PendingNode) -> ParseTree | ArenaNode:
+        if self.compact:
+            children = node.children
+            if len(children) == 1:
+                return children[0]
+        if isinstance(node, PendingNode):
+            return node.realize()
+        return node
+
+    def _leaf(self, token: Token) -> ParseTree | ArenaNode:
+        if self.arena is None:
+            return ParseTree(token)
+        # token dari TokenBuffer yang sama gak perlu disalin, cukup index-nya
+        index = self.stream.pos if isinstance(self.stream, TokenCursor) else None
+        return ArenaNode(self.arena, self.arena.new_leaf(token, index))
 
     def peek(self) -> Token:
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        return self.stream.peek(0)
 
     def lookahead(self) -> Token:
-        return self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+        return self.stream.peek(1)
 
     def next_token(self):
+        self.stream.advance()
         self.pos += 1
 
     def match(self, token_type : str, token_value: str = None) -> bool:
-        token = self.peek()
-        if token and token.type == token_type and (token_value is None or token.value == token_value):
-            return True
-        return False
+        return self.stream.match(0, token_type, token_value)
 
     def match_ahead(self, token_type : str, token_value: str = None) -> bool:
-        token = self.lookahead()
-        if token and token.type == token_type and (token_value is None or token.value == token_value):
-            return True
-        return False
+        return self.stream.match(1, token_type, token_value)
 
     def consume(self, token_type : str, token_value: str = None) -> ParseTree:
         token = self.peek()
         if (self.match(token_type, token_value)):
+            leaf = self._leaf(token)
             self.next_token()
-            return ParseTree(token)
+            return leaf
 
+        self._unexpected(token, token_type, token_value)
+
+    # sama dengan consume, tapi yang dibalikin Token-nya langsung (dipakai AstParser)
+    def expect(self, token_type : str, token_value: str = None) -> Token:
+        token = self.peek()
+        if (self.match(token_type, token_value)):
+            self.next_token()
+            return token
+
+        self._unexpected(token, token_type, token_value)
+
+    def _unexpected(self, token: Token | None, token_type: str, token_value: str | None):
+        raise self._syntax_error(token, token_type, token_value)
+
+    def _syntax_error(self, token: Token | None, token_type: str, token_value: str | None) -> SyntaxError:
         expected_type = token_type
         expected_value = f"with value [{token_value}]" if token_value is not None else ""
         actual_type = token.type if token else "EOF"
         actual_value = f"with value [{token.value}]" if token and token.value is not None else ""
-        raise SyntaxError(f"Expected {expected_type} {expected_value}, but got {actual_type} {actual_value}", token.line if token else "EOF", token.col if token else "")
+        return SyntaxError(f"Expected {expected_type} {expected_value}, but got {actual_type} {actual_value}", token.line if token else "EOF", token.col if token else "")
+
+    def _error_here(self, message: str) -> SyntaxError:
+        # SyntaxError di posisi token sekarang (EOF aman)
+        token = self.peek()
+        return SyntaxError(message, token.line if token else "EOF", token.col if token else "")
+
+    # ---------- panic-mode recovery (recover=True) ----------
+
+    def _record(self, error: SyntaxError):
+        # error di posisi yang sama dengan error sebelumnya = cascade, gak dicatat lagi
+        if self.errors and (self.errors[-1].line, self.errors[-1].col) == (error.line, error.col):
+            return
+        self.errors.append(error)
+        if len(self.errors) >= self.max_errors:
+            raise TooManyErrors()
+
+    def _error_node(self, error: SyntaxError, stop, start: int | None = None) -> ParseTree | ArenaNode:
+        # catat error, lalu token dilewati (jadi anak node <error>) sampai stop() true atau EOF
+        # start = posisi token awal production yang gagal, token yang sudah kemakan ikut dihitung di width
+        self._record(error)
+        node = self._node("<error>")
+        while self.peek() is not None and not stop():
+            node.add_child(self._leaf(self.peek()))
+            self.next_token()
+        if start is not None and self.arena is None:
+            node.width = self.pos - start
+        return node
+
+    def _at_statement_start(self) -> bool:
+        return self.match("IDENTIFIER") or any(self.match("KEYWORD", kw) for kw in STATEMENT_KEYWORDS)
+
+    def _at_statement_end(self) -> bool:
+        return self.match("SEMICOLON") or self.match("KEYWORD", "selesai")
+
+    def _at_declaration_start(self) -> bool:
+        return self.match("KEYWORD", "mulai") or any(self.match("KEYWORD", kw) for kw in DECLARATION_KEYWORDS)
+
+    def _statement_or_error(self):
+        if not self.recover:
+            return (yield self.statement())
+        start = self.pos
+        try:
+            return (yield self.statement())
+        except SyntaxError as e:
+            return self._error_node(e, self._at_statement_end, start)
+
+    def _declaration_or_error(self, declaration) -> ParseTree | ArenaNode:
+        if not self.recover:
+            return declaration()
+        start = self.pos
+        try:
+            return declaration()
+        except SyntaxError as e:
+            return self._error_node(e, self._at_declaration_start, start)
+
+    def _subprogram_or_error(self) -> ParseTree | ArenaNode:
+        if not self.recover:
+            return self.subprogram_declaration()
+        start = self.pos
+        try:
+            return self.subprogram_declaration()
+        except SyntaxError as e:
+            node = self._error_node(e, self._at_declaration_start, start)
+            # error di header/parameter/deklarasi lokal: body-nya (mulai ... selesai ;) ikut dilewati
+            if self.match("KEYWORD", "mulai"):
+                depth = 0
+                while self.peek() is not None:
+                    if self.match("KEYWORD", "mulai"):
+                        depth += 1
+                    elif self.match("KEYWORD", "selesai"):
+                        depth -= 1
+                    node.add_child(self._leaf(self.peek()))
+                    self.next_token()
+                    if depth == 0:
+                        break
+                if self.match("SEMICOLON"):
+                    node.add_child(self.consume("SEMICOLON"))
+                if self.arena is None:
+                    node.width = self.pos - start
+            return node
+
+    def _items_or_error(self, node: ParseTree | ArenaNode, item):
+        # satu item deklarasi (mis. "a, b: integer;"): error -> lewati sampai ';' (ikut dimakan) atau deklarasi berikutnya
+        if not self.recover:
+            item(node)
+            return
+        start, width = self.pos, len(node.children)
+        try:
+            item(node)
+        except SyntaxError as e:
+            error = self._error_node(e, lambda: self.match("SEMICOLON") or self._at_declaration_start())
+            if self.arena is None:
+                # anak item yang sudah ketempel tetap ada, sisanya (token yang kemakan sebelum error) masuk <error>
+                error.width = self.pos - start - sum(child.width for child in node.children[width:])
+            node.add_child(error)
+            if self.match("SEMICOLON"):
+                node.add_child(self.consume("SEMICOLON"))
+
+    def _consume_or_insert(self, token_type: str, token_value: str = None) -> ParseTree | ArenaNode | None:
+        # token penutup yang hilang (mis. ';' habis body prosedur): dicatat, lalu dianggap ada
+        if self.recover and not self.match(token_type, token_value):
+            self._record(self._syntax_error(self.peek(), token_type, token_value))
+            return self._node("<error>")
+        return self.consume(token_type, token_value)
 
     '''
     HARDCODED PRODUCTION RULES :
@@ -88,18 +398,19 @@ class Parser:
 
     # program -> program_header + declaration_part + compound_statement + DOT
     def program(self) -> ParseTree : 
-        node = ParseTree("<program>")
+        node = self._node("<program>")
+        self.root = node
 
-        node.add_child(self.program_header())
+        node.add_child(self._declaration_or_error(self.program_header))
         node.add_child(self.declaration_part())
-        node.add_child(self.compound_statement())
+        node.add_child(drive(self.compound_statement()))
         node.add_child(self.consume("DOT"))
 
         return node
 
     # program_header -> KEYWORD(program) + IDENTIFIER + SEMICOLON
     def program_header(self) :
-        node = ParseTree("<program_header>")
+        node = self._node("<program_header>")
 
         node.add_child(self.consume("KEYWORD", "program"))
         node.add_child(self.consume("IDENTIFIER"))
@@ -109,73 +420,81 @@ class Parser:
 
     # declaration_part -> (const_declaration)* + (type_declaration)* + (var_declaration)* + (subprogram_declaration)*
     def declaration_part(self) -> ParseTree :
-        node = ParseTree("<declaration_part>")
+        node = self._node("<declaration_part>")
         while self.match("KEYWORD", "konstanta"):
-            node.add_child(self.const_declaration())
+            node.add_child(self._declaration_or_error(self.const_declaration))
         while self.match("KEYWORD", "tipe"):
-            node.add_child(self.type_declaration())
+            node.add_child(self._declaration_or_error(self.type_declaration))
         while self.match("KEYWORD", "variabel"):
-            node.add_child(self.var_declaration())
+            node.add_child(self._declaration_or_error(self.var_declaration))
         while self.match("KEYWORD", "prosedur") or self.match("KEYWORD", "fungsi"):
-            node.add_child(self.subprogram_declaration())
+            node.add_child(self._subprogram_or_error())
 
         return node
 
     # const_declaration -> KEYWORD(konstanta) + (IDENTIFIER + RELATIONAL_OPERATOR(=) + (NUMBER | STRING_LITERAL | CHAR_LITERAL) + SEMICOLON)+
     def const_declaration(self) -> ParseTree:
-        node = ParseTree("<const_declaration>")
+        node = self._node("<const_declaration>")
 
         node.add_child(self.consume("KEYWORD", "konstanta"))
 
         if not self.match("IDENTIFIER"):  # minimal ada satu identifier
-            raise SyntaxError("Expected atleast one const declaration in constant declaration", self.peek().line, self.peek().col)
+            raise self._error_here("Expected atleast one const declaration in constant declaration")
         
         while self.match("IDENTIFIER"):
-            node.add_child(self.consume("IDENTIFIER"))
-            node.add_child(self.consume("RELATIONAL_OPERATOR", "="))
-            node.add_child(self.consume(self.peek().type))
-            node.add_child(self.consume("SEMICOLON"))
+            self._items_or_error(node, self._const_item)
 
         return node
 
+    def _const_item(self, node: ParseTree):
+        node.add_child(self.consume("IDENTIFIER"))
+        node.add_child(self.consume("RELATIONAL_OPERATOR", "="))
+        node.add_child(self.consume(self.peek().type if self.peek() else "*"))
+        node.add_child(self.consume("SEMICOLON"))
+
     # type_declaration -> KEYWORD(tipe) + (IDENTIFIER + (RELATIONAL_OPERATOR(=) + type_definition + SEMICOLON)+
     def type_declaration(self) -> ParseTree:
-        node = ParseTree("<type_declaration>")
+        node = self._node("<type_declaration>")
 
         node.add_child(self.consume("KEYWORD", "tipe"))
 
         if not self.match("IDENTIFIER"):
-            raise SyntaxError("Expected at least one identifier at type declaration", self.peek().line, self.peek().col)
+            raise self._error_here("Expected at least one identifier at type declaration")
         
         while self.match("IDENTIFIER"):
-            node.add_child(self.consume("IDENTIFIER"))
-            node.add_child(self.consume("RELATIONAL_OPERATOR", "="))
-            node.add_child(self.type_definition())
-            node.add_child(self.consume("SEMICOLON"))
+            self._items_or_error(node, self._type_item)
 
         return node
 
+    def _type_item(self, node: ParseTree):
+        node.add_child(self.consume("IDENTIFIER"))
+        node.add_child(self.consume("RELATIONAL_OPERATOR", "="))
+        node.add_child(self.type_definition())
+        node.add_child(self.consume("SEMICOLON"))
+
     # var_declaration -> KEYWORD(variabel) + (identifier_list + COLON + type + SEMICOLON)+
     def var_declaration(self) -> ParseTree:
-        node = ParseTree("<var_declaration>")
+        node = self._node("<var_declaration>")
 
         node.add_child(self.consume("KEYWORD", "variabel"))
 
         if not self.match("IDENTIFIER"):
-            raise SyntaxError("Expected at least one identifier at variable declaration", self.peek().line, self.peek().col)
+            raise self._error_here("Expected at least one identifier at variable declaration")
         
         while self.match("IDENTIFIER"):
-            node.add_child(self.identifier_list())
-            node.add_child(self.consume("COLON"))
-            node.add_child(self.type())
-            node.add_child(self.consume("SEMICOLON"))
-
+            self._items_or_error(node, self._var_item)
 
         return node
 
+    def _var_item(self, node: ParseTree):
+        node.add_child(self.identifier_list())
+        node.add_child(self.consume("COLON"))
+        node.add_child(self.type())
+        node.add_child(self.consume("SEMICOLON"))
+
     # identifier_list -> IDENTIFIER + (COMMA + IDENTIFIER)*
     def identifier_list(self) -> ParseTree:
-        node = ParseTree("<identifier_list>")
+        node = self._node("<identifier_list>")
 
         node.add_child(self.consume("IDENTIFIER"))
 
@@ -187,7 +506,7 @@ class Parser:
 
     # type_definition -> type | record_type
     def type_definition(self) -> ParseTree:
-        node = ParseTree("<type_definition>")
+        node = self._node("<type_definition>")
 
         if self.match("KEYWORD", "larik") or self.match("KEYWORD", "integer") or self.match("KEYWORD", "char") or self.match("KEYWORD", "boolean") or self.match("KEYWORD", "Real"):
             node.add_child(self.type())
@@ -198,7 +517,7 @@ class Parser:
 
     # type -> array_type | KEYWORD(integer | char | boolean | Real)
     def type(self) -> ParseTree:
-        node = ParseTree("<type>")
+        node = self._node("<type>")
         
         if self.match("KEYWORD", "larik"):
             node.add_child(self.array_type())
@@ -209,7 +528,7 @@ class Parser:
 
     # array_type -> KEYWORD(larik) + LBRACKET + range + RBRACKET + KEYWORD(dari) + type
     def array_type(self) -> ParseTree:
-        node = ParseTree("<array_type>")
+        node = self._node("<array_type>")
 
         node.add_child(self.consume("KEYWORD", "larik"))
         node.add_child(self.consume("LBRACKET"))
@@ -222,12 +541,12 @@ class Parser:
 
     # record_type -> KEYWORD(rekaman) + (identifier_list + COLON + type + SEMICOLON)+ + KEYWORD(selesai)
     def record_type(self) -> ParseTree:
-        node = ParseTree("<record_type>")
+        node = self._node("<record_type>")
 
         node.add_child(self.consume("KEYWORD", "rekaman"))
 
         if not self.match("IDENTIFIER"):
-            raise SyntaxError("Expected at least one identifier at record definition , got " + str(self.peek().type) + str(self.peek().value), self.peek().line, self.peek().col)
+            raise self._error_here("Expected at least one identifier at record definition , got " + str(self.peek().type if self.peek() else "EOF") + str(self.peek().value if self.peek() else ""))
         
         while self.match("IDENTIFIER"):
             node.add_child(self.identifier_list())
@@ -241,17 +560,17 @@ class Parser:
 
     # range -> expression + RANGE_OPERATOR(..) + expression
     def range(self) -> ParseTree:
-        node = ParseTree("<range>")
+        node = self._node("<range>")
 
-        node.add_child(self.expression())
+        node.add_child(drive(self.expression()))
         node.add_child(self.consume("RANGE_OPERATOR", ".."))
-        node.add_child(self.expression())
+        node.add_child(drive(self.expression()))
 
         return node
 
     # subprogram_declaration -> procedure_declaration | function_declaration
     def subprogram_declaration(self) -> ParseTree:
-        node = ParseTree("<subprogram_declaration>")
+        node = self._node("<subprogram_declaration>")
         if self.match("KEYWORD", "prosedur"):
             node.add_child(self.procedure_declaration())
         elif self.match("KEYWORD", "fungsi"):
@@ -261,7 +580,7 @@ class Parser:
 
     # procedure_declaration -> KEYWORD(prosedur) + IDENTIFIER + (formal_parameter_list)? + SEMICOLON + block + SEMICOLON
     def procedure_declaration(self) -> ParseTree:
-        node = ParseTree("<procedure_declaration>")
+        node = self._node("<procedure_declaration>")
         
         node.add_child(self.consume("KEYWORD", "prosedur"))
         node.add_child(self.consume("IDENTIFIER"))
@@ -271,13 +590,13 @@ class Parser:
 
         node.add_child(self.consume("SEMICOLON"))
         node.add_child(self.block())
-        node.add_child(self.consume("SEMICOLON"))
+        node.add_child(self._consume_or_insert("SEMICOLON"))
 
         return node
 
     # function_declaration -> KEYWORD(fungsi) + IDENTIFIER + (formal_parameter_list)? + COLON + type + SEMICOLON + block + SEMICOLON
     def function_declaration(self) -> ParseTree:
-        node = ParseTree("<function_declaration>")
+        node = self._node("<function_declaration>")
 
         node.add_child(self.consume("KEYWORD", "fungsi"))
         node.add_child(self.consume("IDENTIFIER"))
@@ -289,14 +608,13 @@ class Parser:
         node.add_child(self.type())
         node.add_child(self.consume("SEMICOLON"))
         node.add_child(self.block())
-        node.add_child(self.consume("SEMICOLON"))
-
+        node.add_child(self._consume_or_insert("SEMICOLON"))
 
         return node
 
     # formal_parameter_list -> LPARENTHESIS + parameter_group + (SEMICOLON + parameter_group)* + RPARENTHESIS
     def formal_parameter_list(self) -> ParseTree:
-        node = ParseTree("<formal_parameter_list>")
+        node = self._node("<formal_parameter_list>")
 
         node.add_child(self.consume("LPARENTHESIS"))
 
@@ -313,7 +631,7 @@ class Parser:
 
     # parameter_group -> identifier_list + COLON + type
     def parameter_group(self) -> ParseTree:
-        node = ParseTree("<parameter_group>")
+        node = self._node("<parameter_group>")
 
         node.add_child(self.identifier_list())
 
@@ -325,11 +643,19 @@ class Parser:
 
     # compound_statement -> KEYWORD(mulai) + statement_list + KEYWORD(selesai)
     def compound_statement(self) -> ParseTree :
-        node = ParseTree("<compound_statement>")
+        node = self._node("<compound_statement>")
+
+        # recover: mulai hilang / salah dicatat, statement list tetap di-parse (dan dicek) seolah ada mulai
+        node.add_child(self._consume_or_insert("KEYWORD", "mulai"))
 
-        node.add_child(self.consume("KEYWORD", "mulai"))
+        node.add_child((yield self.statement_list()))
 
-        node.add_child(self.statement_list())
+        if self.recover and not self.match("KEYWORD", "selesai"):
+            # selesai hilang (ketemu '.' / EOF): dicatat, dianggap ada
+            node.add_child(self._error_node(self._syntax_error(self.peek(), "KEYWORD", "selesai"),
+                                            lambda: self.match("KEYWORD", "selesai") or self.match("DOT")))
+            if not self.match("KEYWORD", "selesai"):
+                return node
 
         node.add_child(self.consume("KEYWORD", "selesai"))
 
@@ -337,63 +663,130 @@ class Parser:
 
     # block -> (declaration_part)? + compound_statement
     def block(self) -> ParseTree:
-        node = ParseTree("<block>")
+        node = self._node("<block>")
 
         if self.match("KEYWORD", "konstanta") or self.match("KEYWORD", "tipe") or self.match("KEYWORD", "variabel") or self.match("KEYWORD", "prosedur") or self.match("KEYWORD", "fungsi"):
             node.add_child(self.declaration_part())
 
-        node.add_child(self.compound_statement())
+        if self.lazy_bodies:
+            node.add_child(self.skip_compound_statement())
+        else:
+            node.add_child(drive(self.compound_statement()))
 
         return node
 
+    # sama dengan compound_statement tapi isinya gak di-parse: token dari mulai sampai selesai pasangannya
+    # dicatat di LazyCompound (TokenBuffer cukup index, selain itu token-nya disalin ke list)
+    # scan berhenti di DOT (akhir program) / keyword deklarasi: body-nya gak ketutup, jadi di-parse
+    # eager dari mulai lagi supaya error-nya sama persis dengan parse penuh
+    def skip_compound_statement(self) -> "LazyCompound | ParseTree":
+        if not self.match("KEYWORD", "mulai"):
+            self._unexpected(self.peek(), "KEYWORD", "mulai")
+
+        if isinstance(self.stream, TokenCursor):
+            buf = self.stream.buffer
+            kinds, value_ids = buf.kinds, buf.value_ids
+            keyword, begin, end = buf.kind_of("KEYWORD"), buf.string_of("mulai"), buf.string_of("selesai")
+            dot, declarations = buf.kind_of("DOT"), {buf.string_of(kw) for kw in DECLARATION_KEYWORDS}
+            start = i = self.stream.pos
+            depth = 0
+            while i < len(kinds):
+                if kinds[i] == keyword:
+                    if value_ids[i] == begin:
+                        depth += 1
+                    elif value_ids[i] == end:
+                        depth -= 1
+                    elif value_ids[i] in declarations:
+                        break
+                elif kinds[i] == dot:
+                    break
+                i += 1
+                if depth == 0:
+                    self.pos += i - start
+                    self.stream.pos = i
+                    return LazyCompound(buf, start, i, self.compact)
+            return drive(self.compound_statement())
+
+        body = []
+        depth = 0
+        while True:
+            token = self.peek()
+            if token is None or self.match("DOT") or any(self.match("KEYWORD", kw) for kw in DECLARATION_KEYWORDS):
+                self.stream.unread(body)
+                self.pos -= len(body)
+                return drive(self.compound_statement())
+            if self.match("KEYWORD", "mulai"):
+                depth += 1
+            elif self.match("KEYWORD", "selesai"):
+                depth -= 1
+            body.append(token)
+            self.next_token()
+            if depth == 0:
+                return LazyCompound(body, 0, len(body), self.compact)
+
     # statement_list -> statement + (SEMICOLON + statement)*
     def statement_list(self) -> ParseTree:
-        node = ParseTree("<statement-list>")
+        node = self._node("<statement-list>")
         
-        node.add_child(self.statement())
+        node.add_child((yield self._statement_or_error()))
         
-        while self.match("SEMICOLON", ";"):
-            
-            if self.lookahead() and self.lookahead().type == "KEYWORD" and self.lookahead().value == "selesai":
+        while True:
+            if self.match("SEMICOLON", ";"):
+
+                if self.match_ahead("KEYWORD", "selesai"):
+                    node.add_child(self.consume("SEMICOLON", ";"))
+                    break
+
                 node.add_child(self.consume("SEMICOLON", ";"))
-                break
+                node.add_child((yield self._statement_or_error()))
+
+            elif self.recover and self._at_statement_start():
+                # ';' hilang: dilaporin sama kaya compound_statement (nunggu selesai), lalu lanjut seolah ada ';'
+                self._record(self._syntax_error(self.peek(), "KEYWORD", "selesai"))
+                node.add_child((yield self._statement_or_error()))
 
-            node.add_child(self.consume("SEMICOLON", ";"))
-            node.add_child(self.statement())
+            elif self.recover and self.peek() is not None and not self.match("KEYWORD", "selesai") \
+                    and not self.match("DOT"):
+                # token nyasar habis statement: dilewati sampai ';' / selesai / '.'
+                node.add_child(self._error_node(self._syntax_error(self.peek(), "KEYWORD", "selesai"),
+                                                lambda: self._at_statement_end() or self.match("DOT")))
+
+            else:
+                break
             
         return node
 
     # statement -> compound_statement | if_statement | while_statement | for_statement | assignment_statement | procedure_or_function_call
     def statement(self) -> ParseTree:
-        node = ParseTree("<statement>")
+        node = self._node("<statement>")
         
         if self.match("KEYWORD", "mulai"):
-            node.add_child(self.compound_statement())
+            node.add_child((yield self.compound_statement()))
             
         elif self.match("KEYWORD", "jika"):
-            node.add_child(self.if_statement())
+            node.add_child((yield self.if_statement()))
             
         elif self.match("KEYWORD", "selama"):
-            node.add_child(self.while_statement())
+            node.add_child((yield self.while_statement()))
             
         elif self.match("KEYWORD", "untuk"):
-            node.add_child(self.for_statement())
+            node.add_child((yield self.for_statement()))
             
         elif self.match("IDENTIFIER"):
 
-            if self.lookahead() and self.lookahead().type == "ASSIGN_OPERATOR":
-                node.add_child(self.assignment_statement())
-            elif self.lookahead() and self.lookahead().type == "LBRACKET":
-                node.add_child(self.assignment_statement())
+            if self.match_ahead("ASSIGN_OPERATOR"):
+                node.add_child((yield self.assignment_statement()))
+            elif self.match_ahead("LBRACKET"):
+                node.add_child((yield self.assignment_statement()))
             else:
-                node.add_child(self.procedure_or_function_call())
+                node.add_child((yield self.procedure_or_function_call()))
 
         return node
         
 
     # assignment_statement -> IDENTIFIER + (array_bucket)? + ASSIGN_OPERATOR(:=) + expression
     def assignment_statement(self):
-        node = ParseTree("<assignment-statement>")
+        node = self._node("<assignment-statement>")
         
         node.add_child(self.consume("IDENTIFIER"))
 
@@ -401,13 +794,13 @@ class Parser:
             node.add_child(self.array_bucket())
 
         node.add_child(self.consume("ASSIGN_OPERATOR", ":="))
-        node.add_child(self.expression())
+        node.add_child((yield self.expression()))
 
         return node
 
     # array_bucket ->  LBRACKET + (NUMBER | IDENTIFIER) + RBRACKET
     def array_bucket(self):
-        node = ParseTree("<array-bucket>")
+        node = self._node("<array-bucket>")
 
         node.add_child(self.consume("LBRACKET"))
         if self.match("IDENTIFIER"):
@@ -420,59 +813,59 @@ class Parser:
 
     # if_statement -> KEYWORD(jika) + expression + KEYWORD(maka) + statement + (KEYWORD(selain_itu) + statement)?
     def if_statement(self):
-        node = ParseTree("<if-statement>")
+        node = self._node("<if-statement>")
 
         node.add_child(self.consume("KEYWORD", "jika"))
-        node.add_child(self.expression())
+        node.add_child((yield self.expression()))
         node.add_child(self.consume("KEYWORD", "maka"))
-        node.add_child(self.statement())
+        node.add_child((yield self.statement()))
 
         if (self.match("KEYWORD", "selain_itu")):
             node.add_child(self.consume("KEYWORD", "selain_itu"))
-            node.add_child(self.statement())
+            node.add_child((yield self.statement()))
 
         return node
 
     # while_statement -> KEYWORD(selama) + expression + KEYWORD(lakukan) + statement
     def while_statement(self):
-        node = ParseTree("<while-statement>")
+        node = self._node("<while-statement>")
 
         node.add_child(self.consume("KEYWORD", "selama"))
-        node.add_child(self.expression())
+        node.add_child((yield self.expression()))
         node.add_child(self.consume("KEYWORD", "lakukan"))
-        node.add_child(self.statement())
+        node.add_child((yield self.statement()))
 
         return node
     
     # for_statement -> KEYWORD(untuk) + IDENTIFIER + ASSIGN_OPERATOR(:=) + expression + (KEYWORD(ke) | KEYWORD(turun_ke)) + expression + KEYWORD(lakukan) + statement
     def for_statement(self):
-        node = ParseTree("<for-statement>")
+        node = self._node("<for-statement>")
 
         node.add_child(self.consume("KEYWORD", "untuk"))
         node.add_child(self.consume("IDENTIFIER"))
         node.add_child(self.consume("ASSIGN_OPERATOR", ":="))
-        node.add_child(self.expression())
+        node.add_child((yield self.expression()))
 
         if (self.match("KEYWORD", "ke")):
             node.add_child(self.consume("KEYWORD", "ke"))
         else:
             node.add_child(self.consume("KEYWORD", "turun_ke"))
 
-        node.add_child(self.expression())
+        node.add_child((yield self.expression()))
         node.add_child(self.consume("KEYWORD", "lakukan"))
-        node.add_child(self.statement())
+        node.add_child((yield self.statement()))
 
         return node
     
     # procedure_or_function_call -> IDENTIFIER + LPARENTHESIS + (parameter_list)? + RPARENTHESIS
     def procedure_or_function_call(self):
-        node = ParseTree("<procedure/function-call>")
+        node = self._node("<procedure/function-call>")
 
         node.add_child(self.consume("IDENTIFIER"))
         node.add_child(self.consume("LPARENTHESIS", "("))
 
         if (not self.match("RPARENTHESIS", ")")):
-            node.add_child(self.parameter_list())
+            node.add_child((yield self.parameter_list()))
 
         node.add_child(self.consume("RPARENTHESIS", ")"))
 
@@ -480,68 +873,68 @@ class Parser:
 
     # parameter_list -> (expression | string_literal | char_literal) + (COMMA + (expression | string_literal | char_literal))*
     def parameter_list(self):
-        node = ParseTree("<parameter-list>")
+        node = self._node("<parameter-list>")
 
         if self.match("STRING_LITERAL"):
             node.add_child(self.consume("STRING_LITERAL"))
         elif self.match("CHAR_LITERAL"):
             node.add_child(self.consume("CHAR_LITERAL"))
         else:
-            node.add_child(self.expression())
+            node.add_child((yield self.expression()))
 
         while self.match("COMMA", ","):
             node.add_child(self.consume("COMMA", ","))
-            node.add_child(self.expression())
+            node.add_child((yield self.expression()))
 
         return node
 
     # expression -> simple_expression + (relational_operator + simple_expression)?
     def expression(self):
-        node = ParseTree("<expression>")
+        node = self._node("<expression>", collapsible=True)
 
-        node.add_child(self.simple_expression())
+        node.add_child((yield self.simple_expression()))
 
         if self.match("RELATIONAL_OPERATOR"):
             node.add_child(self.relational_operator())
-            node.add_child(self.simple_expression())
+            node.add_child((yield self.simple_expression()))
 
-        return node
+        return self._collapse(node)
 
     # simple_expression -> (ARITHMETIC_OPERATOR(+ | -))? + term + (additive_operator + term)*
     def simple_expression(self):
-        node = ParseTree("<simple-expression>")
+        node = self._node("<simple-expression>", collapsible=True)
 
         if self.match("ARITHMETIC_OPERATOR", "+"):
             node.add_child(self.consume("ARITHMETIC_OPERATOR", "+"))
         elif self.match("ARITHMETIC_OPERATOR", "-"):
             node.add_child(self.consume("ARITHMETIC_OPERATOR", "-"))
             
-        node.add_child(self.term())
+        node.add_child((yield self.term()))
 
         while self.match("ARITHMETIC_OPERATOR", "+") or self.match("ARITHMETIC_OPERATOR", "-") or self.match("LOGICAL_OPERATOR", "atau"):
             node.add_child(self.additive_operator())
-            node.add_child(self.term())
+            node.add_child((yield self.term()))
 
-        return node
+        return self._collapse(node)
 
     # term -> factor + (multiplicative_operator + factor)*
     def term(self):
-        node = ParseTree("<term>")
+        node = self._node("<term>", collapsible=True)
 
-        node.add_child(self.factor())
+        node.add_child((yield self.factor()))
 
         while self.match("ARITHMETIC_OPERATOR", "*") or self.match("ARITHMETIC_OPERATOR", "/") or self.match("LOGICAL_OPERATOR", "dan") or self.match("ARITHMETIC_OPERATOR", "mod") or self.match("ARITHMETIC_OPERATOR", "bagi"):
             node.add_child(self.multiplicative_operator())
-            node.add_child(self.factor())
+            node.add_child((yield self.factor()))
 
-        return node
+        return self._collapse(node)
 
     # factor -> IDENTIFIER | NUMBER | CHAR_LITERAL | STRING_LITERAL | (LPARENTHESIS + expression + RPARENTHESIS) | LOGICAL_OPERATOR(tidak) + factor | function_call | KEYWORD(true | false)
     def factor(self):
-        node = ParseTree("<factor>")
+        node = self._node("<factor>", collapsible=True)
 
         if self.match("IDENTIFIER") and self.match_ahead("LPARENTHESIS", "("):
-            node.add_child(self.procedure_or_function_call())
+            node.add_child((yield self.procedure_or_function_call()))
         elif self.match("IDENTIFIER") and self.match_ahead("LBRACKET", "["):
             node.add_child(self.consume("IDENTIFIER"))
             node.add_child(self.array_bucket())
@@ -553,11 +946,11 @@ class Parser:
             node.add_child(self.consume("STRING_LITERAL"))
         elif self.match("LPARENTHESIS", "("):
             node.add_child(self.consume("LPARENTHESIS", "("))
-            node.add_child(self.expression())
+            node.add_child((yield self.expression()))
             node.add_child(self.consume("RPARENTHESIS", ")"))
         elif self.match("LOGICAL_OPERATOR", "tidak"):
             node.add_child(self.consume("LOGICAL_OPERATOR", "tidak"))
-            node.add_child(self.factor())
+            node.add_child((yield self.factor()))
         elif self.match("KEYWORD", "true"):
             node.add_child(self.consume("KEYWORD", "true"))
         elif self.match("KEYWORD", "false"):
@@ -565,11 +958,11 @@ class Parser:
         else:
             node.add_child(self.consume("NUMBER"))
 
-        return node
+        return self._collapse(node)
     
     # relational_operator -> RELATIONAL_OPERATOR(= | <> | < | <= | > | >=)
     def relational_operator(self):
-        node = ParseTree("<relational-operator>")
+        node = self._node("<relational-operator>")
 
         if self.match("RELATIONAL_OPERATOR", "="):
             node.add_child(self.consume("RELATIONAL_OPERATOR", "="))
@@ -593,7 +986,7 @@ class Parser:
 
     # additive_operator -> ARITHMETIC_OPERATOR(+ | -) | LOGICAL_OPERATOR(atau)
     def additive_operator(self):
-        node = ParseTree("<additive-operator>")
+        node = self._node("<additive-operator>")
 
         if self.match("ARITHMETIC_OPERATOR", "+"):
             node.add_child(self.consume("ARITHMETIC_OPERATOR", "+"))
@@ -608,7 +1001,7 @@ class Parser:
     
     # multiplicative_operator -> ARITHMETIC_OPERATOR(* | / | mod | bagi) | LOGICAL_OPERATOR(dan)
     def multiplicative_operator(self):
-        node = ParseTree("<multiplicative-operator>")
+        node = self._node("<multiplicative-operator>")
 
         if self.match("ARITHMETIC_OPERATOR", "*"):
             node.add_child(self.consume("ARITHMETIC_OPERATOR", "*"))
@@ -627,3 +1020,38 @@ class Parser:
 
         return node
 
+
+class LazyCompound(ParseTree):
+    # stub <compound_statement> dari Parser(lazy_bodies=True), di-parse pas children pertama kali dibaca
+    # catatan: SyntaxError di dalam body baru muncul saat itu (bukan pas Parser.parse)
+    def __init__(self, tokens: list[Token] | TokenBuffer, start: int, end: int, compact: bool = False):
+        self.value = "<compound_statement>"
+        self.tokens = tokens  # TokenBuffer seluruh file (pakai start/end) atau list token body doang
+        self.start = start
+        self.end = end
+        self.compact = compact
+        self._children = None
+        self.width = end - start
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = self.parse().children
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    def is_parsed(self) -> bool:
+        return self._children is not None
+
+    def get_pos(self):
+        # posisi node = token mulai, jadi gak perlu parse body
+        return self.tokens[self.start].get_pos()
+
+    def parse(self) -> ParseTree:
+        parser = Parser(self.tokens, compact=self.compact)
+        if isinstance(parser.stream, TokenCursor):
+            parser.stream.pos = self.start
+        return drive(parser.compound_statement())
@@ -1,32 +1,35 @@
 from src.lexer.token import Token
+from src.render import emit, tree_lines
 
 # kelas ParseTree merepresentasikan node dalam pohon parse
 class ParseTree: 
     def __init__(self, value, children=None):
         self.value = value # string or Token for leaves
         self.children = children if children is not None else []
-
-        self.line = None
-        self.col = None
-
-        if isinstance(value, Token):
-            self.line = value.line
-            self.col = value.col
-
-        # if no position yet, try to inherit from first child that has one
-        for child in self.children:
-            if isinstance(child, ParseTree) and child.line is not None:
-                if self.line is None:
-                    self.line = child.line
-                    self.col = child.col
-                    break
+        # jumlah token di subtree (leaf = 1), posisi token node = jumlah width sibling sebelumnya (dipakai Parser.reparse)
+        self.width = 1 if isinstance(value, Token) else sum(child.width for child in self.children)
+
+    # posisi node = posisi token pertama di subtree-nya, dihitung pas dibutuhkan aja
+    @property
+    def line(self):
+        return self.get_pos()[0]
+
+    @property
+    def col(self):
+        return self.get_pos()[1]
+
+    def get_pos(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node.value, Token):
+                return node.value.get_pos()
+            stack.extend(reversed(node.children))
+        return (None, None)
 
     def add_child(self, child):
         self.children.append(child)
-
-        if self.line is None and isinstance(child, ParseTree) and child.line is not None:
-            self.line = child.line
-            self.col = child.col
+        self.width += child.width
 
 
     def is_leaf(self):
@@ -36,25 +39,24 @@ class ParseTree:
         return f"ParseTree({self.value!r}, children={self.children!r}, pos={self.line}:{self.col})"
 
 
-    def pretty_print(self, prefix="", is_last=True):
+    def pretty_print(self, prefix="", is_last=True, out=None, max_depth=None, max_width=None):
         """
         prefix: indent sebelum node
         is_last: apakah node ini anak terakhir
+        out: render.Output tujuan (default langsung ke stdout), max_depth / max_width: potong tree (lihat render.py)
         """
 
-        branch = "└── " if is_last else "├── "
+        # baris dibuat render.tree_lines (stack sendiri, bukan rekursi) biar program yang nesting-nya dalam
+        # gak kena RecursionError, lalu ditulis ber-buffer
+        emit(tree_lines(self, node_label, node_children, prefix, is_last,
+                        max_depth=max_depth, max_width=max_width), out)
 
-        if isinstance(self.value, Token):
-            node_label = repr(self.value)
-        else:
-            node_label = str(self.value)
 
-        print(prefix + branch + node_label)
+def node_label(node) -> str:
+    if isinstance(node.value, Token):
+        return repr(node.value)
+    return str(node.value)
 
-        if is_last:
-            new_prefix = prefix + "    "
-        else:
-            new_prefix = prefix + "│   "
 
-        for i, child in enumerate(self.children):
-            child.pretty_print(new_prefix, i == len(self.children) - 1)
+def node_children(node) -> list:
+    return node.children
@@ -0,0 +1,201 @@
+"""
+Apa:
+- parser LL(1) berbasis tabel (grammar dari rules/grammar.json), alternatif dari Parser recursive descent
+
+Ngapain:
+- Grammar di-"bind" ke TokenBuffer: terminal dan key tabel diubah jadi int (kind id + string id buffer itu)
+- parsing pakai stack eksplisit (gak rekursif), isinya nonterminal, terminal, dan penanda END node
+- node dibuat pas nonterminal berlabel di-expand, ditempel ke parent pas END (jadi arena/compact Parser tetap jalan)
+- helper inline (label null) gak bikin node, anaknya langsung ke node di atasnya
+- error terminal pakai _unexpected Parser, jadi pesannya sama persis
+
+catatan:
+- input list/iterator Token dimasukin ke TokenBuffer pas token-nya dibutuhkan (token sekarang, token kedua cuma
+  kalau ada guard "ahead"), kind/value terminal grammar di-intern duluan biar hasil bind tetap valid walau buffer-nya nambah
+- jadi urutan error lexer vs parser di --stream sama dengan Parser
+"""
+
+from collections.abc import Iterable
+
+from src.lexer.charstream import CharStream
+from src.lexer.token import Token
+from src.lexer.token_buffer import NO_KIND, TokenBuffer
+from src.parser.arena import ArenaNode
+from src.parser.grammar import ANY, Grammar, terminal
+from src.parser.parser import Parser
+from src.parser.parsertree import ParseTree
+
+ANY_VALUE = -2  # terminal tanpa value (NO_KIND = value yang gak ada di buffer, gak pernah cocok)
+ANY_TOKEN = -2  # kind terminal / key tabel buat "*" (NO_KIND = kind yang gak ada di buffer)
+END = None      # penanda di stack: node paling atas sudah lengkap
+
+_default_grammar: Grammar | None = None
+
+
+def default_grammar() -> Grammar:
+    global _default_grammar
+    if _default_grammar is None:
+        _default_grammar = Grammar().load()
+    return _default_grammar
+
+
+class BoundGrammar:
+    # Grammar yang terminal-nya sudah diganti int milik satu TokenBuffer
+    # nonterminal = int >= 0, terminal = ~index di self.terminals (int negatif)
+    def __init__(self, grammar: Grammar, buf: TokenBuffer):
+        names = list(grammar.nonterminals)
+        nt_id = {name: i for i, name in enumerate(names)}
+        self.terminals: list[tuple] = []  # (kind id, value id, nama kind, value)
+        term_id: dict[str, int] = {}
+
+        def bind_terminal(spec: str) -> int:
+            if spec not in term_id:
+                kind, value = terminal(spec)
+                kind_id = ANY_TOKEN if spec == ANY else buf.kind_of(kind)
+                value_id = ANY_VALUE if value is None else buf.string_of(value)
+                term_id[spec] = ~len(self.terminals)
+                self.terminals.append((kind_id, value_id, kind, value))
+            return term_id[spec]
+
+        def bind_guard(guard):
+            if guard is None:
+                return None
+            kind, value = guard
+            return (buf.kind_of(kind), ANY_VALUE if value is None else buf.string_of(value))
+
+        self.start = nt_id[grammar.start]
+        self.labels: list[str | None] = []
+        self.collapse: list[bool] = []
+        self.alts: list[list[tuple]] = []     # per nonterminal: [(symbol di-reverse buat stack, error)]
+        self.rows: list[dict[int, list]] = []  # per nonterminal: key int -> [(guard, index alternatif)]
+        for name in names:
+            label, collapse, alts = grammar.nonterminals[name]
+            self.labels.append(label)
+            self.collapse.append(collapse)
+            bound_alts = []
+            for seq, _, error in alts:
+                symbols = [nt_id[s] if s in nt_id else bind_terminal(s) for s in seq]
+                bound_alts.append((symbols[::-1], error))
+            self.alts.append(bound_alts)
+
+            row = {}
+            for (kind, value), candidates in grammar.table[name].items():
+                key = self.key(buf, kind, value)
+                if key is not None:
+                    row[key] = [(bind_guard(guard), index) for guard, index in candidates]
+            self.rows.append(row)
+
+    @staticmethod
+    def key(buf: TokenBuffer, kind: str, value: str | None) -> int | None:
+        # (value id + 1) << 8 | kind id; wildcard value = kind id doang; "*" = ANY_TOKEN
+        if kind == ANY:
+            return ANY_TOKEN
+        kind_id = buf.kind_of(kind)
+        if kind_id == NO_KIND:
+            return None
+        if value is None:
+            return kind_id
+        value_id = buf.string_of(value)
+        if value_id == NO_KIND:
+            return None
+        return (value_id + 1) << 8 | kind_id
+
+
+class TableParser(Parser):
+    def __init__(self, tokens: Iterable[Token] | TokenBuffer, arena: bool = False, compact: bool = False,
+                 grammar: Grammar | None = None):
+        self.grammar = grammar if grammar is not None else default_grammar()
+        self.pending = None  # iterator Token yang belum masuk buffer
+        if not isinstance(tokens, TokenBuffer):
+            pending = iter(tokens)
+            first = next(pending, None)
+            tokens = TokenBuffer(first.source if first is not None else CharStream(""))
+            for kind, value in self.grammar.terminal_specs():
+                tokens.intern_kind(kind)
+                if value is not None:
+                    tokens.intern_string(value)
+            if first is not None:
+                tokens.append(first.type, first.start, first.end)
+                self.pending = pending
+        super().__init__(tokens, arena=arena, compact=compact)
+
+    def _fill(self, upto: int):
+        buf = self.tokens
+        while len(buf) < upto:
+            tok = next(self.pending, None)
+            if tok is None:
+                self.pending = None
+                break
+            buf.append(tok.type, tok.start, tok.end)
+
+    def parse(self) -> ParseTree | ArenaNode:
+        buf = self.tokens
+        table = BoundGrammar(self.grammar, buf)
+        kinds, value_ids = buf.kinds, buf.value_ids
+        cursor = self.stream
+        terminals, labels, collapse, alts, rows = table.terminals, table.labels, table.collapse, table.alts, table.rows
+
+        stack = [table.start]
+        parents = []
+        root = None
+        while stack:
+            symbol = stack.pop()
+            if symbol is not END and self.pending is not None:
+                self._fill(cursor.pos + 1)
+
+            if symbol is END:
+                node = parents.pop()
+                if collapse[stack.pop()]:
+                    node = self._collapse(node)
+                if parents:
+                    parents[-1].add_child(node)
+                else:
+                    root = node
+
+            elif symbol >= 0:
+                seq, error = alts[symbol][self._predict(rows[symbol], cursor.pos, len(alts[symbol]) - 1)]
+                if error is not None:
+                    self._error(error)
+                if labels[symbol] is not None:
+                    parents.append(self._node(labels[symbol], collapse[symbol]))
+                    stack.append(symbol)
+                    stack.append(END)
+                stack.extend(seq)
+
+            else:
+                kind, value, kind_name, value_text = terminals[~symbol]
+                i = cursor.pos
+                if i < len(kinds) and (kind == ANY_TOKEN or kinds[i] == kind) \
+                        and (value == ANY_VALUE or value_ids[i] == value):
+                    parents[-1].add_child(self._leaf(self.peek()))
+                    self.next_token()
+                else:
+                    self._unexpected(self.peek(), kind_name, value_text)
+
+        if self.arena is not None:
+            return self.arena.finish(root.id)
+        return root
+
+    def _predict(self, row: dict, i: int, fallback: int) -> int:
+        # index alternatif buat token ke-i; gak ada kandidat yang cocok -> alternatif terakhir
+        buf = self.tokens
+        kinds, value_ids = buf.kinds, buf.value_ids
+        if i >= len(kinds):
+            return fallback
+        kind = kinds[i]
+        candidates = row.get((value_ids[i] + 1) << 8 | kind) or row.get(kind) or row.get(ANY_TOKEN)
+        if candidates:
+            ahead = i + 1
+            for guard, index in candidates:
+                if guard is None:
+                    return index
+                if ahead >= len(kinds) and self.pending is not None:
+                    self._fill(ahead + 1)
+                if ahead < len(kinds) and kinds[ahead] == guard[0] \
+                        and (guard[1] == ANY_VALUE or value_ids[ahead] == guard[1]):
+                    return index
+        return fallback
+
+    def _error(self, message: str):
+        token = self.peek()
+        raise self._error_here(message.format(type=token.type if token else "EOF", value=token.value if token else ""))
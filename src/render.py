@@ -0,0 +1,125 @@
+"""
+Apa:
+- satu jalur output buat CLI: daftar token, parse tree (ParseTree / arena), tabel dan decorated AST
+
+Ngapain:
+- Output = writer ber-buffer: baris dikumpulin lalu ditulis per potongan (bukan print per baris),
+  max_lines = batas total baris, sisanya dibuang dan diganti satu baris keterangan
+- tree_lines = generator baris tree iteratif (stack sendiri), label dan anak node diambil lewat fungsi,
+  jadi ParseTree, ParseArena, dan AST pakai mesin yang sama; indent disimpan per level (path)
+- max_depth: anak node di kedalaman max_depth diganti satu baris "... (N children)"
+- max_width: anak ke-max_width dan seterusnya diganti satu baris "... (N more)"
+
+catatan:
+- tanpa batas apa-apa, teksnya sama persis dengan print per baris yang lama
+- baris digenerate lazy, jadi kalau Output sudah penuh, sisa tree gak dirender sama sekali
+"""
+
+import sys
+from collections.abc import Iterable, Iterator
+
+from src.lexer.token_buffer import TokenBuffer
+
+# (cabang anak biasa, cabang anak terakhir, indent di bawah anak biasa, indent di bawah anak terakhir)
+TREE_BRANCHES = ("├── ", "└── ", "│   ", "    ")
+AST_BRANCHES = ("├─ ", "└─ ", "│  ", "   ")
+
+
+class Output:
+    def __init__(self, stream=None, max_lines: int | None = None, chunk_chars: int = 1 << 16):
+        self.stream = stream if stream is not None else sys.stdout
+        self.max_lines = max_lines
+        self.chunk_chars = chunk_chars
+        self.lines = 0       # baris yang sudah diterima (termasuk yang masih di buffer)
+        self.dropped = False
+        self.pending: list[str] = []
+        self.pending_chars = 0
+
+    @property
+    def full(self) -> bool:
+        return self.max_lines is not None and self.lines >= self.max_lines
+
+    def line(self, text: str):
+        # text boleh berisi "\n" (mis. "\nbtab:"), tiap baris dihitung sendiri
+        count = text.count("\n") + 1
+        if self.max_lines is not None and self.lines + count > self.max_lines:
+            self.dropped = True
+            if self.full:
+                return
+            text = "\n".join(text.split("\n")[:self.max_lines - self.lines])
+            count = self.max_lines - self.lines
+        self.pending.append(text)
+        self.lines += count
+        self.pending_chars += len(text) + 1
+        if self.pending_chars >= self.chunk_chars:
+            self.flush()
+
+    def write_lines(self, lines: Iterable[str]):
+        for text in lines:
+            if self.full:
+                self.dropped = True
+                return
+            self.line(text)
+
+    def flush(self):
+        if self.pending:
+            self.stream.write("\n".join(self.pending) + "\n")
+            self.pending = []
+            self.pending_chars = 0
+        self.stream.flush()
+
+    def close(self):
+        if self.dropped:
+            self.pending.append(f"... (output truncated after {self.max_lines} lines)")
+            self.dropped = False
+        self.flush()
+
+
+def tree_lines(root, label, children, prefix: str = "", is_last: bool = True, branches=TREE_BRANCHES,
+               max_depth: int | None = None, max_width: int | None = None) -> Iterator[str]:
+    # label(node) -> str, children(node) -> list; root di kedalaman 0
+    middle, last, pipe, blank = branches
+    path = []
+    stack = [(root, 0, is_last, None)]   # (node, kedalaman, anak terakhir?, teks "..." kalau baris elisi)
+    while stack:
+        node, depth, is_last, elided = stack.pop()
+        del path[depth:]
+        text = elided if elided is not None else label(node)
+        yield prefix + "".join(path) + (last if is_last else middle) + text
+        if elided is not None:
+            continue
+        path.append(blank if is_last else pipe)
+
+        kids = children(node)
+        if not kids:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            stack.append((None, depth + 1, True, f"... ({len(kids)} children)"))
+            continue
+        shown = len(kids)
+        if max_width is not None and len(kids) > max_width:
+            shown = max_width
+            stack.append((None, depth + 1, True, f"... ({len(kids) - shown} more)"))
+        for i in range(shown - 1, -1, -1):
+            stack.append((kids[i], depth + 1, i == len(kids) - 1, None))
+
+
+def token_lines(tokens) -> Iterator[str]:
+    # sama dengan repr(tok) per token; TokenBuffer dibaca langsung dari kolomnya tanpa bikin Token
+    if isinstance(tokens, TokenBuffer):
+        for i in range(len(tokens)):
+            name, value = tokens.type(i), tokens.value(i)
+            yield f"{name}({value})" if value != "" else name
+    else:
+        for tok in tokens:
+            yield repr(tok)
+
+
+def emit(lines: Iterable[str], out: Output | None = None):
+    # tulis ke out, atau ke stdout (lewat Output sementara) kalau out None
+    if out is not None:
+        out.write_lines(lines)
+        return
+    out = Output()
+    out.write_lines(lines)
+    out.close()
@@ -1,127 +1,167 @@
 import re
+from src.parser.arena import ArenaNode, NodeKind
+from src.parser.arena_ast import ArenaAstBuilder
 from src.parser.parsertree import ParseTree
 from src.semantic.ast_nodes import *
 from src.errors import SemanticError
+from src.lexer.names import NO_NAME, NameTable
 from src.lexer.token import Token
+from src.render import AST_BRANCHES, Output, emit, tree_lines
+from src.semantic.symbol_table import ArrayTable, BlockTable, ObjKind, SymbolTable
+from src.trampoline import drive
+from src.semantic.type_rules import BINARY_TYPES, UNARY_TYPES, TypeCode, assignable, binary_type, unary_type
+
+# rantai node expression dari parser, urut dari luar ke dalam
+EXPRESSION_CHAIN = ("<expression>", "<simple-expression>", "<term>", "<factor>")
 
 class SemanticAnalyzer:
-    def __init__(self):
-        self.tab = []
-        self.btab = []
-        self.atab = [] # stores {xtyp, etyp, low, high, elsz, size}
+    def __init__(self, names: NameTable | None = None):
+        # identifiers are case-insensitive: scopes and tab key on case-folded ids from the lexer's NameTable;
+        # tokens and AST nodes carry their id, so lookup only hashes a name the lexer never saw. Pass the
+        # table of the source being analyzed (scanner.cm.names): ids from another table name other identifiers.
+        # Without one the analyzer starts its own, fine for trees whose nodes carry no ids (NO_NAME).
+        self.names = names if names is not None else NameTable()
+        # columnar tables; rows read like the old dicts (tab[i]["type"])
+        self.tab = SymbolTable(self.names)
+        self.btab = BlockTable()
+        self.atab = ArrayTable() # stores {xtyp, etyp, low, high, elsz, size}
         self.display = []
         self.level = 0
+        # hash index next to tab/btab/display: name ids declared per open scope (pushed/popped with self.level),
+        # name id -> tab indices of its visible declarations (innermost last), reserved name id -> slot
+        self.scopes: list[dict[int, int]] = []
+        self.visible: dict[int, list[int]] = {}
+        self.reserved: dict[int, int] = {}
+        self.declarations_only = False # set by analyze_declarations: statement bodies are not visited
+        # dispatch tables bound once: parse tree label / AST node class -> handler
+        self.declaration_visitors = dispatch_table(self, DECLARATION_VISITORS)
+        self.statement_visitors = dispatch_table(self, STATEMENT_VISITORS)
+        self.declaration_decorators = dispatch_table(self, DECLARATION_DECORATORS)
+        self.statement_decorators = dispatch_table(self, STATEMENT_DECORATORS)
+        self.expression_decorators = dispatch_table(self, EXPRESSION_DECORATORS)
+        self._var_group = (None, None) # (TypeSpec, resolved type) of the "a, b: T" group being declared
         self.types = {
-            "integer": 1,
-            "boolean": 2,
-            "char": 3,
-            "real": 4,
-            "string": 5,
-            "array": 6
+            "integer": TypeCode.INTEGER,
+            "boolean": TypeCode.BOOLEAN,
+            "char": TypeCode.CHAR,
+            "real": TypeCode.REAL,
+            "string": TypeCode.STRING,
+            "array": TypeCode.ARRAY
         }
         self.init_tables()
 
     def init_tables(self):
         # initialize reserved slots
         for i in range(29):
-            self.tab.append(None)
+            self.tab.append_empty()
         
         # standard types
-        self._set_reserved(1, "integer", "type", 1)
-        self._set_reserved(2, "boolean", "type", 2)
-        self._set_reserved(3, "char", "type", 3)
-        self._set_reserved(4, "real", "type", 4)
-        self._set_reserved(5, "string", "type", 5)
-        self._set_reserved(6, "array", "type", 6)  
+        self._set_reserved(1, "integer", "type", TypeCode.INTEGER)
+        self._set_reserved(2, "boolean", "type", TypeCode.BOOLEAN)
+        self._set_reserved(3, "char", "type", TypeCode.CHAR)
+        self._set_reserved(4, "real", "type", TypeCode.REAL)
+        self._set_reserved(5, "string", "type", TypeCode.STRING)
+        self._set_reserved(6, "array", "type", TypeCode.ARRAY)  
         
-        self._set_reserved(7, "false", "constant", 2, val=0)
-        self._set_reserved(8, "true", "constant", 2, val=1)
+        self._set_reserved(7, "false", "constant", TypeCode.BOOLEAN, val=0)
+        self._set_reserved(8, "true", "constant", TypeCode.BOOLEAN, val=1)
 
         std_funcs = [
-            (9, "abs", 0), (10, "sqr", 0), (11, "odd", 2), (12, "chr", 3), 
-            (13, "ord", 1), (14, "succ", 0), (15, "pred", 0), (16, "round", 1), 
-            (17, "trunc", 1), (18, "sin", 4), (19, "cos", 4), (20, "exp", 4), 
-            (21, "ln", 4), (22, "sqrt", 4), (23, "arctan", 4), (24, "eof", 2), 
-            (25, "eoln", 2)
+            (9, "abs", TypeCode.NONE), (10, "sqr", TypeCode.NONE), (11, "odd", TypeCode.BOOLEAN), (12, "chr", TypeCode.CHAR), 
+            (13, "ord", TypeCode.INTEGER), (14, "succ", TypeCode.NONE), (15, "pred", TypeCode.NONE), (16, "round", TypeCode.INTEGER), 
+            (17, "trunc", TypeCode.INTEGER), (18, "sin", TypeCode.REAL), (19, "cos", TypeCode.REAL), (20, "exp", TypeCode.REAL), 
+            (21, "ln", TypeCode.REAL), (22, "sqrt", TypeCode.REAL), (23, "arctan", TypeCode.REAL), (24, "eof", TypeCode.BOOLEAN), 
+            (25, "eoln", TypeCode.BOOLEAN)
         ]
 
         for idx, name, ret_type in std_funcs:
             self._set_reserved(idx, name, "function", ret_type)
         
         # standard procedures
-        self._set_reserved(26, "write", "procedure", 0)
-        self._set_reserved(27, "writeln", "procedure", 0)
-        self._set_reserved(28, "read", "procedure", 0)
+        self._set_reserved(26, "write", "procedure", TypeCode.NONE)
+        self._set_reserved(27, "writeln", "procedure", TypeCode.NONE)
+        self._set_reserved(28, "read", "procedure", TypeCode.NONE)
 
         # just to be safe
         if len(self.tab) < 30:
-             self.tab.append(None)
-             self.tab.append(None)
+             self.tab.append_empty()
+             self.tab.append_empty()
         
-        self._set_reserved(29, "readln", "procedure", 0)
+        self._set_reserved(29, "readln", "procedure", TypeCode.NONE)
+
+        # lookup only falls back to slots 1-28 (readln in slot 29 is not found there)
+        for i in range(1, 29):
+            if self.tab[i] and self.tab.name_id(i) not in self.reserved:
+                self.reserved[self.tab.name_id(i)] = i
 
          # global block
-        self.btab.append({"last": 0, "lpar": 0, "psze": 0, "vsze": 0})
+        self.btab.append(last=0, lpar=0, psze=0, vsze=0)
         self.display.append(0) 
+        self.scopes.append({})
 
     def _set_reserved(self, index, name, obj_type, type_code, val=0):
-        while len(self.tab) <= index:
-            self.tab.append(None)
-            
-        self.tab[index] = {
-            "id": name, "obj": obj_type, "type": type_code, 
-            "ref": 0, "nrm": 1, "lev": 0, "adr": val, "link": 0
-        }
+        self.tab.set(index, id=name, obj=obj_type, type=type_code,
+                     ref=0, nrm=1, lev=0, adr=val, link=0)
 
-    def add_to_tab(self, name, obj_type, type_code, line=0, col=0, ref=0, val=0):
+    def add_to_tab(self, name, obj_type, type_code, line=0, col=0, ref=0, val=0, name_id=NO_NAME):
         current_block_idx = self.display[self.level]
-        last_idx = self.btab[current_block_idx]["last"]
-        
-        # duplicate check
-        curr = last_idx
-        while curr > 0:
-            if self.tab[curr]["id"] == name:
-                 raise SemanticError(f"Duplicate identifier '{name}' in current scope.", line, col)
-            curr = self.tab[curr]["link"]
-
-        new_entry = {
-            "id": name,
-            "obj": obj_type,
-            "type": type_code,
-            "ref": ref,
-            "nrm": 1,
-            "lev": self.level,
-            "adr": val,
-            "link": last_idx
-        }
+        last_idx = self.btab.get(current_block_idx, "last")
         
-        self.tab.append(new_entry)
-        new_index = len(self.tab) - 1
-        self.btab[current_block_idx]["last"] = new_index
+        # duplicate check (scope index holds exactly the names on the block's link chain)
+        if name_id == NO_NAME:
+            name_id = self.names.intern(name)
+        scope = self.scopes[self.level]
+        if name_id in scope:
+            raise SemanticError(f"Duplicate identifier '{name}' in current scope.", line, col)
+
+        new_index = self.tab.append(
+            obj=obj_type,
+            type=type_code,
+            ref=ref,
+            nrm=1,
+            lev=self.level,
+            adr=val,
+            link=last_idx
+        )
+        self.tab.put_name(new_index, name_id, name)
+        self.btab.put(current_block_idx, "last", new_index)
+        scope[name_id] = new_index
+        self.visible.setdefault(name_id, []).append(new_index)
         
         if obj_type == "variable":
-            self.btab[current_block_idx]["vsze"] += 1
+            self.btab.put(current_block_idx, "vsze", self.btab.get(current_block_idx, "vsze") + 1)
             
         return new_index
 
-    def lookup(self, name, line=0, col=0):
-        current_lev = self.level
-        
-        # search dynamic scopes
-        while current_lev >= 0:
-            block_idx = self.display[current_lev]
-            curr = self.btab[block_idx]["last"]
-            while curr > 0:
-                entry = self.tab[curr]
-                if entry and entry["id"] == name:
-                    return curr, entry
-                curr = entry["link"]
-            current_lev -= 1
-            
-        # search reserved
-        for i in range(1, 29):
-            if self.tab[i] and self.tab[i]["id"] == name:
-                return i, self.tab[i]
+    def _enter_scope(self):
+        self.level += 1
+        self.btab.append(last=0, lpar=0, psze=0, vsze=0)
+        self.display.append(len(self.btab) - 1)
+        self.scopes.append({})
+
+    def _leave_scope(self):
+        self.display.pop()
+        self.level -= 1
+        for name_id in self.scopes.pop():
+            shadowed = self.visible[name_id]
+            shadowed.pop()
+            if not shadowed:
+                del self.visible[name_id]
+
+    def lookup(self, name, line=0, col=0, name_id=NO_NAME) -> int:
+        # tab index of the declaration name resolves to; read its fields with tab.type_of() etc. (tab[i] for a row view)
+        if name_id == NO_NAME:
+            name_id = self.names.find(name)
+        if name_id != NO_NAME:
+            # innermost visible declaration (same result as walking display[level..0] link chains)
+            found = self.visible.get(name_id)
+            if found:
+                return found[-1]
+
+            # search reserved
+            i = self.reserved.get(name_id)
+            if i is not None:
+                return i
         
         raise SemanticError(f"Identifier '{name}' undeclared.", line, col)
 
@@ -136,6 +176,21 @@ class SemanticAnalyzer:
             return val
         return str(val)
 
+    def _get_name(self, node: ParseTree):
+        # identifier leaf: (spelling, name id carried by its token), NO_NAME when there's no token behind it
+        val = node.value
+        if isinstance(val, Token):
+            return val.value, val.name_id
+        return self._get_val(node), NO_NAME
+
+    def _bucket_leaf(self, node: ParseTree):
+        # array bucket content as the raw leaf AstParser.array_bucket builds: VarNode (identifier) or NumberNode (text)
+        val, name_id = self._get_name(node)
+        line, col = self._get_pos(node)
+        if name_id != NO_NAME or val[:1].isalpha():
+            return VarNode(val, line, col, name_id)
+        return NumberNode(val, line, col)
+
     def _get_pos(self, node: ParseTree):
         if hasattr(node, 'line') and node.line is not None:
             return node.line, node.col
@@ -144,17 +199,14 @@ class SemanticAnalyzer:
     def _extract_simple_int(self, expr_node):
         # heuristic to extract int from expression tree
         # Tree: <expression> -> <simple> -> <term> -> <factor> -> NUMBER
+        # di compact tree sebagian level bisa hilang (collapsed), level itu dilewati aja
         try:
-            # expr -> simple
-            simple = expr_node.children[0]
-            # simple -> term
-            term = simple.children[0]
-            # term -> factor
-            factor = term.children[0]
-            # factor -> NUMBER(5) or similar
-            # The value is inside the CHILD of factor, not factor itself
-            number_node = factor.children[0]
-            val = self._get_val(number_node)
+            node = expr_node
+            for label in EXPRESSION_CHAIN:
+                if self._get_val(node) == label:
+                    # The value is inside the CHILD of factor, not factor itself
+                    node = node.children[0]
+            val = self._get_val(node)
             return int(val)
         except:
             return 0
@@ -166,7 +218,6 @@ class SemanticAnalyzer:
         # get element type
         inner_type = type_node.children[0]
         type_name = self._get_val(inner_type)
-        etyp_code = self.types.get(type_name.lower(), 0)
         
         # simplified bounds extraction
         range_node = node.children[2]
@@ -181,63 +232,79 @@ class SemanticAnalyzer:
         except:
             pass 
             
-        entry = {
-            "xtyp": 1, # index type integer
-            "etyp": etyp_code,
-            "low": low,
-            "high": high,
-            "elsz": 1,
-            "size": (high - low + 1)
-        }
-        
-        self.atab.append(entry)
-        return len(self.atab) - 1
+        return self._add_array(type_name, low, high)
+
+    def _add_array(self, type_name, low, high):
+        etyp_code = self.types.get(type_name.lower(), TypeCode.NONE)
+        return self.atab.append(
+            xtyp=1, # index type integer
+            etyp=etyp_code,
+            low=low,
+            high=high,
+            elsz=1,
+            size=(high - low + 1)
+        )
+
+    def _run(self, visitor):
+        # statement/expression visitors are generators: `result = yield child_visitor` visits a child,
+        # drive() runs them with an explicit stack
+        return drive(visitor)
 
     # visitors
 
-    def analyze(self, parse_tree: ParseTree):
+    def analyze(self, parse_tree: ParseTree | ArenaNode):
+        if isinstance(parse_tree, ArenaNode):
+            # arena trees are lowered to the AstParser AST by an id walk over the arena columns
+            # (no ArenaNode views), then decorated like analyze_ast
+            if parse_tree.arena.kind[parse_tree.id] != NodeKind.PROGRAM:
+                raise SemanticError("Invalid Root Node", 0, 0)
+            builder = ArenaAstBuilder(parse_tree.arena, bodies=not self.declarations_only)
+            return self.analyze_ast(builder.build(parse_tree.id))
         if parse_tree.value == "<program>":
             return self.tab, self.btab, self.atab, self.visit_program(parse_tree)
         raise SemanticError("Invalid Root Node", 0, 0)
 
+    def analyze_declarations(self, parse_tree: ParseTree):
+        # symbol tables only: same tab/btab/atab as analyze() (statements never declare anything),
+        # but subprogram bodies stay untouched, so lazy bodies from Parser(lazy_bodies=True) are never parsed
+        self.declarations_only = True
+        return self.analyze(parse_tree)
+
+    def _visit_body(self, node: ParseTree):
+        if self.declarations_only:
+            line, col = self._get_pos(node)
+            return BlockNode([], line, col)
+        return self._run(self.visit_compound_statement(node))
+
     def visit_program(self, node: ParseTree):
         header_node = node.children[0]
         decl_node = node.children[1]
         compound_node = node.children[2]
         
         id_node = header_node.children[1]
-        prog_name = self._get_val(id_node)
+        prog_name, prog_id = self._get_name(id_node)
         line, col = self._get_pos(id_node)
         
-        self.add_to_tab(prog_name, "program", 0, line, col)
+        self.add_to_tab(prog_name, "program", TypeCode.NONE, line, col, name_id=prog_id)
 
         declarations = self.visit_declarations(decl_node)
 
-        self.level += 1
-        self.btab.append({"last": 0, "lpar": 0, "psze": 0, "vsze": 0})
-        self.display.append(len(self.btab) - 1)
+        self._enter_scope()
         
-        main_block_ast = self.visit_compound_statement(compound_node)
+        main_block_ast = self._visit_body(compound_node)
         main_block_ast.block_index = self.display[self.level]
         
-        self.display.pop()
-        self.level -= 1
+        self._leave_scope()
         
-        return ProgramNode(prog_name, declarations, main_block_ast, line, col)
+        return ProgramNode(prog_name, declarations, main_block_ast, line, col, prog_id)
 
     def visit_declarations(self, node: ParseTree):
         decls = []
+        visitors = self.declaration_visitors
         for child in node.children:
-            val = self._get_val(child)
-            if val == "<var_declaration>":
-                decls.extend(self.visit_var_declaration(child))
-            elif val == "<const_declaration>":
-                decls.extend(self.visit_const_declaration(child))
-            elif val == "<type_declaration>":
-                decls.extend(self.visit_type_declaration(child))
-            elif val == "<subprogram_declaration>":
-                res = self.visit_subprogram_declaration(child)
-                if res: decls.append(res)
+            visit = visitors.get(self._get_val(child))
+            if visit is not None:
+                decls.extend(visit(child))
         return decls
 
     def visit_const_declaration(self, node: ParseTree):
@@ -247,39 +314,46 @@ class SemanticAnalyzer:
             id_node = node.children[i]
             val_node = node.children[i+2]
             
-            name = self._get_val(id_node)
+            name, name_id = self._get_name(id_node)
             line, col = self._get_pos(id_node)
             
             val_token = self._get_val(val_node)
-            const_type = 0
-            stored_val = 0
-            
-            # infer type
-            if "NUMBER" in str(val_node.value) or val_token.replace('.','',1).isdigit():
-                if '.' in val_token:
-                    const_type = 4 
-                    stored_val = float(val_token)
-                else:
-                    const_type = 1 
-                    stored_val = int(val_token)
-            elif "STRING" in str(val_node.value) or val_token.startswith("'"):
-                content = val_token.strip("'")
-                if len(content) == 1:
-                    const_type = 3 
-                    stored_val = ord(content)
-                else:
-                    const_type = 5 
-                    stored_val = 0
-            elif "CHAR" in str(val_node.value):
-                const_type = 3
-                stored_val = ord(val_token.strip("'")[0])
-            
-            self.add_to_tab(name, "constant", const_type, line, col, val=stored_val)
-            generated.append(ConstDeclNode(name, val_token, const_type, line, col))
+            decl = ConstDeclNode(name, val_token, None, line, col, name_id)
+            generated.append(self._declare_constant(decl, str(val_node.value)))
             i += 4
             
         return generated
 
+    def _declare_constant(self, decl: ConstDeclNode, val_repr):
+        # decl.value = text of the value token, val_repr = str() of that token, e.g. "NUMBER(5)"
+        val_token = decl.value
+        const_type = TypeCode.NONE
+        stored_val = 0
+        
+        # infer type
+        if "NUMBER" in val_repr or val_token.replace('.','',1).isdigit():
+            if '.' in val_token:
+                const_type = TypeCode.REAL 
+                stored_val = float(val_token)
+            else:
+                const_type = TypeCode.INTEGER 
+                stored_val = int(val_token)
+        elif "STRING" in val_repr or val_token.startswith("'"):
+            content = val_token.strip("'")
+            if len(content) == 1:
+                const_type = TypeCode.CHAR 
+                stored_val = ord(content)
+            else:
+                const_type = TypeCode.STRING 
+                stored_val = 0
+        elif "CHAR" in val_repr:
+            const_type = TypeCode.CHAR
+            stored_val = ord(val_token.strip("'")[0])
+        
+        self.add_to_tab(decl.name, "constant", const_type, decl.line, decl.col, val=stored_val, name_id=decl.name_id)
+        decl.const_type = const_type
+        return decl
+
     def visit_type_declaration(self, node: ParseTree):
         generated = []
         i = 1
@@ -287,13 +361,13 @@ class SemanticAnalyzer:
             id_node = node.children[i]
             def_node = node.children[i+2]
             
-            name = self._get_val(id_node)
+            name, name_id = self._get_name(id_node)
             line, col = self._get_pos(id_node)
             
             type_node = def_node.children[0]
             type_node_val = self._get_val(type_node)
             
-            resolved_type_code = 0
+            resolved_type_code = TypeCode.NONE
             ref_idx = 0
             
             if type_node_val == "<type>":
@@ -301,16 +375,16 @@ class SemanticAnalyzer:
                 inner_val = self._get_val(inner)
                 
                 if inner_val == "<array_type>":
-                    resolved_type_code = 6 
+                    resolved_type_code = TypeCode.ARRAY 
                     ref_idx = self._process_array_type(inner)
                 else:
-                    resolved_type_code = self.types.get(inner_val.lower(), 0)
+                    resolved_type_code = self.types.get(inner_val.lower(), TypeCode.NONE)
             
             elif type_node_val == "<record_type>":
                 pass 
 
-            self.add_to_tab(name, "type", resolved_type_code, line, col, ref=ref_idx)
-            generated.append(TypeDeclNode(name, "alias", line, col))
+            self.add_to_tab(name, "type", resolved_type_code, line, col, ref=ref_idx, name_id=name_id)
+            generated.append(TypeDeclNode(name, "alias", line, col, name_id))
             
             i += 4
         return generated
@@ -323,50 +397,57 @@ class SemanticAnalyzer:
             type_node = node.children[i+2]
             
             type_child = type_node.children[0]
-            type_code = 0
+            type_code = TypeCode.NONE
             ref_idx = 0
             type_name = "unknown"
             type_val = self._get_val(type_child)
             
             if type_val == "<array_type>":
                 type_name = "array" 
-                type_code = 6 
+                type_code = TypeCode.ARRAY 
                 ref_idx = self._process_array_type(type_child)
             else:
                 type_name = type_val
-                type_code = self.types.get(type_name.lower(), 0)
-                if type_code == 0:
-                     try:
-                        _, info = self.lookup(type_name)
-                        if info['obj'] == 'type':
-                            type_code = info['type']
-                            ref_idx = info['ref'] 
-                        else:
-                             line, col = self._get_pos(type_child)
-                             raise SemanticError(f"'{type_name}' is not a type.", line, col)
-                     except SemanticError:
-                         line, col = self._get_pos(type_child)
-                         raise SemanticError(f"Error: Unknown type '{type_name}'", line, col)
+                type_code, ref_idx = self._resolve_type_name(type_name, *self._get_pos(type_child))
             
             idents_info = self.visit_identifier_list(ident_list_node)
-            for name, line, col in idents_info:
-                idx = self.add_to_tab(name, "variable", type_code, line, col, ref=ref_idx)
-                var_node = VarDeclNode(name, type_name, line, col)
-                var_node.tab_index = idx
-                var_node.scope_level = self.level
-                generated_nodes.append(var_node)
+            for name, line, col, name_id in idents_info:
+                var_node = VarDeclNode(name, type_name, line, col, name_id)
+                generated_nodes.append(self._declare_variable(var_node, type_code, ref_idx))
             i += 4 
         return generated_nodes
 
+    def _resolve_type_name(self, type_name, type_line, type_col):
+        type_code = self.types.get(type_name.lower(), TypeCode.NONE)
+        ref_idx = 0
+        if type_code == TypeCode.NONE:
+             try:
+                idx = self.lookup(type_name)
+                if self.tab.obj_of(idx) == ObjKind.TYPE:
+                    type_code = self.tab.type_of(idx)
+                    ref_idx = self.tab.ref_of(idx)
+                else:
+                     raise SemanticError(f"'{type_name}' is not a type.", type_line, type_col)
+             except SemanticError:
+                 raise SemanticError(f"Error: Unknown type '{type_name}'", type_line, type_col)
+        return type_code, ref_idx
+
+    def _declare_variable(self, var_node: VarDeclNode, type_code, ref_idx):
+        var_node.tab_index = self.add_to_tab(var_node.name, "variable", type_code, var_node.line, var_node.col,
+                                             ref=ref_idx, name_id=var_node.name_id)
+        var_node.scope_level = self.level
+        return var_node
+
     def visit_subprogram_declaration(self, node: ParseTree):
+        # a list, like the other declaration visitors
         child = node.children[0]
         val = self._get_val(child)
         
         if val == "<procedure_declaration>":
-             return self.visit_procedure_decl(child)
+             return [self.visit_procedure_decl(child)]
         elif val == "<function_declaration>":
-             return self.visit_function_decl(child)
-        return None
+             return [self.visit_function_decl(child)]
+        return []
 
     def visit_formal_parameter_list(self, node: ParseTree):
         params = []
@@ -381,35 +462,35 @@ class SemanticAnalyzer:
         
         type_child = type_node.children[0]
         type_val = self._get_val(type_child)
-        type_code = self.types.get(type_val.lower(), 0)
-        
-        if type_code == 0:
-             line, col = self._get_pos(type_child)
-             raise SemanticError(f"Unknown type '{type_val}' in parameter list", line, col)
+        type_code = self._param_type(type_val, *self._get_pos(type_child))
 
         ids = self.visit_identifier_list(id_list_node)
-        generated = []
+        return [self._declare_param(VarDeclNode(name, type_val, line, col, name_id), type_code)
+                for name, line, col, name_id in ids]
+
+    def _param_type(self, type_val, type_line, type_col):
+        type_code = self.types.get(type_val.lower(), TypeCode.NONE)
         
-        for name, line, col in ids:
-            # add params as vars to current scope
-            self.add_to_tab(name, "variable", type_code, line, col)
-            current_block_idx = self.display[self.level]
-            self.btab[current_block_idx]["psze"] += 1 
-            generated.append(VarDeclNode(name, type_val, line, col))
-            
-        return generated
+        if type_code == TypeCode.NONE:
+             raise SemanticError(f"Unknown type '{type_val}' in parameter list", type_line, type_col)
+        return type_code
+
+    def _declare_param(self, param: VarDeclNode, type_code):
+        # add params as vars to current scope
+        self.add_to_tab(param.name, "variable", type_code, param.line, param.col, name_id=param.name_id)
+        current_block_idx = self.display[self.level]
+        self.btab.put(current_block_idx, "psze", self.btab.get(current_block_idx, "psze") + 1)
+        return param
 
     def visit_procedure_decl(self, node: ParseTree):
         id_node = node.children[1]
-        name = self._get_val(id_node)
+        name, name_id = self._get_name(id_node)
         line, col = self._get_pos(id_node)
         
-        self.add_to_tab(name, "procedure", 0, line, col)
+        self.add_to_tab(name, "procedure", TypeCode.NONE, line, col, name_id=name_id)
         
         # enter scope
-        self.level += 1
-        self.btab.append({"last": 0, "lpar": 0, "psze": 0, "vsze": 0})
-        self.display.append(len(self.btab) - 1)
+        self._enter_scope()
         
         params = []
         possible_params = node.children[2]
@@ -426,16 +507,15 @@ class SemanticAnalyzer:
         else:
             body_node = block_node.children[0]
             
-        body_ast = self.visit_compound_statement(body_node)
+        body_ast = self._visit_body(body_node)
         
-        self.display.pop()
-        self.level -= 1
+        self._leave_scope()
         
-        return ProcedureDeclNode(name, params, body_ast, line, col)
+        return ProcedureDeclNode(name, params, body_ast, line, col, name_id)
 
     def visit_function_decl(self, node: ParseTree):
         id_node = node.children[1]
-        name = self._get_val(id_node)
+        name, name_id = self._get_name(id_node)
         line, col = self._get_pos(id_node)
         
         has_params = (self._get_val(node.children[2]) == "<formal_parameter_list>")
@@ -445,14 +525,12 @@ class SemanticAnalyzer:
         type_node = node.children[type_node_idx] 
         type_keyword = type_node.children[0]
         type_name = self._get_val(type_keyword)
-        ret_type_code = self.types.get(type_name.lower(), 0)
+        ret_type_code = self.types.get(type_name.lower(), TypeCode.NONE)
         
-        self.add_to_tab(name, "function", ret_type_code, line, col)
+        self.add_to_tab(name, "function", ret_type_code, line, col, name_id=name_id)
         
         # enter scope
-        self.level += 1
-        self.btab.append({"last": 0, "lpar": 0, "psze": 0, "vsze": 0})
-        self.display.append(len(self.btab) - 1)
+        self._enter_scope()
         
         params = []
         if has_params:
@@ -465,26 +543,25 @@ class SemanticAnalyzer:
         else:
             body_node = block_node.children[0]
             
-        body_ast = self.visit_compound_statement(body_node)
+        body_ast = self._visit_body(body_node)
         
-        self.display.pop()
-        self.level -= 1
+        self._leave_scope()
         
-        return FunctionDeclNode(name, params, type_name, body_ast, line, col)
+        return FunctionDeclNode(name, params, type_name, body_ast, line, col, name_id)
 
     def visit_identifier_list(self, node: ParseTree):
         infos = []
         for child in node.children:
-            val = self._get_val(child)
+            val, name_id = self._get_name(child)
             if val != "," and val != "<identifier_list>": 
                  line, col = self._get_pos(child)
-                 infos.append((val, line, col))
+                 infos.append((val, line, col, name_id))
         return infos
 
     def visit_compound_statement(self, node: ParseTree):
         stmt_list_node = node.children[1]
         line, col = self._get_pos(node)
-        stmts = self.visit_statement_list(stmt_list_node)
+        stmts = yield self.visit_statement_list(stmt_list_node)
         return BlockNode(stmts, line, col)
 
     def visit_statement_list(self, node: ParseTree):
@@ -492,93 +569,150 @@ class SemanticAnalyzer:
         for child in node.children:
             val = self._get_val(child)
             if val == "<statement>":
-                res = self.visit_statement(child)
+                res = yield self.visit_statement(child)
                 if res: stmts.append(res)
         return stmts
 
     def visit_statement(self, node: ParseTree):
         child = node.children[0]
-        val = self._get_val(child)
-        if val == "<assignment-statement>": return self.visit_assignment(child)
-        elif val == "<procedure/function-call>": return self.visit_proc_call(child)
-        elif val == "<compound_statement>": return self.visit_compound_statement(child)
-        elif val == "<if-statement>": return self.visit_if(child)
-        elif val == "<while-statement>": return self.visit_while(child)
-        elif val == "<for-statement>": return self.visit_for(child)
-        return None
+        visit = self.statement_visitors.get(self._get_val(child))
+        if visit is None:
+            return None
+        return (yield visit(child))
 
     def visit_assignment(self, node: ParseTree):
         id_node = node.children[0]
-        target_name = self._get_val(id_node)
+        target_name, target_id = self._get_name(id_node)
         line, col = self._get_pos(id_node)
         
         has_bucket = (len(node.children) > 1 and self._get_val(node.children[1]) == "<array-bucket>")
         assign_op_idx = 2 if has_bucket else 1
         expr_idx = assign_op_idx + 1
         
-        idx, info = self.lookup(target_name, line, col)
-        target_type = info['type']
-        
         if has_bucket:
-             bucket_node = node.children[1]
-             content_node = bucket_node.children[1] 
-             
-             idx_val = self._get_val(content_node)
-             idx_line, idx_col = self._get_pos(content_node)
-             
-             if idx_val.replace('.', '', 1).isdigit():
-                 idx_expr = NumberNode(int(idx_val), idx_line, idx_col)
-                 idx_expr.type = 1
-             elif idx_val[0].isalpha():
-                 idx_expr = VarNode(idx_val, idx_line, idx_col)
-                 i_idx, i_info = self.lookup(idx_val, idx_line, idx_col)
-                 idx_expr.tab_index = i_idx
-                 idx_expr.type = i_info['type']
-             else:
-                 idx_expr = NumberNode(0, idx_line, idx_col) # simplified fallback
+             target = ArrayAccessNode(target_name, self._bucket_leaf(node.children[1].children[1]), line, col, target_id)
+        else:
+             target = VarNode(target_name, line, col, target_id)
+
+        target_node = self._resolve_target(target)
+        expr_node = yield self.visit_operand(node.children[expr_idx])
+        return self._check_assignment(AssignNode(target_node, expr_node, line, col))
+
+    def _resolve_target(self, target):
+        # assignment target: VarNode, or ArrayAccessNode still holding the raw bucket leaf as index_expr
+        idx = self.lookup(target.name, target.line, target.col, target.name_id)
+        target_type = self.tab.type_of(idx)
+        
+        if isinstance(target, ArrayAccessNode):
+             target.index_expr = self._target_index(target.index_expr)
 
              # check element type from atab if array
-             if info['type'] == 6: 
-                 atab_idx = info['ref']
+             if target_type == TypeCode.ARRAY: 
+                 atab_idx = self.tab.ref_of(idx)
                  if 0 <= atab_idx < len(self.atab):
-                     target_type = self.atab[atab_idx]['etyp']
+                     target_type = self.atab.get(atab_idx, 'etyp')
                  else:
-                     raise SemanticError("Invalid array reference in symbol table", line, col)
+                     raise SemanticError("Invalid array reference in symbol table", target.line, target.col)
              else:
-                 raise SemanticError(f"Variable '{target_name}' is not an array.", line, col)
+                 raise SemanticError(f"Variable '{target.name}' is not an array.", target.line, target.col)
+
+        target.tab_index = idx
+        target.type = target_type
+        return target
+
+    def _target_index(self, leaf):
+        text = self._raw_text(leaf)
+        if text.replace('.', '', 1).isdigit():
+            return self._int_index(leaf, text)
+        elif text[0].isalpha():
+            return self._index_variable(leaf, text)
+        return NumberNode(0, leaf.line, leaf.col) # simplified fallback
+
+    def _access_index(self, leaf):
+        text = self._raw_text(leaf)
+        if text.replace('.', '', 1).isdigit():
+            return self._int_index(leaf, text)
+        return self._index_variable(leaf, text)
+
+    def _int_index(self, leaf, text):
+        if type(leaf) is not NumberNode:
+            leaf = NumberNode(text, leaf.line, leaf.col)
+        leaf.value = int(text)
+        leaf.type = TypeCode.INTEGER
+        return leaf
+
+    def _index_variable(self, leaf, text):
+        if type(leaf) is not VarNode:
+            leaf = VarNode(text, leaf.line, leaf.col)
+        leaf.tab_index = self.lookup(text, leaf.line, leaf.col, leaf.name_id)
+        leaf.type = self.tab.type_of(leaf.tab_index)
+        return leaf
+
+    def _raw_text(self, leaf):
+        # array bucket content: VarNode(identifier) or NumberNode(token text)
+        return leaf.name if isinstance(leaf, VarNode) else leaf.value
+
+    def _check_assignment(self, node: AssignNode):
+        target, value = node.target, node.value
+        if self.tab.obj_of(target.tab_index) == ObjKind.CONSTANT:
+            raise SemanticError(f"Cannot assign to constant '{target.name}'", node.line, node.col)
+
+        if not assignable(target.type, value.type):
+            raise SemanticError(f"Type Mismatch: Cannot assign type {value.type} to variable '{target.name}' of type {target.type}", node.line, node.col)
 
-             target_node = ArrayAccessNode(target_name, idx_expr, line, col)
-             target_node.tab_index = idx
-             target_node.type = target_type 
-        else:
-             target_node = VarNode(target_name, line, col)
-             target_node.tab_index = idx
-             target_node.type = info['type']
-
-        expr_node = self.visit_expression(node.children[expr_idx])
-        
-        if info['obj'] == 'constant':
-            raise SemanticError(f"Cannot assign to constant '{target_name}'", line, col)
-
-        if target_node.type != expr_node.type:
-             if not (target_node.type == 4 and expr_node.type == 1):
-                 raise SemanticError(f"Type Mismatch: Cannot assign type {expr_node.type} to variable '{target_name}' of type {target_node.type}", line, col)
+        return node
 
-        return AssignNode(target_node, expr_node, line, col)
+    def visit_operand(self, node: ParseTree):
+        # operand expression bisa node mana aja di EXPRESSION_CHAIN, atau langsung isi <factor> kalau tree-nya compact
+        val = self._get_val(node)
+        if val == "<expression>": return (yield self.visit_expression(node))
+        elif val == "<simple-expression>": return (yield self.visit_simple_expression(node))
+        elif val == "<term>": return (yield self.visit_term(node))
+        elif val == "<factor>": return (yield self.visit_factor(node))
+        return (yield self._visit_factor_children([node]))
+
+    def _is_collapsed_operand(self, node: ParseTree, index: int):
+        # anak <parameter-list> selain COMMA dan literal pertama (yang di-consume langsung) = expression yang collapsed
+        if isinstance(node.value, Token):
+            if node.value.type == "COMMA":
+                return False
+            return not (index == 0 and node.value.type in ("STRING_LITERAL", "CHAR_LITERAL"))
+        return node.value != "<expression>"
 
     def visit_expression(self, node: ParseTree):
-        left = self.visit_simple_expression(node.children[0])
+        left = yield self.visit_operand(node.children[0])
         if len(node.children) > 1:
             rel_node = node.children[1]
             op_node = rel_node.children[0]
             op = self._get_val(op_node)
             line, col = self._get_pos(op_node)
-            right = self.visit_simple_expression(node.children[2])
-            bin_node = BinOpNode(op, left, right, line, col)
-            bin_node.type = 2 
-            return bin_node
+            right = yield self.visit_operand(node.children[2])
+            return self._binary(op, left, right, line, col)
         return left
 
+    def _binary(self, op, left, right, line, col):
+        return self._type_binary(BinOpNode(op, left, right, line, col))
+
+    def _type_binary(self, bin_node: BinOpNode):
+        # result type / error for every binary operator: one lookup in the precomputed (op, left, right) table
+        key = (bin_node.operator, bin_node.left.type, bin_node.right.type)
+        result, error = BINARY_TYPES.get(key) or binary_type(*key)
+        if error is not None:
+            raise SemanticError(error.format(op=bin_node.op), bin_node.line, bin_node.col)
+        bin_node.type = result
+        return bin_node
+
+    def _unary(self, op, operand, line, col):
+        return self._type_unary(UnaryOpNode(op, operand, line, col))
+
+    def _type_unary(self, un_op: UnaryOpNode):
+        key = (un_op.operator, un_op.operand.type)
+        result, error = UNARY_TYPES.get(key) or unary_type(*key)
+        if error is not None:
+            raise SemanticError(error.format(op=un_op.op), un_op.line, un_op.col)
+        un_op.type = result
+        return un_op
+
     def visit_simple_expression(self, node: ParseTree):
         children = node.children
         idx = 0
@@ -589,90 +723,50 @@ class SemanticAnalyzer:
             sign = first_val
             line, col = self._get_pos(first_node)
             idx += 1
-            term = self.visit_term(children[idx])
-            left = UnaryOpNode(sign, term, line, col)
-            left.type = term.type
+            term = yield self.visit_operand(children[idx])
+            left = self._unary(sign, term, line, col)
             idx += 1
         else:
-            left = self.visit_term(children[idx])
+            left = yield self.visit_operand(children[idx])
             idx += 1
             
         while idx < len(children):
             op_node = children[idx].children[0]
             op = self._get_val(op_node)
             line, col = self._get_pos(op_node)
-            right = self.visit_term(children[idx+1])
-            new_node = BinOpNode(op, left, right, line, col)
-            
-            is_int = (left.type == 1 and right.type == 1)
-            is_real = (left.type in [1, 4] and right.type in [1, 4])
-            
-            if op in ['+', '-', 'atau', 'or']:
-                if op in ['atau', 'or']:
-                    if left.type != 2 or right.type != 2:
-                        raise SemanticError(f"Operator '{op}' requires boolean operands", line, col)
-                    new_node.type = 2
-                else:
-                    if not is_real:
-                        raise SemanticError(f"Operator '{op}' requires numeric operands", line, col)
-                    new_node.type = 1 if is_int else 4
-
-            left = new_node
+            right = yield self.visit_operand(children[idx+1])
+            left = self._binary(op, left, right, line, col)
             idx += 2
         return left
 
     def visit_term(self, node: ParseTree):
-        left = self.visit_factor(node.children[0])
+        left = yield self.visit_operand(node.children[0])
         idx = 1
         while idx < len(node.children):
             op_node = node.children[idx].children[0]
             op = self._get_val(op_node)
             line, col = self._get_pos(op_node)
-            right = self.visit_factor(node.children[idx+1])
-            new_node = BinOpNode(op, left, right, line, col)
-            
-            is_int = (left.type == 1 and right.type == 1)
-            is_real = (left.type in [1, 4] and right.type in [1, 4])
-
-            if op == "/": 
-                if not is_real: raise SemanticError(f"Operator '/' requires numeric operands", line, col)
-                new_node.type = 4 
-            elif op in ["div", "mod"]: 
-                if not is_int: raise SemanticError(f"Operator '{op}' requires integer operands", line, col)
-                new_node.type = 1 
-            elif op in ["*", "dan", "and"]:
-                 if op in ["dan", "and"]:
-                    if left.type != 2 or right.type != 2:
-                        raise SemanticError(f"Operator '{op}' requires boolean operands", line, col)
-                    new_node.type = 2
-                 else:
-                    if not is_real: raise SemanticError(f"Operator '*' requires numeric operands", line, col)
-                    new_node.type = 1 if is_int else 4
-            elif op == "bagi":
-                 if not is_real: raise SemanticError(f"Operator '{op}' requires numeric operands", line, col)
-                 new_node.type = 4
-            
-            left = new_node
+            right = yield self.visit_operand(node.children[idx+1])
+            left = self._binary(op, left, right, line, col)
             idx += 2
         return left
 
     def visit_factor(self, node: ParseTree):
-        child = node.children[0]
-        val = self._get_val(child)
+        return (yield self._visit_factor_children(node.children))
+
+    def _visit_factor_children(self, children):
+        child = children[0]
+        val, name_id = self._get_name(child)
         line, col = self._get_pos(child)
         
         # logical not
         if hasattr(child.value, 'type') and child.value.type == "LOGICAL_OPERATOR" and val in ["tidak", "not"]:
-             operand = self.visit_factor(node.children[1])
-             if operand.type != 2:
-                 raise SemanticError(f"Operator '{val}' requires boolean operand", line, col)
-             un_op = UnaryOpNode(val, operand, line, col)
-             un_op.type = 2
-             return un_op
+             operand = yield self.visit_operand(children[1])
+             return self._unary(val, operand, line, col)
         elif val in ["tidak", "not"]: 
-             operand = self.visit_factor(node.children[1])
+             operand = yield self.visit_operand(children[1])
              un_op = UnaryOpNode(val, operand, line, col)
-             un_op.type = 2
+             un_op.type = TypeCode.BOOLEAN
              return un_op
 
         token_type = ""
@@ -685,263 +779,474 @@ class SemanticAnalyzer:
              elif "LPAREN" in str(child.value): token_type = "LPARENTHESIS"
         
         if token_type == "NUMBER" or val.replace('.', '', 1).isdigit():
-            if '.' in val or 'e' in val.lower():
-                n = NumberNode(float(val), line, col)
-                n.type = 4
-            else:
-                n = NumberNode(int(val), line, col)
-                n.type = 1
-            return n
+            return self._type_number(NumberNode(val, line, col))
             
         elif token_type == "IDENTIFIER" or (val and val[0].isalpha()):
-            if len(node.children) > 1 and self._get_val(node.children[1]) == "<procedure/function-call>":
-                 return self.visit_proc_call(node.children[0])
+            if len(children) > 1 and self._get_val(children[1]) == "<procedure/function-call>":
+                 return (yield self.visit_proc_call(children[0]))
             
             # array access check
-            if len(node.children) > 1 and self._get_val(node.children[1]) == "<array-bucket>":
-                bucket = node.children[1]
-                content = bucket.children[1]
-                idx_val = self._get_val(content)
-                idx_line, idx_col = self._get_pos(content)
-                
-                if idx_val.replace('.', '', 1).isdigit():
-                    idx_expr = NumberNode(int(idx_val), idx_line, idx_col)
-                    idx_expr.type = 1
-                else:
-                    idx_idx, idx_info = self.lookup(idx_val, idx_line, idx_col)
-                    idx_expr = VarNode(idx_val, idx_line, idx_col)
-                    idx_expr.tab_index = idx_idx
-                    idx_expr.type = idx_info['type']
-                
-                arr_idx, arr_info = self.lookup(val, line, col)
-                
-                elem_type = 0
-                if arr_info['type'] == 6: 
-                    atab_idx = arr_info['ref']
-                    if 0 <= atab_idx < len(self.atab):
-                        elem_type = self.atab[atab_idx]['etyp']
-                
-                access = ArrayAccessNode(val, idx_expr, line, col)
-                access.tab_index = arr_idx
-                access.type = elem_type
-                return access
-
-            idx, info = self.lookup(val, line, col)
-
-            if info['obj'] == 'constant':
-                if info['type'] == 2: 
-                     b = BooleanNode(True if info['adr'] == 1 else False, line, col)
-                     b.type = 2
-                     return b
-                elif info['type'] == 1: 
-                     n = NumberNode(info['adr'], line, col)
-                     n.type = 1
-                     return n
-            
-            v = VarNode(val, line, col)
-            v.tab_index = idx
-            v.type = info['type']
-            return v
+            if len(children) > 1 and self._get_val(children[1]) == "<array-bucket>":
+                access = ArrayAccessNode(val, self._bucket_leaf(children[1].children[1]), line, col, name_id)
+                return self._resolve_array_access(access)
+
+            return self._resolve_identifier(VarNode(val, line, col, name_id))
             
         elif token_type == "STRING_LITERAL" or val.startswith("'"):
-            content = val.strip("'")
-            if len(content) == 1:
-                s = CharNode(content, line, col)
-                s.type = 3
-            else:
-                s = StringNode(content, line, col)
-                s.type = 5
-            return s
+            return self._type_literal(StringNode(val, line, col))
             
         elif token_type == "LPARENTHESIS" or val == "(":
-            return self.visit_expression(node.children[1])
+            return (yield self.visit_operand(children[1]))
             
         elif val == "<procedure/function-call>":
-             return self.visit_proc_call(child)
+             return (yield self.visit_proc_call(child))
         
         return NumberNode(0, line, col)
 
+    def _type_number(self, n: NumberNode):
+        # n.value is still the token text
+        val = n.value
+        if '.' in val or 'e' in val.lower():
+            n.value = float(val)
+            n.type = TypeCode.REAL
+        else:
+            n.value = int(val)
+            n.type = TypeCode.INTEGER
+        return n
+
+    def _resolve_array_access(self, access: ArrayAccessNode):
+        # access.index_expr is the raw bucket leaf
+        access.index_expr = self._access_index(access.index_expr)
+        arr_idx = self.lookup(access.name, access.line, access.col, access.name_id)
+        
+        elem_type = TypeCode.NONE
+        if self.tab.type_of(arr_idx) == TypeCode.ARRAY: 
+            atab_idx = self.tab.ref_of(arr_idx)
+            if 0 <= atab_idx < len(self.atab):
+                elem_type = self.atab.get(atab_idx, 'etyp')
+        
+        access.tab_index = arr_idx
+        access.type = elem_type
+        return access
+
+    def _resolve_identifier(self, v: VarNode):
+        # integer / boolean constants are folded into a literal node, anything else decorates v itself
+        idx = self.lookup(v.name, v.line, v.col, v.name_id)
+        tab = self.tab
+        type_code = tab.type_of(idx)
+
+        if tab.obj_of(idx) == ObjKind.CONSTANT:
+            if type_code == TypeCode.BOOLEAN: 
+                 b = BooleanNode(True if tab.adr_of(idx) == 1 else False, v.line, v.col)
+                 b.type = TypeCode.BOOLEAN
+                 return b
+            elif type_code == TypeCode.INTEGER: 
+                 n = NumberNode(tab.adr_of(idx), v.line, v.col)
+                 n.type = TypeCode.INTEGER
+                 return n
+        
+        v.tab_index = idx
+        v.type = type_code
+        return v
+
+    def _type_literal(self, s: StringNode):
+        # s.value is the quoted token text; one character becomes a CharNode
+        content = s.value.strip("'")
+        if len(content) == 1:
+            c = CharNode(content, s.line, s.col)
+            c.type = TypeCode.CHAR
+            return c
+        s.value = content
+        s.type = TypeCode.STRING
+        return s
+
     def visit_proc_call(self, node: ParseTree):
         id_node = node.children[0]
-        name = self._get_val(id_node)
+        name, name_id = self._get_name(id_node)
         line, col = self._get_pos(id_node)
         
-        idx, info = self.lookup(name, line, col) 
+        idx = self.lookup(name, line, col, name_id)
         
         args = []
         if len(node.children) > 3:
              param_node = node.children[2]
              if self._get_val(param_node) == "<parameter-list>":
-                 args = self.visit_param_list(param_node)
+                 args = yield self.visit_param_list(param_node)
         
-        node = ProcCallNode(name, args, line, col)
-        if info['obj'] == 'function':
-            node.type = info['type']
+        return self._type_call(ProcCallNode(name, args, line, col, name_id), idx)
+
+    def _type_call(self, node: ProcCallNode, idx):
+        if self.tab.obj_of(idx) == ObjKind.FUNCTION:
+            node.type = self.tab.type_of(idx)
         else:
-            node.type = 0 
+            node.type = TypeCode.NONE 
             
         return node
 
     def visit_param_list(self, node: ParseTree):
         args = []
-        for child in node.children:
+        for i, child in enumerate(node.children):
             val = self._get_val(child)
             if val == "<expression>":
-                args.append(self.visit_expression(child))
+                args.append((yield self.visit_expression(child)))
+            elif self._is_collapsed_operand(child, i):
+                args.append((yield self.visit_operand(child)))
             elif val.startswith("'") or "STRING" in str(child.value):
-                line, col = self._get_pos(child)
-                s = StringNode(val.strip("'"), line, col)
-                s.type = 5
-                args.append(s)
+                args.append(self._type_string_arg(StringNode(val, *self._get_pos(child))))
         return args
+
+    def _type_string_arg(self, s: StringNode):
+        # literal passed directly as the first argument is always a string
+        s.value = s.value.strip("'")
+        s.type = TypeCode.STRING
+        return s
     
     def visit_if(self, node: ParseTree):
         line, col = self._get_pos(node)
-        condition = self.visit_expression(node.children[1])
-        then_stmt = self.visit_statement(node.children[3])
+        condition = yield self.visit_operand(node.children[1])
+        then_stmt = yield self.visit_statement(node.children[3])
         else_stmt = None
         if len(node.children) > 4:
-            else_stmt = self.visit_statement(node.children[5])
+            else_stmt = yield self.visit_statement(node.children[5])
         return IfNode(condition, then_stmt, else_stmt, line, col)
 
     def visit_while(self, node: ParseTree):
         line, col = self._get_pos(node)
-        cond = self.visit_expression(node.children[1])
-        body = self.visit_statement(node.children[3])
+        cond = yield self.visit_operand(node.children[1])
+        body = yield self.visit_statement(node.children[3])
         return WhileNode(cond, body, line, col)
 
     def visit_for(self, node: ParseTree):
         line, col = self._get_pos(node)
         iter_node = node.children[1]
-        iter_name = self._get_val(iter_node)
+        iter_name, iter_id = self._get_name(iter_node)
         iter_pos = self._get_pos(iter_node)
         
-        idx, info = self.lookup(iter_name, iter_pos[0], iter_pos[1])
-        iter_ast = VarNode(iter_name, iter_pos[0], iter_pos[1])
-        iter_ast.tab_index = idx
+        iter_ast = self._resolve_iterator(VarNode(iter_name, iter_pos[0], iter_pos[1], iter_id))
         
-        start_expr = self.visit_expression(node.children[3])
+        start_expr = yield self.visit_operand(node.children[3])
         
         dir_val = self._get_val(node.children[4])
         direction = "to" if "ke" in dir_val else "downto"
         
-        end_expr = self.visit_expression(node.children[5])
-        body = self.visit_statement(node.children[7])
+        end_expr = yield self.visit_operand(node.children[5])
+        body = yield self.visit_statement(node.children[7])
         
         return ForNode(iter_ast, start_expr, end_expr, direction, body, line, col)
 
+    def _resolve_iterator(self, iterator: VarNode):
+        iterator.tab_index = self.lookup(iterator.name, iterator.line, iterator.col, iterator.name_id)
+        return iterator
+
+    # direct AST path: same checks as the visitors above, decorating the AST built by AstParser in place
+    # (the helpers above fill in a node, the visitors hand them freshly built ones); only leaves that change
+    # kind are replaced: folded constants, one-character literals, the fallback for unknown expressions
+
+    def analyze_ast(self, program):
+        if isinstance(program, ProgramNode):
+            return self.tab, self.btab, self.atab, self.decorate_program(program)
+        raise SemanticError("Invalid Root Node", 0, 0)
+
+    def decorate_program(self, node: ProgramNode):
+        self.add_to_tab(node.name, "program", TypeCode.NONE, node.line, node.col, name_id=node.name_id)
+
+        self.decorate_declarations(node.declarations)
+
+        self._enter_scope()
+        self._run(self.decorate_block(node.block))
+        node.block.block_index = self.display[self.level]
+        self._leave_scope()
+
+        return node
+
+    def decorate_declarations(self, decls):
+        decorators = self.declaration_decorators
+        self._var_group = (None, None)
+        for decl in decls:
+            decorate = decorators.get(type(decl))
+            if decorate is not None:
+                decorate(decl)
+        return decls
+
+    def decorate_constant(self, decl: ConstDeclNode):
+        return self._declare_constant(decl, str(decl.token))
+
+    def decorate_type(self, decl: TypeDeclNode):
+        resolved_type_code, ref_idx = self._type_definition(decl.type_spec)
+        self.add_to_tab(decl.name, "type", resolved_type_code, decl.line, decl.col, ref=ref_idx, name_id=decl.name_id)
+        return decl
+
+    def decorate_variable(self, decl: VarDeclNode):
+        # one spec per "a, b: T" group, resolved once like visit_var_declaration
+        spec, resolved = self._var_group
+        if decl.type_spec is not spec:
+            spec = decl.type_spec
+            resolved = self._var_type(spec)
+            self._var_group = (spec, resolved)
+        type_name, type_code, ref_idx = resolved
+        decl.var_type_name = type_name
+        return self._declare_variable(decl, type_code, ref_idx)
+
+    def _type_definition(self, spec):
+        if spec is None or spec.name == "<record_type>":
+            return TypeCode.NONE, 0
+        if spec.name == "<array_type>":
+            return TypeCode.ARRAY, self._add_array(spec.element, spec.low, spec.high)
+        return self.types.get(spec.name.lower(), TypeCode.NONE), 0
+
+    def _var_type(self, spec):
+        if spec.name == "<array_type>":
+            return "array", TypeCode.ARRAY, self._add_array(spec.element, spec.low, spec.high)
+        type_code, ref_idx = self._resolve_type_name(spec.name, spec.line, spec.col)
+        return spec.name, type_code, ref_idx
+
+    def decorate_params(self, params):
+        spec = type_code = None
+        for param in params:
+            if param.type_spec is not spec:
+                spec = param.type_spec
+                type_code = self._param_type(spec.name, spec.line, spec.col)
+            self._declare_param(param, type_code)
+        return params
+
+    def decorate_procedure(self, node: ProcedureDeclNode):
+        self.add_to_tab(node.name, "procedure", TypeCode.NONE, node.line, node.col, name_id=node.name_id)
+        self._decorate_subprogram(node)
+        return node
+
+    def decorate_function(self, node: FunctionDeclNode):
+        ret_type_code = self.types.get(node.return_type.lower(), TypeCode.NONE)
+        self.add_to_tab(node.name, "function", ret_type_code, node.line, node.col, name_id=node.name_id)
+        self._decorate_subprogram(node)
+        return node
+
+    def _decorate_subprogram(self, node):
+        self._enter_scope()
+        self.decorate_params(node.params)
+        self.decorate_declarations(node.locals)
+        self._run(self.decorate_block(node.block))
+        self._leave_scope()
+
+    def decorate_block(self, node: BlockNode):
+        statements = node.statements
+        for i, stmt in enumerate(statements):
+            statements[i] = yield self.decorate_statement(stmt)
+        return node
+
+    def decorate_statement(self, node):
+        decorate = self.statement_decorators.get(type(node))
+        if decorate is None:
+            return None
+        return (yield decorate(node))
+
+    def decorate_if(self, node: IfNode):
+        node.condition = yield self.decorate_expr(node.condition)
+        node.then_stmt = yield self.decorate_statement(node.then_stmt)
+        if node.else_stmt:
+            node.else_stmt = yield self.decorate_statement(node.else_stmt)
+        return node
+
+    def decorate_while(self, node: WhileNode):
+        node.condition = yield self.decorate_expr(node.condition)
+        node.body = yield self.decorate_statement(node.body)
+        return node
+
+    def decorate_for(self, node: ForNode):
+        self._resolve_iterator(node.iterator)
+        node.start_expr = yield self.decorate_expr(node.start_expr)
+        node.end_expr = yield self.decorate_expr(node.end_expr)
+        node.body = yield self.decorate_statement(node.body)
+        return node
+
+    def decorate_assignment(self, node: AssignNode):
+        self._resolve_target(node.target)
+        node.value = yield self.decorate_expr(node.value)
+        return self._check_assignment(node)
+
+    def decorate_call(self, node: ProcCallNode):
+        idx = self.lookup(node.name, node.line, node.col, node.name_id)
+
+        args = node.args
+        for i, arg in enumerate(args):
+            if i == 0 and node.first_literal:
+                self._type_string_arg(arg)
+            else:
+                args[i] = yield self.decorate_expr(arg)
+
+        return self._type_call(node, idx)
+
+    def decorate_expr(self, node):
+        # handlers are generators (nested operands go through _run's stack) or plain functions (leaves)
+        decorate = self.expression_decorators.get(type(node))
+        if decorate is None:
+            return NumberNode(0, node.line, node.col)
+        result = decorate(node)
+        if isinstance(result, ASTNode):
+            return result
+        return (yield result)
+
+    def decorate_binary(self, node: BinOpNode):
+        node.left = yield self.decorate_expr(node.left)
+        node.right = yield self.decorate_expr(node.right)
+        return self._type_binary(node)
+
+    def decorate_unary(self, node: UnaryOpNode):
+        node.operand = yield self.decorate_expr(node.operand)
+        return self._type_unary(node)
+
+    def decorate_number(self, node: NumberNode):
+        return self._type_number(node)
+
+    def decorate_identifier(self, node: VarNode):
+        return self._resolve_identifier(node)
+
+    def decorate_literal(self, node: StringNode):
+        return self._type_literal(node)
+
+    def decorate_array_access(self, node: ArrayAccessNode):
+        return self._resolve_array_access(node)
+
     # printing things
 
-    def print_output(self, tab, btab, atab, ast):
+    def print_output(self, tab, btab, atab, ast, out=None, max_depth=None, max_width=None):
+        # everything goes through one buffered render.Output (stdout when out is None)
+        own = out is None
+        if own:
+            out = Output()
+
         # tab output
-        print("\nOutput")
-        print("tabs:")
+        out.line("\nOutput")
+        out.line("tabs:")
         tab_headers = ["idx", "id", "obj", "type", "ref", "nrm", "lev", "adr", "link"]
         tab_widths = [4, 15, 12, 6, 6, 4, 4, 6, 6]
-        self._print_table_header(tab_headers, tab_widths)
+        self._print_table_header(out, tab_headers, tab_widths)
         
         for i, entry in enumerate(tab):
             if entry:
                 row = entry.copy()
                 row['idx'] = i
-                self._print_row(row, tab_headers, tab_widths)
+                self._print_row(out, row, tab_headers, tab_widths)
 
         # btab output
-        print("\nbtab:")
+        out.line("\nbtab:")
         btab_headers = ["idx", "last", "lpar", "psze", "vsze"]
         btab_widths = [4, 6, 6, 6, 6]
-        self._print_table_header(btab_headers, btab_widths)
+        self._print_table_header(out, btab_headers, btab_widths)
         for i, entry in enumerate(btab):
             row = entry.copy()
             row['idx'] = i
-            self._print_row(row, btab_headers, btab_widths)
+            self._print_row(out, row, btab_headers, btab_widths)
 
         # atab output
-        print("\natab:")
+        out.line("\natab:")
         atab_headers = ["idx", "xtyp", "etyp", "low", "high", "elsz", "size"]
         atab_widths = [4, 6, 6, 6, 6, 6, 6]
         
         if not atab:
-            print("(empty because no array)")
+            out.line("(empty because no array)")
         else:
-            self._print_table_header(atab_headers, atab_widths)
+            self._print_table_header(out, atab_headers, atab_widths)
             for i, entry in enumerate(atab):
                 row = entry.copy()
                 row['idx'] = i
-                self._print_row(row, atab_headers, atab_widths)
+                self._print_row(out, row, atab_headers, atab_widths)
 
         # decorated ast output
-        print("\nDecorated AST:")
-        self._print_decorated_ast(ast)
+        out.line("\nDecorated AST:")
+        self._print_decorated_ast(ast, out=out, max_depth=max_depth, max_width=max_width)
+        if own:
+            out.close()
 
-    def _print_table_header(self, headers, widths):
+    def _print_table_header(self, out, headers, widths):
         header_str = "  ".join(f"{h:<{w}}" for h, w in zip(headers, widths))
-        print(header_str)
-        print("-" * len(header_str))
+        out.line(header_str)
+        out.line("-" * len(header_str))
 
-    def _print_row(self, row, headers, widths):
+    def _print_row(self, out, row, headers, widths):
         row_str = "  ".join(f"{str(row.get(h, '')):<{w}}" for h, w in zip(headers, widths))
-        print(row_str)
+        out.line(row_str)
 
-    def _print_decorated_ast(self, node, prefix="", is_last=True):
+    def _print_decorated_ast(self, node, prefix="", is_last=True, out=None, max_depth=None, max_width=None):
         rev_types = {v: k for k, v in self.types.items()}
-        rev_types[0] = "void/none" 
+        rev_types[TypeCode.NONE] = "void/none" 
 
         def get_type_name(code):
             return rev_types.get(code, str(code))
 
-        branch = "└─ " if is_last else "├─ "
-        
-        label = ""
-        if hasattr(node, 'name'):
-            label = f"{node.__class__.__name__}('{node.name}')"
-        elif hasattr(node, 'value'):
-            label = f"{node.__class__.__name__} {node.value}"
-        elif hasattr(node, 'op'):
-            label = f"{node.__class__.__name__} '{node.op}'"
-        elif hasattr(node, 'statements'):
-            label = "Block"
-        else:
-            label = node.__class__.__name__
-
-        notes = []
-        if node.tab_index is not None:
-            notes.append(f"tab_index:{node.tab_index}")
-        if node.type is not None:
-            notes.append(f"type:{get_type_name(node.type)}")
-        if node.scope_level is not None:
-            notes.append(f"lev:{node.scope_level}")
-        if hasattr(node, 'block_index') and node.block_index is not None:
-            notes.append(f"block_index:{node.block_index}")
-        
-        annotation = f" → {', '.join(notes)}" if notes else ""
-
-        print(prefix + branch + label + annotation)
-
-        children = []
-        if hasattr(node, 'declarations'): children.extend(node.declarations)
-        if hasattr(node, 'block') and node.block: children.append(node.block)
-        if hasattr(node, 'statements'): children.extend(node.statements)
-        if hasattr(node, 'target'): children.append(node.target)
-        if hasattr(node, 'value') and isinstance(node.value, object) and hasattr(node.value, 'type'): 
-                children.append(node.value)
-        if hasattr(node, 'left'): children.append(node.left)
-        if hasattr(node, 'right'): children.append(node.right)
-        if hasattr(node, 'operand'): children.append(node.operand)
-        if hasattr(node, 'args'): children.extend(node.args)
-        if hasattr(node, 'condition'): children.append(node.condition)
-        if hasattr(node, 'then_stmt'): children.append(node.then_stmt)
-        if hasattr(node, 'else_stmt') and node.else_stmt: children.append(node.else_stmt)
-        if hasattr(node, 'start_expr'): children.append(node.start_expr)
-        if hasattr(node, 'end_expr'): children.append(node.end_expr)
-        if hasattr(node, 'body'): children.append(node.body)
-        if hasattr(node, 'iterator'): children.append(node.iterator)
-        if hasattr(node, 'index_expr'): children.append(node.index_expr)
-
-        if is_last:
-            new_prefix = prefix + "   "
-        else:
-            new_prefix = prefix + "│  "
-
-        for i, child in enumerate(children):
-            self._print_decorated_ast(child, new_prefix, i == len(children) - 1)
+        def label(node):
+            field = AST_LABELS[type(node)]
+            if field == 'name':
+                text = f"{node.__class__.__name__}('{node.name}')"
+            elif field == 'value':
+                text = f"{node.__class__.__name__} {node.value}"
+            elif field == 'op':
+                text = f"{node.__class__.__name__} '{node.op}'"
+            elif field == 'statements':
+                text = "Block"
+            else:
+                text = node.__class__.__name__
+
+            notes = []
+            if node.tab_index is not None:
+                notes.append(f"tab_index:{node.tab_index}")
+            if node.type is not None:
+                notes.append(f"type:{get_type_name(node.type)}")
+            if node.scope_level is not None:
+                notes.append(f"lev:{node.scope_level}")
+            if type(node) is BlockNode and node.block_index is not None:
+                notes.append(f"block_index:{node.block_index}")
+            
+            annotation = f" → {', '.join(notes)}" if notes else ""
+            return text + annotation
+
+        def children(node):
+            return list(node.children())
+
+        # render.tree_lines walks with an explicit stack (deeply nested programs), same pre-order as before
+        emit(tree_lines(node, label, children, prefix, is_last, AST_BRANCHES,
+                        max_depth=max_depth, max_width=max_width), out)
+
+
+# parse tree label -> visitor, AST node class -> decorator; bound per analyzer by dispatch_table
+DECLARATION_VISITORS = {
+    "<var_declaration>": "visit_var_declaration",
+    "<const_declaration>": "visit_const_declaration",
+    "<type_declaration>": "visit_type_declaration",
+    "<subprogram_declaration>": "visit_subprogram_declaration",
+}
+STATEMENT_VISITORS = {
+    "<assignment-statement>": "visit_assignment",
+    "<procedure/function-call>": "visit_proc_call",
+    "<compound_statement>": "visit_compound_statement",
+    "<if-statement>": "visit_if",
+    "<while-statement>": "visit_while",
+    "<for-statement>": "visit_for",
+}
+DECLARATION_DECORATORS = {
+    ConstDeclNode: "decorate_constant",
+    TypeDeclNode: "decorate_type",
+    VarDeclNode: "decorate_variable",
+    ProcedureDeclNode: "decorate_procedure",
+    FunctionDeclNode: "decorate_function",
+}
+STATEMENT_DECORATORS = {
+    AssignNode: "decorate_assignment",
+    ProcCallNode: "decorate_call",
+    BlockNode: "decorate_block",
+    IfNode: "decorate_if",
+    WhileNode: "decorate_while",
+    ForNode: "decorate_for",
+}
+EXPRESSION_DECORATORS = {
+    BinOpNode: "decorate_binary",
+    UnaryOpNode: "decorate_unary",
+    NumberNode: "decorate_number",
+    VarNode: "decorate_identifier",
+    StringNode: "decorate_literal",
+    ArrayAccessNode: "decorate_array_access",
+    ProcCallNode: "decorate_call",
+}
+
+# decorated AST printer: a node is labelled by the first of these fields its class declares
+AST_LABEL_FIELDS = ("name", "value", "op", "statements")
+AST_LABELS = {cls: next((field for field in AST_LABEL_FIELDS if field in cls._fields), None) for cls in NODE_CLASSES}
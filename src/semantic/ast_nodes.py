@@ -1,7 +1,54 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+from src.lexer.names import NO_NAME
+from src.semantic.type_rules import operator_of
+
+# every concrete node class, in definition order (filled by ASTNode.__init_subclass__)
+NODE_CLASSES: list[type] = []
+
+def dispatch_table(owner, handlers: dict) -> dict:
+    """Bind a {node class (or parse tree label): method name} table to owner once.
+
+    Passes dispatch with one dict lookup on type(node) instead of an isinstance chain;
+    binding by name keeps subclass overrides of a handler working.
+    """
+    return {key: getattr(owner, name) for key, name in handlers.items()}
+
+def render(node):
+    """repr() of a node without recursion: nested nodes are rendered first, then pasted into their parent."""
+    texts = {}
+    stack = [(node, False)]
+    while stack:
+        current, ready = stack.pop()
+        children = [child for child in current._repr_children() if isinstance(child, ASTNode)]
+        if ready or not children:
+            texts[id(current)] = current._render(
+                lambda child: texts.pop(id(child)) if isinstance(child, ASTNode) else repr(child))
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(children))
+    return texts[id(node)]
 
 class ASTNode(ABC):
-    """Base class for all AST Nodes."""
+    """Base class for all AST Nodes.
+
+    Nodes are slotted: _fields lists the attributes a class adds on top of the base ones (constructor
+    arguments first, then the ones AstParser / the analyzer fill in later, which stay unset until then),
+    _children the subset holding nested nodes, in the order passes walk them.
+    Named nodes also carry name_id, the case-folded NameTable id of their IDENTIFIER token (NO_NAME when
+    built without one), which the analyzer resolves scopes with instead of hashing the name.
+    """
+    __slots__ = ("type", "tab_index", "scope_level", "line", "col")
+    _fields: tuple[str, ...] = ()
+    _children: tuple[str, ...] = ()
+    _attributes: tuple[str, ...] = __slots__  # every slot of the class, base ones first
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attributes = tuple(name for klass in reversed(cls.__mro__) for name in vars(klass).get("__slots__", ()))
+        NODE_CLASSES.append(cls)
+
     def __init__(self, line=0, col=0):
         self.type = None # type code (1=int, 2=bool, ... see analyzer.py init)
         self.tab_index = None # index in the Symbol Table (tab)
@@ -9,13 +56,33 @@ class ASTNode(ABC):
         self.line = line
         self.col = col
 
+    def children(self) -> Iterator["ASTNode"]:
+        """Nested nodes in walk order: node lists are flattened, missing (None) children skipped."""
+        for name in self._children:
+            value = getattr(self, name)
+            if type(value) is list:
+                yield from value
+            elif value is not None:
+                yield value
+
     def __repr__(self):
         return self.__class__.__name__
 
+    # nodes whose repr embeds other nodes override these two and use render() as __repr__
+    def _repr_children(self):
+        return ()
+
+    def _render(self, text):
+        return repr(self)
+
 class ProgramNode(ASTNode):
-    def __init__(self, name, declarations, block, line=0, col=0):
+    __slots__ = _fields = ("name", "declarations", "block", "name_id")
+    _children = ("declarations", "block")
+
+    def __init__(self, name, declarations, block, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.declarations = declarations  # list of declaration nodes
         self.block = block # blockNode
 
@@ -23,6 +90,9 @@ class ProgramNode(ASTNode):
         return f"ProgramNode(name='{self.name}')"
 
 class BlockNode(ASTNode):
+    __slots__ = _fields = ("statements", "block_index")
+    _children = ("statements",)
+
     def __init__(self, statements, line=0, col=0):
         super().__init__(line, col)
         self.statements = statements
@@ -32,18 +102,24 @@ class BlockNode(ASTNode):
         return f"BlockNode(stmts={len(self.statements)})"
 
 class VarDeclNode(ASTNode):
-    def __init__(self, name, var_type_name, line=0, col=0):
+    __slots__ = _fields = ("name", "var_type_name", "name_id", "type_spec")
+
+    def __init__(self, name, var_type_name, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.var_type_name = var_type_name
 
     def __repr__(self):
         return f"VarDecl(name='{self.name}', type='{self.var_type_name}', tab_idx={self.tab_index})"
 
 class ConstDeclNode(ASTNode):
-    def __init__(self, name, value, const_type, line=0, col=0):
+    __slots__ = _fields = ("name", "value", "const_type", "name_id", "token")
+
+    def __init__(self, name, value, const_type, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.value = value
         self.const_type = const_type
 
@@ -51,18 +127,25 @@ class ConstDeclNode(ASTNode):
         return f"ConstDecl(name='{self.name}', val={self.value}, type={self.const_type})"
 
 class TypeDeclNode(ASTNode):
-    def __init__(self, name, type_def, line=0, col=0):
+    __slots__ = _fields = ("name", "type_def", "name_id", "type_spec")
+
+    def __init__(self, name, type_def, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.type_def = type_def
 
     def __repr__(self):
         return f"TypeDecl(name='{self.name}', def='{self.type_def}')"
 
 class ProcedureDeclNode(ASTNode):
-    def __init__(self, name, params, block, line=0, col=0):
+    __slots__ = _fields = ("name", "params", "block", "name_id", "locals")
+    _children = ("block",) # params/locals only declare names (they end up in tab), not walked
+
+    def __init__(self, name, params, block, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.params = params # list of VarDeclNode
         self.block = block # BlockNode
 
@@ -70,9 +153,13 @@ class ProcedureDeclNode(ASTNode):
         return f"ProcDecl(name='{self.name}', params={len(self.params)})"
 
 class FunctionDeclNode(ASTNode):
-    def __init__(self, name, params, return_type, block, line=0, col=0):
+    __slots__ = _fields = ("name", "params", "return_type", "block", "name_id", "locals")
+    _children = ("block",)
+
+    def __init__(self, name, params, return_type, block, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.params = params
         self.return_type = return_type
         self.block = block
@@ -81,42 +168,73 @@ class FunctionDeclNode(ASTNode):
         return f"FuncDecl(name='{self.name}', ret='{self.return_type}')"
 
 class AssignNode(ASTNode):
+    __slots__ = _fields = ("target", "value")
+    _children = ("target", "value")
+
     def __init__(self, target, value, line=0, col=0):
         super().__init__(line, col)
         self.target = target # VarNode or ArrayAccessNode
         self.value = value # expression
 
-    def __repr__(self):
-        return f"Assign(target={self.target}, value={self.value})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.target, self.value)
+
+    def _render(self, text):
+        return f"Assign(target={text(self.target)}, value={text(self.value)})"
 
 class BinOpNode(ASTNode):
+    __slots__ = _fields = ("op", "operator", "left", "right")
+    _children = ("left", "right")
+
     def __init__(self, op, left, right, line=0, col=0):
         super().__init__(line, col)
         self.op = op
+        self.operator = operator_of(op) # Op, resolved once when the node is built
         self.left = left
         self.right = right
 
-    def __repr__(self):
-        return f"BinOp(op='{self.op}', left={self.left}, right={self.right}, type={self.type})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.left, self.right)
+
+    def _render(self, text):
+        return f"BinOp(op='{self.op}', left={text(self.left)}, right={text(self.right)}, type={self.type})"
 
 class UnaryOpNode(ASTNode):
+    __slots__ = _fields = ("op", "operator", "operand")
+    _children = ("operand",)
+
     def __init__(self, op, operand, line=0, col=0):
         super().__init__(line, col)
         self.op = op
+        self.operator = operator_of(op) # Op, resolved once when the node is built
         self.operand = operand
 
-    def __repr__(self):
-        return f"UnaryOp(op='{self.op}', operand={self.operand})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.operand,)
+
+    def _render(self, text):
+        return f"UnaryOp(op='{self.op}', operand={text(self.operand)})"
 
 class VarNode(ASTNode):
-    def __init__(self, name, line=0, col=0):
+    __slots__ = _fields = ("name", "name_id")
+
+    def __init__(self, name, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
 
     def __repr__(self):
         return f"Var('{self.name}', tab_idx={self.tab_index}, type={self.type})"
 
 class NumberNode(ASTNode):
+    __slots__ = _fields = ("value",)
+
     def __init__(self, value, line=0, col=0):
         super().__init__(line, col)
         self.value = value
@@ -125,6 +243,8 @@ class NumberNode(ASTNode):
         return f"Num({self.value})"
 
 class StringNode(ASTNode):
+    __slots__ = _fields = ("value",)
+
     def __init__(self, value, line=0, col=0):
         super().__init__(line, col)
         self.value = value
@@ -133,6 +253,8 @@ class StringNode(ASTNode):
         return f"String('{self.value}')"
 
 class CharNode(ASTNode):
+    __slots__ = _fields = ("value",)
+
     def __init__(self, value, line=0, col=0):
         super().__init__(line, col)
         self.value = value
@@ -141,6 +263,8 @@ class CharNode(ASTNode):
         return f"Char('{self.value}')"
 
 class BooleanNode(ASTNode):
+    __slots__ = _fields = ("value",)
+
     def __init__(self, value, line=0, col=0):
         super().__init__(line, col)
         self.value = value
@@ -149,34 +273,62 @@ class BooleanNode(ASTNode):
         return f"Bool({self.value})"
 
 class ProcCallNode(ASTNode):
-    def __init__(self, name, args, line=0, col=0):
+    __slots__ = _fields = ("name", "args", "name_id", "first_literal")
+    _children = ("args",)
+
+    def __init__(self, name, args, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.args = args
 
-    def __repr__(self):
-        return f"ProcCall(name='{self.name}', args={self.args})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return self.args
+
+    def _render(self, text):
+        return f"ProcCall(name='{self.name}', args=[{', '.join(text(arg) for arg in self.args)}])"
 
 class IfNode(ASTNode):
+    __slots__ = _fields = ("condition", "then_stmt", "else_stmt")
+    _children = ("condition", "then_stmt", "else_stmt")
+
     def __init__(self, condition, then_stmt, else_stmt=None, line=0, col=0):
         super().__init__(line, col)
         self.condition = condition
         self.then_stmt = then_stmt
         self.else_stmt = else_stmt
 
-    def __repr__(self):
-        return f"If(cond={self.condition}, then={self.then_stmt}, else={self.else_stmt})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.condition, self.then_stmt, self.else_stmt)
+
+    def _render(self, text):
+        return f"If(cond={text(self.condition)}, then={text(self.then_stmt)}, else={text(self.else_stmt)})"
 
 class WhileNode(ASTNode):
+    __slots__ = _fields = ("condition", "body")
+    _children = ("condition", "body")
+
     def __init__(self, condition, body, line=0, col=0):
         super().__init__(line, col)
         self.condition = condition
         self.body = body
 
-    def __repr__(self):
-        return f"While(cond={self.condition})"
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.condition,)
+
+    def _render(self, text):
+        return f"While(cond={text(self.condition)})"
 
 class ForNode(ASTNode):
+    __slots__ = _fields = ("iterator", "start_expr", "end_expr", "direction", "body")
+    _children = ("start_expr", "end_expr", "body", "iterator") # iterator last, as the AST printer always showed it
+
     def __init__(self, iterator, start_expr, end_expr, direction, body, line=0, col=0):
         super().__init__(line, col)
         self.iterator = iterator # VarNode
@@ -189,10 +341,32 @@ class ForNode(ASTNode):
         return f"For(iter={self.iterator.name}, dir={self.direction})"
 
 class ArrayAccessNode(ASTNode):
-    def __init__(self, name, index_expr, line=0, col=0):
+    __slots__ = _fields = ("name", "index_expr", "name_id")
+    _children = ("index_expr",)
+
+    def __init__(self, name, index_expr, line=0, col=0, name_id=NO_NAME):
         super().__init__(line, col)
         self.name = name
+        self.name_id = name_id
         self.index_expr = index_expr
 
+    __repr__ = render
+
+    def _repr_children(self):
+        return (self.index_expr,)
+
+    def _render(self, text):
+        return f"ArrayAccess(name='{self.name}', index={text(self.index_expr)})"
+
+class TypeSpec:
+    """Type as written in a declaration, filled by AstParser and resolved by the analyzer (not an AST node)."""
+    def __init__(self, name, line=0, col=0, element=None, low=0, high=0):
+        self.name = name # keyword text, "<array_type>" or "<record_type>"
+        self.line = line
+        self.col = col
+        self.element = element # array element type name
+        self.low = low
+        self.high = high
+
     def __repr__(self):
-        return f"ArrayAccess(name='{self.name}', index={self.index_expr})"
+        return f"TypeSpec('{self.name}')"
@@ -0,0 +1,238 @@
+"""
+Columnar storage for the analyzer's tab, btab and atab.
+
+Every field is one array('i') column instead of one dict per entry. Values that do not fit a C int
+(real constants, huge integer literals) are kept in a small overflow dict, marked by OVERFLOW in the column.
+tab[i] / btab[i] / atab[i] return a Row view that reads and writes the columns, so code written against
+the old dict rows (row["type"], row["vsze"] += 1, row.copy()) keeps working unchanged; the analyzer's hot
+paths skip the views and read cells through get() / put() or SymbolTable.type_of() and friends.
+"""
+
+from array import array
+from enum import IntEnum
+
+from src.lexer.names import NameTable
+
+OVERFLOW = -(1 << 31)  # cell value meaning "the real value is in table.overflow"
+INT_MAX = (1 << 31) - 1
+
+
+class ObjKind(IntEnum):
+    NONE = 0  # empty tab slot (tab[0], unused reserved slots)
+    CONSTANT = 1
+    VARIABLE = 2
+    TYPE = 3
+    PROCEDURE = 4
+    FUNCTION = 5
+    PROGRAM = 6
+
+
+# obj strings as printed in the tab output / compared by the analyzer
+OBJ_NAMES: dict[ObjKind, str] = {
+    ObjKind.CONSTANT: "constant",
+    ObjKind.VARIABLE: "variable",
+    ObjKind.TYPE: "type",
+    ObjKind.PROCEDURE: "procedure",
+    ObjKind.FUNCTION: "function",
+    ObjKind.PROGRAM: "program",
+}
+OBJ_KINDS: dict[str, ObjKind] = {name: kind for kind, name in OBJ_NAMES.items()}
+OBJ_TEXT: tuple[str | None, ...] = tuple(OBJ_NAMES.get(kind) for kind in ObjKind)
+
+
+class Row:
+    """Dict-like view of one table row."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, field):
+        table = self.table
+        slot = table.SLOTS[field]
+        raw = table.columns[slot][self.index]
+        return raw if raw != OVERFLOW else table.overflow[slot, self.index]
+
+    def __setitem__(self, field, value):
+        self.table.put(self.index, field, value)
+
+    def get(self, field, default=None):
+        return self.table.get(self.index, field) if field in self.table.SLOTS else default
+
+    def keys(self):
+        return self.table.FIELDS
+
+    def copy(self) -> dict:
+        return {field: self.table.get(self.index, field) for field in self.table.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, (Row, dict)):
+            return self.copy() == (other.copy() if isinstance(other, Row) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class SymbolRow(Row):
+    __slots__ = ()
+
+    def __getitem__(self, field):
+        table = self.table
+        slot = table.SLOTS[field]
+        raw = table.columns[slot][self.index]
+        if slot == 0:
+            return table.spelled.get(self.index) or table.names.spellings[raw]
+        if slot == 1:
+            return OBJ_TEXT[raw]
+        return raw if raw != OVERFLOW else table.overflow[slot, self.index]
+
+
+class ColumnTable:
+    """Rows of int fields stored as parallel array('i') columns."""
+    FIELDS: tuple[str, ...] = ()
+    SLOTS: dict[str, int] = {}
+
+    def __init_subclass__(cls):
+        cls.SLOTS = {field: i for i, field in enumerate(cls.FIELDS)}
+
+    def __init__(self):
+        self.columns = [array("i") for _ in self.FIELDS]
+        self.overflow: dict[tuple[int, int], object] = {}  # (column, row) -> value
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        return Row(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, **values) -> int:
+        index = len(self)
+        for slot, field in enumerate(self.FIELDS):
+            self.columns[slot].append(0)
+            self._store(slot, index, values[field])
+        return index
+
+    def get(self, index, field):
+        slot = self.SLOTS[field]
+        raw = self.columns[slot][index]
+        if raw == OVERFLOW:
+            return self.overflow[slot, index]
+        return raw
+
+    def put(self, index, field, value):
+        self._store(self.SLOTS[field], index, value)
+
+    def _store(self, slot, index, value):
+        # plain ints and IntEnum codes (TypeCode) fit the column, bools / floats / huge ints do not
+        if isinstance(value, int) and type(value) is not bool and OVERFLOW < value <= INT_MAX:
+            self.columns[slot][index] = value
+            if self.overflow:
+                self.overflow.pop((slot, index), None)
+        else:
+            self.columns[slot][index] = OVERFLOW
+            self.overflow[slot, index] = value
+
+
+class SymbolTable(ColumnTable):
+    """tab: identifier entries; id is a case-folded NameTable id, obj an ObjKind, empty slots read as None."""
+    FIELDS = ("id", "obj", "type", "ref", "nrm", "lev", "adr", "link")
+
+    def __init__(self, names: NameTable | None = None):
+        super().__init__()
+        self.names = names if names is not None else NameTable()
+        # row -> declared spelling, only where it differs from the name's first-seen spelling
+        self.spelled: dict[int, str] = {}
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        # IndexError for out-of-range rows comes from the column itself
+        return SymbolRow(self, index) if self.columns[1][index] and index >= 0 else None  # obj 0 = ObjKind.NONE
+
+    def append_empty(self) -> int:
+        index = len(self)
+        for column in self.columns:
+            column.append(0)
+        return index
+
+    def append(self, **values) -> int:
+        return self.set(self.append_empty(), **values)
+
+    def set(self, index, **values) -> int:
+        while len(self) <= index:
+            self.append_empty()
+        for field, value in values.items():
+            self.put(index, field, value)
+        return index
+
+    def name_id(self, index) -> int:
+        return self.columns[0][index]
+
+    # hot-path readers for the analyzer: one column read, no Row view or SLOTS lookup
+    def obj_of(self, index) -> int:
+        return self.columns[1][index]  # ObjKind value
+
+    def type_of(self, index):
+        raw = self.columns[2][index]
+        return raw if raw != OVERFLOW else self.overflow[2, index]
+
+    def ref_of(self, index):
+        raw = self.columns[3][index]
+        return raw if raw != OVERFLOW else self.overflow[3, index]
+
+    def adr_of(self, index):
+        raw = self.columns[6][index]
+        return raw if raw != OVERFLOW else self.overflow[6, index]
+
+    def get(self, index, field):
+        slot = self.SLOTS[field]
+        raw = self.columns[slot][index]
+        if slot == 0:
+            return self.spelled.get(index) or self.names.spellings[raw]
+        if slot == 1:
+            return OBJ_TEXT[raw]
+        return raw if raw != OVERFLOW else self.overflow[slot, index]
+
+    def put_name(self, index, name_id, spelling):
+        # id column from an already interned name (the analyzer passes the lexer's id), keeps the declared spelling
+        self.columns[0][index] = name_id
+        if self.names.spellings[name_id] != spelling:
+            self.spelled[index] = spelling
+        else:
+            self.spelled.pop(index, None)
+
+    def put(self, index, field, value):
+        if field == "id":
+            self.put_name(index, self.names.intern(value), value)
+        elif field == "obj":
+            self.columns[1][index] = OBJ_KINDS[value]
+        else:
+            super().put(index, field, value)
+
+
+class BlockTable(ColumnTable):
+    """btab: one row per block."""
+    FIELDS = ("last", "lpar", "psze", "vsze")
+
+
+class ArrayTable(ColumnTable):
+    """atab: one row per array type."""
+    FIELDS = ("xtyp", "etyp", "low", "high", "elsz", "size")
@@ -0,0 +1,116 @@
+"""
+Type codes, operators and the precomputed result-type tables used by SemanticAnalyzer.
+
+Every operator text is resolved once to an Op; BINARY_TYPES[(op, left type, right type)] and
+UNARY_TYPES[(op, operand type)] give (result type, error message or None) for every combination
+of known type codes, so checking an operator node is a single dict lookup.
+The rules (and error texts) are the ones the analyzer always applied, including its quirks:
+relational operators never check their operands, "bagi" yields real, a sign keeps its operand's type,
+and an operator without a rule leaves the node untyped (None).
+"""
+
+from enum import IntEnum
+
+
+class TypeCode(IntEnum):
+    NONE = 0  # void/none
+    INTEGER = 1
+    BOOLEAN = 2
+    CHAR = 3
+    REAL = 4
+    STRING = 5
+    ARRAY = 6
+
+    # printed as the plain code ("Cannot assign type 4 ..."), also on Python 3.10
+    __str__ = int.__repr__
+    __format__ = int.__format__
+
+
+class Op(IntEnum):
+    OTHER = 0  # no rule: result stays None
+    ADD = 1
+    SUB = 2
+    OR = 3
+    MUL = 4
+    SLASH = 5
+    DIV = 6
+    MOD = 7
+    AND = 8
+    BAGI = 9
+    NOT = 10
+    EQ = 11
+    NE = 12
+    LT = 13
+    LE = 14
+    GT = 15
+    GE = 16
+
+
+# operator text (as written in the source / stored on BinOpNode.op) -> Op
+OPERATORS: dict[str, Op] = {
+    "+": Op.ADD, "-": Op.SUB, "atau": Op.OR, "or": Op.OR,
+    "*": Op.MUL, "/": Op.SLASH, "div": Op.DIV, "mod": Op.MOD, "dan": Op.AND, "and": Op.AND, "bagi": Op.BAGI,
+    "tidak": Op.NOT, "not": Op.NOT,
+    "=": Op.EQ, "<>": Op.NE, "<": Op.LT, "<=": Op.LE, ">": Op.GT, ">=": Op.GE,
+}
+
+RELATIONAL = frozenset((Op.EQ, Op.NE, Op.LT, Op.LE, Op.GT, Op.GE))
+NUMERIC = frozenset((TypeCode.INTEGER, TypeCode.REAL))
+
+# every value a node's type can hold
+TYPE_DOMAIN = (None, *TypeCode)
+
+BOOLEAN_OPERANDS = "Operator '{op}' requires boolean operands"
+NUMERIC_OPERANDS = "Operator '{op}' requires numeric operands"
+INTEGER_OPERANDS = "Operator '{op}' requires integer operands"
+BOOLEAN_OPERAND = "Operator '{op}' requires boolean operand"
+
+
+def operator_of(text: str) -> Op:
+    return OPERATORS.get(text, Op.OTHER)
+
+
+def binary_type(op: Op, left, right) -> tuple[TypeCode | None, str | None]:
+    # (result type, error template with {op}) for one binary operator application
+    if op in RELATIONAL:
+        return TypeCode.BOOLEAN, None
+    if op in (Op.OR, Op.AND):
+        if left != TypeCode.BOOLEAN or right != TypeCode.BOOLEAN:
+            return None, BOOLEAN_OPERANDS
+        return TypeCode.BOOLEAN, None
+
+    numeric = left in NUMERIC and right in NUMERIC
+    integer = left == TypeCode.INTEGER and right == TypeCode.INTEGER
+    if op in (Op.ADD, Op.SUB, Op.MUL):
+        if not numeric:
+            return None, NUMERIC_OPERANDS
+        return TypeCode.INTEGER if integer else TypeCode.REAL, None
+    if op in (Op.SLASH, Op.BAGI):
+        if not numeric:
+            return None, NUMERIC_OPERANDS
+        return TypeCode.REAL, None
+    if op in (Op.DIV, Op.MOD):
+        if not integer:
+            return None, INTEGER_OPERANDS
+        return TypeCode.INTEGER, None
+    return None, None
+
+
+def unary_type(op: Op, operand) -> tuple[TypeCode | None, str | None]:
+    if op == Op.NOT:
+        if operand != TypeCode.BOOLEAN:
+            return None, BOOLEAN_OPERAND
+        return TypeCode.BOOLEAN, None
+    # sign (or anything else): no check, keeps the operand's type
+    return operand, None
+
+
+BINARY_TYPES: dict[tuple, tuple] = {(op, left, right): binary_type(op, left, right)
+                                    for op in Op for left in TYPE_DOMAIN for right in TYPE_DOMAIN}
+UNARY_TYPES: dict[tuple, tuple] = {(op, operand): unary_type(op, operand)
+                                   for op in Op for operand in TYPE_DOMAIN}
+
+
+def assignable(target, value) -> bool:
+    # same type, or an integer stored into a real
+    return target == value or (target == TypeCode.REAL and value == TypeCode.INTEGER)
@@ -0,0 +1,613 @@
+"""
+Apa:
+- format biner ringkas buat ParseTree dan AST (hasil analyzer, sudah didekorasi), pengganti pickle buat arsip
+  hasil kompilasi / kirim tree antar proses
+
+Ngapain:
+- ParseTree ("SMNT"): tabel string (value token + nama kind), tabel kind node (label) dan tipe token, index token
+  lebar tetap (tipe, value, line, col; little-endian), lalu node preorder: label + 1, jumlah anak (varint), panjang byte anak (varint);
+  leaf = 0 + index token
+- load_tree: file di-mmap, node baru dibuat pas children-nya dibaca (StoredNode), panjang byte anak dipakai
+  buat lompatin subtree, jadi baca satu node = baca header anak-anaknya doang
+- AST ("SMNA"): kolom, bukan nilai ber-tag: semua nilai = index ke satu pool (konstanta None/bool/absent, tabel
+  string, int, float, token, list, objek), tabel kelas (nama + field), lalu per kelas per field satu array index
+  (2 / 4 byte); int/float/token/list/urutan kelas objek juga array lebar tetap
+- loads_ast: objek dibuat kosong semua dulu, lalu field-nya diisi per kolom (map setattr, loop-nya di C), jadi
+  gak ada decode per tag di Python; dumps_ast juga ngambil field per kolom (satu kelas sekaligus)
+- nulis dan baca gak rekursif (ParseTree: stack sendiri, AST: antrian objek per gelombang), jadi tree yang
+  nesting-nya dalam tetap aman
+
+catatan:
+- AST di-load sekaligus (node AST = objek biasa yang atributnya dibaca langsung, jadi gak bisa lazy kaya ParseTree)
+- kelas yang boleh muncul di AST cuma kelas di src.semantic.ast_nodes (beda dengan pickle yang bisa import apa aja)
+- objek / list / token yang direferensikan dua kali (mis. TypeSpec yang dipakai beberapa variabel) ditulis sekali,
+  hasil load juga berbagi objek yang sama (kaya pickle)
+- Token hasil load = StoredToken (subclass Token), value/line/col disimpan langsung karena source-nya gak ikut
+- name_id node AST gak ikut ditulis (id-nya cuma berlaku di NameTable source yang nulis), pas load di-intern ulang
+  dari name ke tabel yang dikasih (names=, mis. tabel analyzer yang bakal make), tanpa tabel = NO_NAME
+"""
+
+import gc
+import mmap
+import sys
+from array import array
+from collections import deque
+from itertools import repeat
+from pathlib import Path
+
+from src.lexer.names import NO_NAME, NameTable
+from src.lexer.token import Token
+from src.parser.parsertree import ParseTree
+from src.semantic import ast_nodes
+
+TREE_MAGIC = b"SMNT"
+AST_MAGIC = b"SMNA"
+FORMAT_VERSION = 1
+AST_FORMAT_VERSION = 2
+
+# format AST: semua nilai = index ke satu pool [konstanta, string, int, float, token, list, objek]
+R_ABSENT, R_NONE, R_FALSE, R_TRUE = range(4)  # index konstanta (absent = slot yang gak diisi)
+CONSTANTS = 4
+K_CONST, K_STR, K_INT, K_FLOAT, K_TOKEN, K_LIST, K_OBJECT = range(7)  # jenis ref mentah pas nulis
+ABSENT = object()
+NONE_TYPE = type(None)
+TRANSIENT = ("name_id",)  # slot node AST yang gak ditulis, diisi ulang pas load
+AST_CLASSES = {name: cls for name, cls in vars(ast_nodes).items()
+               if isinstance(cls, type) and cls.__module__ == ast_nodes.__name__}
+
+
+class StoredToken(Token):
+    # token dari file serialisasi: gak punya source, value/line/col disimpan langsung
+    __slots__ = ("_value", "_line", "_col")
+    start = 0
+    end = 0
+
+    def __init__(self, type: str, value: str, line: int, col: int):
+        self.type = type
+        self.source = None
+        self._value = value
+        self._line = line
+        self._col = col
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    @property
+    def line(self) -> int:
+        return self._line
+
+    @property
+    def col(self) -> int:
+        return self._col
+
+    def get_pos(self) -> tuple[int, int]:
+        return (self._line, self._col)
+
+
+# ---------- varint / string table ----------
+
+def _put_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _varint_size(n: int) -> int:
+    size = 1
+    while n >= 0x80:
+        n >>= 7
+        size += 1
+    return size
+
+
+def _get_varint(buf, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Strings:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+
+    def id(self, text: str) -> int:
+        found = self.ids.get(text)
+        if found is None:
+            found = self.ids[text] = len(self.ids)
+        return found
+
+    def write(self, out: bytearray):
+        _put_varint(out, len(self.ids))
+        for text in self.ids:
+            raw = text.encode("utf-8")
+            _put_varint(out, len(raw))
+            out += raw
+
+
+def _read_strings(buf, pos: int) -> tuple[list[str], int]:
+    count, pos = _get_varint(buf, pos)
+    strings = []
+    for _ in range(count):
+        size, pos = _get_varint(buf, pos)
+        strings.append(bytes(buf[pos:pos + size]).decode("utf-8"))
+        pos += size
+    return strings, pos
+
+
+def _read_ids(buf, pos: int, strings: list[str]) -> tuple[list[str], int]:
+    count, pos = _get_varint(buf, pos)
+    names = []
+    for _ in range(count):
+        sid, pos = _get_varint(buf, pos)
+        names.append(strings[sid])
+    return names, pos
+
+
+def _check_header(buf, magic: bytes, version: int = FORMAT_VERSION) -> int:
+    if bytes(buf[:4]) != magic:
+        raise ValueError(f"not a {magic.decode()} file")
+    if buf[4] != version:
+        raise ValueError(f"unsupported {magic.decode()} version {buf[4]}")
+    return 5
+
+
+def _map(path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ---------- ParseTree ----------
+
+def dumps_tree(tree) -> bytes:
+    # tree = ParseTree / ArenaNode / apa aja yang punya value + children
+    strings = _Strings()
+    labels: dict[str, int] = {}
+    types: dict[str, int] = {}
+    tok_type, tok_value, tok_line, tok_col = array('B'), array('I'), array('I'), array('I')
+
+    # preorder (node, index parent), ukuran byte dihitung dari belakang: anak selalu sesudah parent-nya
+    order, parents, stack = [], [], [(tree, -1)]
+    while stack:
+        node, parent = stack.pop()
+        order.append(node)
+        parents.append(parent)
+        here = len(order) - 1
+        stack.extend((child, here) for child in reversed(node.children))
+
+    headers = []   # (kind + 1 | 0, jumlah anak | index token)
+    for node in order:
+        value = node.value
+        if isinstance(value, Token):
+            line, col = value.get_pos()
+            tok_type.append(types.setdefault(value.type, len(types)))
+            tok_value.append(strings.id(value.value))
+            tok_line.append(line)
+            tok_col.append(col)
+            headers.append((0, len(tok_type) - 1))
+        else:
+            headers.append((labels.setdefault(value, len(labels)) + 1, len(node.children)))
+
+    body = [0] * len(order)
+    size = [0] * len(order)
+    for i in range(len(order) - 1, -1, -1):
+        kind, n = headers[i]
+        if kind:
+            size[i] = _varint_size(kind) + _varint_size(n) + _varint_size(body[i]) + body[i]
+        else:
+            size[i] = 1 + _varint_size(n)
+        if parents[i] >= 0:
+            body[parents[i]] += size[i]
+
+    out = bytearray(TREE_MAGIC)
+    out.append(FORMAT_VERSION)
+    label_ids = [strings.id(label) for label in labels]
+    type_ids = [strings.id(name) for name in types]
+    strings.write(out)
+    for ids in (label_ids, type_ids):
+        _put_varint(out, len(ids))
+        for sid in ids:
+            _put_varint(out, sid)
+
+    _put_varint(out, len(tok_type))
+    out += tok_type.tobytes()
+    out += bytes(-len(out) % 4)
+    for column in (tok_value, tok_line, tok_col):
+        if sys.byteorder != "little":
+            column.byteswap()
+        out += column.tobytes()
+
+    for i, (kind, n) in enumerate(headers):
+        _put_varint(out, kind)
+        _put_varint(out, n)
+        if kind:
+            _put_varint(out, body[i])
+    return bytes(out)
+
+
+def dump_tree(tree, path):
+    Path(path).write_bytes(dumps_tree(tree))
+
+
+class StoredTree:
+    # isi file SMNT (bytes / mmap): tabel string, index token (view langsung ke buffer), awal node stream
+    def __init__(self, buf):
+        buf = self.buf = memoryview(buf)
+        pos = _check_header(buf, TREE_MAGIC)
+        self.strings, pos = _read_strings(buf, pos)
+        self.labels, pos = _read_ids(buf, pos, self.strings)
+        self.types, pos = _read_ids(buf, pos, self.strings)
+        count, pos = _get_varint(buf, pos)
+        self.tok_type = buf[pos:pos + count]
+        pos += count
+        pos += -pos % 4
+        columns = [buf[start:start + 4 * count].cast('I') for start in range(pos, pos + 12 * count, 4 * count)]
+        if sys.byteorder != "little":
+            columns = [array('I', column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        self.tok_value, self.tok_line, self.tok_col = columns
+        self.nodes = pos + 12 * count
+
+    def token(self, i: int) -> StoredToken:
+        return StoredToken(self.types[self.tok_type[i]], self.strings[self.tok_value[i]],
+                           self.tok_line[i], self.tok_col[i])
+
+    def root(self) -> "StoredNode":
+        return StoredNode.at(self, self.nodes)
+
+
+class StoredNode(ParseTree):
+    # node ParseTree yang children-nya baru dibaca dari file pas pertama kali dibutuhkan
+    def __init__(self, tree: StoredTree, kind: int, arg: int, body: int):
+        self.tree = tree
+        if kind:
+            self.value = tree.labels[kind - 1]
+            self._count = arg
+            self._body = body  # offset byte anak pertama
+            self._children = None
+            self._width = None
+        else:
+            self.value = tree.token(arg)
+            self._count = 0
+            self._children = []
+            self._width = 1
+
+    @classmethod
+    def at(cls, tree: StoredTree, offset: int) -> "StoredNode":
+        kind, pos = _get_varint(tree.buf, offset)
+        arg, pos = _get_varint(tree.buf, pos)
+        if kind:
+            _, pos = _get_varint(tree.buf, pos)
+        return cls(tree, kind, arg, pos)
+
+    @property
+    def children(self) -> list[ParseTree]:
+        if self._children is None:
+            tree = self.tree
+            buf, pos = tree.buf, self._body
+            children = []
+            for _ in range(self._count):
+                # varint 1 byte dibaca langsung, yang lebih panjang lewat _get_varint
+                kind = buf[pos]
+                kind, pos = (kind, pos + 1) if kind < 0x80 else _get_varint(buf, pos)
+                arg = buf[pos]
+                arg, pos = (arg, pos + 1) if arg < 0x80 else _get_varint(buf, pos)
+                if kind:
+                    length = buf[pos]
+                    length, pos = (length, pos + 1) if length < 0x80 else _get_varint(buf, pos)
+                    children.append(StoredNode(tree, kind, arg, pos))
+                    pos += length
+                else:
+                    children.append(StoredNode(tree, 0, arg, pos))
+            self._children = children
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    @property
+    def width(self) -> int:
+        if self._width is None:
+            self._width = sum(child.width for child in self.children)
+        return self._width
+
+    @width.setter
+    def width(self, width: int):
+        self._width = width
+
+    def is_parsed(self) -> bool:
+        return self._children is not None
+
+
+def loads_tree(data: bytes) -> StoredNode:
+    return StoredTree(data).root()
+
+
+def load_tree(path) -> StoredNode:
+    # mmap ditutup sendiri pas semua node hasil load sudah gak dipakai
+    return StoredTree(_map(path)).root()
+
+
+# ---------- AST ----------
+
+def _pack(column: array) -> bytes:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(typecode: str, buf, pos: int, count: int) -> tuple[array, int]:
+    column = array(typecode)
+    end = pos + count * column.itemsize
+    column.frombytes(buf[pos:end])
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column, end
+
+
+class _AstWriter:
+    # ref mentah selama jalan = (index lokal << 3) | jenis, diubah ke index pool global pas jumlah tiap jenis sudah tau
+    def __init__(self):
+        self.strings = _Strings()
+        # nilai -> ref mentah buat kolom int / string (None dan absent ikut, biar kolom campur None tetap lewat dict)
+        self.ints: dict = {None: R_NONE << 3, ABSENT: R_ABSENT << 3}
+        self.texts: dict = {None: R_NONE << 3, ABSENT: R_ABSENT << 3}
+        self.int_values: list[int] = []
+        self.floats = array('d')
+        self.tokens = []                 # (type, value, line, col) string id / posisi
+        self.lists: list[list] = []
+        self.seen: dict[int, int] = {}   # id(list / token / objek) -> ref, objek yang dipakai dua kali ditulis sekali
+        self.objects = []                # objek urut ketemu, kolom tiap kelas diisi dengan urutan yang sama
+        self.object_class = array('H')
+        self.classes: dict[type, int] = {}
+        self.fields: list[list[str]] = []          # per kelas: nama field
+        self.columns: list[list[list[int]]] = []   # per kelas, per field: ref tiap instance
+        self.counts: list[int] = []                # per kelas: instance yang sudah diisi ke kolom
+
+    def ref(self, value) -> int:
+        if value is None or value is ABSENT:
+            return self.ints[value]
+        if value is True or value is False:
+            return (R_TRUE if value else R_FALSE) << 3
+        kind = type(value)
+        if isinstance(value, str):
+            return self.refs([value])[0]
+        if isinstance(value, int):
+            return self.refs([value])[0]
+        if isinstance(value, float):
+            self.floats.append(value)
+            return (len(self.floats) - 1) << 3 | K_FLOAT
+        found = self.seen.get(id(value))
+        if found is not None:
+            return found
+        if kind is list:
+            found = len(self.lists) << 3 | K_LIST
+            self.lists.append(value)
+        elif isinstance(value, Token):
+            line, col = value.get_pos()
+            found = len(self.tokens) << 3 | K_TOKEN
+            self.tokens.append((self.strings.id(value.type), self.strings.id(value.value), line, col))
+        elif kind.__module__ == ast_nodes.__name__:
+            cid = self.classes.get(kind)
+            if cid is None:
+                cid = self.classes[kind] = len(self.fields)
+                self.fields.append([name for name in getattr(kind, "_attributes", ()) if name not in TRANSIENT])
+                self.columns.append([[] for _ in self.fields[cid]])
+                self.counts.append(0)
+            found = len(self.objects) << 3 | K_OBJECT
+            self.object_class.append(cid)
+            self.objects.append(value)
+        else:
+            raise TypeError(f"cannot serialize {kind.__name__} in an AST")
+        self.seen[id(value)] = found
+        return found
+
+    def refs(self, values: list) -> list[int]:
+        # ref satu kolom; kolom yang isinya int (termasuk IntEnum TypeCode, di-load balik sebagai int biasa) atau
+        # string (+ None / absent) lewat dict, nilai baru doang yang di-loop, sisanya per nilai lewat ref()
+        kinds = set(map(type, values))
+        if all(kind is NONE_TYPE or kind is object or (issubclass(kind, int) and kind is not bool) for kind in kinds):
+            table = self.ints
+            for value in set(values).difference(table):
+                table[value] = len(self.int_values) << 3 | K_INT
+                self.int_values.append(int(value))
+        elif all(kind is NONE_TYPE or kind is object or issubclass(kind, str) for kind in kinds):
+            table = self.texts
+            for value in set(values).difference(table):
+                table[value] = self.strings.id(str(value)) << 3 | K_STR
+        else:
+            return list(map(self.ref, values))
+        return list(map(table.__getitem__, values))
+
+    def visit(self, cid: int, group: list):
+        # satu kelas, instance urut index: field jadi kolom, objek & list yang baru ketemu nambah di belakang antrian
+        fields, columns = self.fields[cid], self.columns[cid]
+        count = self.counts[cid]
+        self.counts[cid] = count + len(group)
+        if isinstance(group[0], ast_nodes.ASTNode):
+            for name, column in zip(fields, columns):
+                column += self.refs(list(map(getattr, group, repeat(name), repeat(ABSENT))))
+            return
+        # objek biasa (TypeSpec): field = gabungan atribut instance-nya, instance lama yang gak punya = absent
+        for value in group:
+            attrs = vars(value)
+            for name in attrs:
+                if name not in fields:
+                    fields.append(name)
+                    columns.append([R_ABSENT << 3] * count)
+            for name, column in zip(fields, columns):
+                column.append(self.ref(attrs.get(name, ABSENT)))
+            count += 1
+
+    def dumps(self, root) -> bytes:
+        root_ref = self.ref(root)
+        objects, lists = self.objects, self.lists
+        visited = lists_done = 0
+        while visited < len(objects) or lists_done < len(lists):
+            # satu gelombang: objek yang sudah ketemu dikelompokin per kelas (urutan index tetap)
+            groups: dict[int, list] = {}
+            for cid, value in zip(self.object_class[visited:], objects[visited:]):
+                groups.setdefault(cid, []).append(value)
+            visited = len(objects)
+            for cid, group in groups.items():
+                self.visit(cid, group)
+            # item list jadi ref di sini (list ikut nemuin objek baru)
+            while lists_done < len(lists):
+                lists[lists_done] = self.refs(lists[lists_done])
+                lists_done += 1
+
+        strings, ints, floats, tokens = self.strings, self.int_values, self.floats, self.tokens
+        # nama kelas / field masuk tabel string sebelum base pool dihitung
+        class_names = [strings.id(cls.__name__) for cls in self.classes]
+        field_names = [[strings.id(name) for name in fields] for fields in self.fields]
+        bases = [0] * 8
+        bases[K_STR] = CONSTANTS
+        bases[K_INT] = bases[K_STR] + len(strings.ids)
+        bases[K_FLOAT] = bases[K_INT] + len(ints)
+        bases[K_TOKEN] = bases[K_FLOAT] + len(floats)
+        bases[K_LIST] = bases[K_TOKEN] + len(tokens)
+        bases[K_OBJECT] = bases[K_LIST] + len(self.lists)
+
+        size = bases[K_OBJECT] + len(self.objects)
+        typecode = 'H' if size <= 0xFFFF else 'I'  # lebar index pool: 2 byte kalau muat
+
+        def pool(refs) -> array:
+            return array(typecode, [bases[ref & 7] + (ref >> 3) for ref in refs])
+
+        out = bytearray(AST_MAGIC)
+        out.append(AST_FORMAT_VERSION)
+        out += typecode.encode()
+        strings.write(out)
+        _put_varint(out, len(class_names))
+        for name, fields in zip(class_names, field_names):
+            _put_varint(out, name)
+            _put_varint(out, len(fields))
+            for field in fields:
+                _put_varint(out, field)
+        _put_varint(out, len(ints))
+        out += _pack(array('q', ints))
+        _put_varint(out, len(floats))
+        out += _pack(floats)
+        _put_varint(out, len(tokens))
+        for column in zip(*tokens):
+            out += _pack(array('I', column))
+        _put_varint(out, len(self.lists))
+        out += _pack(array('I', map(len, self.lists)))
+        out += _pack(pool(ref for items in self.lists for ref in items))
+        _put_varint(out, len(self.object_class))
+        out += _pack(self.object_class)
+        for columns in self.columns:
+            for column in columns:
+                out += _pack(pool(column))
+        _put_varint(out, pool([root_ref])[0])
+        return bytes(out)
+
+
+def dumps_ast(node) -> bytes:
+    return _AstWriter().dumps(node)
+
+
+def dump_ast(node, path):
+    Path(path).write_bytes(dumps_ast(node))
+
+
+def loads_ast(buf, names: NameTable | None = None):
+    # objek AST dibuat puluhan ribu sekaligus dan semuanya tetap hidup: GC otomatis dimatiin selama load, kalau
+    # gak tiap gelombang alokasi bikin koleksi yang nyisir seluruh heap (termasuk tree lain yang lagi dipegang)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _loads_ast(buf, names)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _loads_ast(buf, names: NameTable | None):
+    pos = _check_header(buf, AST_MAGIC, AST_FORMAT_VERSION)
+    typecode = chr(buf[pos])
+    strings, pos = _read_strings(buf, pos + 1)
+    count, pos = _get_varint(buf, pos)
+    schema = []
+    for _ in range(count):
+        name, pos = _get_varint(buf, pos)
+        if strings[name] not in AST_CLASSES:
+            raise ValueError(f"unknown AST class '{strings[name]}'")
+        fields, pos = _read_ids(buf, pos, strings)
+        schema.append((AST_CLASSES[strings[name]], fields))
+
+    count, pos = _get_varint(buf, pos)
+    ints, pos = _unpack('q', buf, pos, count)
+    count, pos = _get_varint(buf, pos)
+    floats, pos = _unpack('d', buf, pos, count)
+    count, pos = _get_varint(buf, pos)
+    columns = []
+    for _ in range(4):
+        column, pos = _unpack('I', buf, pos, count)
+        columns.append(column)
+    types, values, lines, cols = columns
+    text = strings.__getitem__
+    tokens = list(map(StoredToken, map(text, types), map(text, values), lines, cols))
+    count, pos = _get_varint(buf, pos)
+    sizes, pos = _unpack('I', buf, pos, count)
+    items, pos = _unpack(typecode, buf, pos, sum(sizes))
+    lists = [[] for _ in sizes]
+    count, pos = _get_varint(buf, pos)
+    object_class, pos = _unpack('H', buf, pos, count)
+
+    # semua objek dibuat kosong dulu (per kelas), baru field-nya diisi per kolom lewat map (loop-nya di C)
+    instances = []
+    for cls, fields in schema:
+        instances.append([cls.__new__(cls) for _ in range(object_class.count(len(instances)))])
+    cursors = [iter(objects) for objects in instances]
+    objects = [next(cursors[cid]) for cid in object_class]
+
+    pool = [ABSENT, None, False, True]
+    pool += strings
+    pool += ints.tolist()
+    pool += floats.tolist()
+    pool += tokens
+    pool += lists
+    pool += objects
+    get = pool.__getitem__
+
+    flat = list(map(get, items))
+    start = 0
+    for target, size in zip(lists, sizes):
+        target += flat[start:start + size]
+        start += size
+
+    for (cls, fields), objects in zip(schema, instances):
+        for name in fields:
+            column, pos = _unpack(typecode, buf, pos, len(objects))
+            if column.count(R_ABSENT):
+                for target, ref in zip(objects, column):
+                    if ref != R_ABSENT:
+                        setattr(target, name, pool[ref])
+            else:
+                deque(map(setattr, objects, repeat(name), map(get, column)), maxlen=0)
+        if "name_id" in getattr(cls, "_attributes", ()) and "name" in fields:
+            # name_id gak ditulis: di-intern ulang ke tabel nama yang dikasih, tanpa tabel = NO_NAME
+            named = [target for target in objects if hasattr(target, "name")]
+            ids = map(names.intern, [target.name for target in named]) if names is not None else repeat(NO_NAME)
+            deque(map(setattr, named, repeat("name_id"), ids), maxlen=0)
+
+    root, pos = _get_varint(buf, pos)
+    return pool[root]
+
+
+def load_ast(path, names: NameTable | None = None):
+    buf = _map(path)
+    try:
+        return loads_ast(buf, names)
+    finally:
+        buf.close()
@@ -0,0 +1,39 @@
+"""
+Apa:
+- drive(): jalanin "rekursi" yang ditulis sebagai generator pakai stack sendiri
+
+Ngapain:
+- production parser / visitor analyzer ditulis sebagai generator: `hasil = yield self.anak(...)` = proses anak,
+  drive() yang push generator anak ke stack lalu ngirim hasilnya balik ke parent
+- exception dari anak dilempar ke parent di titik yield-nya (generator.throw), jadi try/except di parent
+  (mis. recovery Parser) jalan sama kaya rekursi biasa
+
+catatan:
+- kedalaman nesting gak dibatasi recursion limit Python, cuma memori list stack
+"""
+
+
+def drive(visitor):
+    stack = [visitor]
+    result = None
+    error = None
+    while stack:
+        try:
+            if error is None:
+                child = stack[-1].send(result)
+            else:
+                child = stack[-1].throw(error)
+                error = None
+        except StopIteration as done:
+            stack.pop()
+            result = done.value
+            error = None
+        except Exception as e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e
+        else:
+            stack.append(child)
+            result = None
+    return result